@@ -8,47 +8,122 @@ import sys
 import os
 import time
 import json
+import math
+import argparse
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Queue
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from loader import load_machine_config
-from turing_machine import TuringMachine
+from loader import load_machine_config, get_notation, tape_count
+from turing_machine import (TuringMachine, ENGINES, TAPE_BACKENDS, encode_input,
+                            extract_result, decode_number)
+from compiled import compile_machine
+from multitape import create_machine
+from result_cache import ResultCache
+
+# Intervalo entre checkpoints de las mediciones largas
+CHECKPOINT_SECONDS = 30.0
+
+# Razón áurea
+PHI = (1 + 5 ** 0.5) / 2
 
 
 def measure_execution(machine: TuringMachine, n: int, 
-                      repetitions: int = 3, max_steps: int = 500000) -> dict:
+                      repetitions: int = 3, max_steps: int = 500000,
+                      checkpoint_dir: str = None, resume: bool = False,
+                      result_cache=None, fresh: bool = False) -> dict:
     """
     Mide el tiempo de ejecución para una entrada dada.
     
+    Si result_cache tiene una medición con el mismo motor, tipo de cinta y
+    número de repeticiones, se devuelve sin ejecutar la máquina (con
+    cached=True y el tiempo de la medición original, que no se vuelve a
+    medir); si no, se mide y el resultado se guarda.
+    
     Args:
         machine: Máquina de Turing configurada
         n: Valor de n (tamaño de entrada)
         repetitions: Número de repeticiones para promediar
         max_steps: Máximo de pasos permitidos
+        checkpoint_dir: Directorio donde guardar checkpoints periódicos de
+            la primera repetición (archivo n<n>.ckpt)
+        resume: Si continuar la primera repetición desde su checkpoint;
+            su tiempo incluye el acumulado antes de la interrupción
+        result_cache: Caché de resultados (ResultCache) o None
+        fresh: Si medir aunque el resultado esté en la caché
     
     Returns:
         Diccionario con los resultados de la medición
     """
-    input_str = '1' * n
+    notation = get_notation(machine.config)
+    input_str = encode_input(n, notation)
+    
+    if result_cache is not None and not fresh:
+        record = result_cache.get(machine.config, input_str, max_steps,
+                                  engine=machine.engine,
+                                  tape_backend=machine.tape_backend,
+                                  repetitions=repetitions)
+        if record is not None:
+            result = extract_result(record['tape'], notation)
+            return {
+                'n': n,
+                'input': input_str,
+                'time_avg': record['time'],
+                'time_min': record['time'],
+                'time_max': record['time'],
+                'steps': record['steps'],
+                'result': result,
+                'fib_value': decode_number(result, notation),
+                'completed': record['accepted'],
+                'cached': True
+            }
+    
     times = []
     steps = 0
     result = ""
+    fib_value = 0
     accepted = False
     
-    for _ in range(repetitions):
+    checkpoint_path = None
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        checkpoint_path = os.path.join(checkpoint_dir, f"n{n}.ckpt")
+    
+    for repetition in range(repetitions):
         machine.reset(input_str)
         
+        if checkpoint_path is not None and repetition == 0:
+            machine.enable_checkpoints(checkpoint_path,
+                                       every_seconds=CHECKPOINT_SECONDS)
+            if resume and os.path.exists(checkpoint_path):
+                try:
+                    machine.restore_checkpoint()
+                except ValueError:
+                    machine.reset(input_str)
+                if machine.input_string != input_str:
+                    machine.reset(input_str)
+        else:
+            machine.disable_checkpoints()
+        
+        previous = machine.elapsed
         start = time.perf_counter()
         accepted = machine.run(max_steps=max_steps)
         end = time.perf_counter()
         
-        times.append(end - start)
+        # Al reanudar se suma el tiempo acumulado antes del checkpoint
+        times.append(previous + end - start)
         steps = machine.step_count
         result = machine.get_clean_result()
+        fib_value = machine.get_result_value()
+    
+    machine.disable_checkpoints()
+    if result_cache is not None:
+        result_cache.put(machine.config, input_str, machine, elapsed=min(times),
+                         repetitions=repetitions)
     
     avg_time = sum(times) / len(times)
-    fib_value = len(result) if result and result != '_' else 0
     
     return {
         'n': n,
@@ -59,23 +134,33 @@ def measure_execution(machine: TuringMachine, n: int,
         'steps': steps,
         'result': result,
         'fib_value': fib_value,
-        'completed': accepted
+        'completed': accepted,
+        'cached': False
     }
 
 
-def run_analysis(config_path: str, n_values: list) -> list:
+def run_analysis(config_path: str, n_values: list,
+                 tape_backend: str = 'memory', engine: str = 'step',
+                 use_result_cache: bool = False, fresh: bool = False) -> list:
     """
     Ejecuta el análisis empírico para múltiples valores de n.
     
     Args:
         config_path: Ruta al archivo de configuración
         n_values: Lista de valores de n a probar
+        tape_backend: Tipo de cinta ('memory', 'mmap' o 'rle')
+        engine: Motor de ejecución (ver turing_machine.ENGINES)
+        use_result_cache: Si tomar de la caché de resultados las
+            mediciones ya hechas (ver measure_execution)
+        fresh: Si medir de nuevo y actualizar la caché
     
     Returns:
         Lista de resultados de medición
     """
     config = load_machine_config(config_path)
-    machine = TuringMachine(config)
+    machine = TuringMachine(config, tape_backend=tape_backend, engine=engine,
+                            history_policy='none')
+    result_cache = ResultCache() if use_result_cache else None
     
     results = []
     total = len(n_values)
@@ -87,7 +172,8 @@ def run_analysis(config_path: str, n_values: list) -> list:
     for i, n in enumerate(n_values):
         print(f"[{i+1}/{total}] Midiendo n={n}...", end=" ", flush=True)
         
-        measurement = measure_execution(machine, n)
+        measurement = measure_execution(machine, n, result_cache=result_cache,
+                                        fresh=fresh)
         results.append(measurement)
         
         print(f"Tiempo: {measurement['time_avg']*1000:.2f}ms, "
@@ -97,12 +183,194 @@ def run_analysis(config_path: str, n_values: list) -> list:
     return results
 
 
-def save_results(results: list, output_dir: str):
-    """Guarda los resultados en formato JSON."""
+def default_repetitions(n: int) -> int:
+    """Repeticiones por medición: menos para valores grandes (toman mucho tiempo)."""
+    return 3 if n <= 10 else 2 if n <= 12 else 1
+
+
+# Máquina y caché de resultados de cada proceso trabajador (ver _init_worker)
+_worker_machine = None
+_worker_cache = None
+
+
+def _init_worker(config_path: str, tape_backend: str, engine: str,
+                 cpu_queue: Queue = None, use_result_cache: bool = False):
+    """
+    Inicializa un proceso trabajador: fija su CPU (opcional), carga la
+    configuración, compila la máquina una sola vez y abre su conexión a
+    la caché de resultados.
+    """
+    global _worker_machine, _worker_cache
+    
+    if cpu_queue is not None:
+        os.sched_setaffinity(0, {cpu_queue.get()})
+    
+    config = load_machine_config(config_path)
+    _worker_machine = TuringMachine(config, tape_backend=tape_backend,
+                                    engine=engine, history_policy='none')
+    # Ejecución vacía para compilar/generar el motor antes de medir
+    _worker_machine.reset("")
+    _worker_machine.run()
+    _worker_cache = ResultCache() if use_result_cache else None
+
+
+def _measure_in_worker(n: int, repetitions: int, max_steps: int,
+                       fresh: bool = False) -> dict:
+    """Mide una entrada con la máquina del proceso trabajador."""
+    return measure_execution(_worker_machine, n, repetitions=repetitions,
+                             max_steps=max_steps, result_cache=_worker_cache,
+                             fresh=fresh)
+
+
+def run_analysis_parallel(config_path: str, n_values: list,
+                          workers: int = None, time_limit: float = None,
+                          max_steps: int = 2000000, pin: bool = False,
+                          tape_backend: str = 'memory',
+                          engine: str = 'step', use_result_cache: bool = False,
+                          fresh: bool = False) -> list:
+    """
+    Ejecuta las mediciones en paralelo con un ProcessPoolExecutor.
+    
+    Cada trabajador carga y compila la máquina una vez. Los resultados se
+    muestran en el orden en que terminan, pero se retornan en el orden de
+    n_values. Si se indica time_limit, al exceder el límite en un n se
+    cancelan las mediciones pendientes de valores mayores y se descartan
+    sus resultados, como en run_analysis_adaptive.
+    
+    Args:
+        config_path: Ruta al archivo de configuración
+        n_values: Lista de valores de n a probar
+        workers: Número de procesos (por defecto, las CPU disponibles)
+        time_limit: Límite de tiempo en segundos para cada medición
+        max_steps: Máximo de pasos permitidos por ejecución
+        pin: Si fijar cada trabajador a una CPU distinta (solo Linux),
+            para tiempos más estables
+        tape_backend: Tipo de cinta ('memory', 'mmap' o 'rle')
+        engine: Motor de ejecución (ver turing_machine.ENGINES)
+        use_result_cache: Si tomar de la caché de resultados las
+            mediciones ya hechas
+        fresh: Si medir de nuevo y actualizar la caché
+    
+    Returns:
+        Lista de resultados de medición
+    """
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') \
+        else list(range(os.cpu_count() or 1))
+    workers = workers or len(cpus)
+    
+    cpu_queue = None
+    if pin:
+        if not hasattr(os, 'sched_setaffinity'):
+            raise ValueError("Fijar CPU no está disponible en este sistema")
+        cpu_queue = Queue()
+        for cpu in cpus[:workers]:
+            cpu_queue.put(cpu)
+        workers = min(workers, len(cpus))
+    
+    print(f"\n{'='*60}")
+    print(f"ANÁLISIS EMPÍRICO EN PARALELO ({workers} procesos)")
+    print(f"{'='*60}")
+    print(f"Motor de ejecución: {engine}")
+    print("-" * 60)
+    
+    measurements = {}
+    limit_n = None
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(config_path, tape_backend, engine,
+                                       cpu_queue, use_result_cache)) as executor:
+        futures = {
+            executor.submit(_measure_in_worker, n, default_repetitions(n),
+                            max_steps, fresh): n
+            for n in n_values
+        }
+        
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            n = futures[future]
+            measurement = future.result()
+            measurements[n] = measurement
+            
+            tiempo = measurement['time_avg']
+            print(f"[n={n:2d}] F({n})={measurement['fib_value']:>5}, "
+                  f"Pasos={measurement['steps']:>10,}, "
+                  f"Tiempo={tiempo*1000:>10.2f}ms")
+            
+            if time_limit is not None and tiempo > time_limit \
+                    and (limit_n is None or n < limit_n):
+                limit_n = n
+                print(f"\n*** Límite de tiempo excedido en n={n}. "
+                      f"Cancelando valores mayores. ***")
+                for pending, pending_n in futures.items():
+                    if pending_n > n:
+                        pending.cancel()
+    
+    return [measurements[n] for n in n_values
+            if n in measurements and (limit_n is None or n <= limit_n)]
+
+
+def run_analysis_batch(config_path: str, n_values: list,
+                       repetitions: int = 1, max_steps: int = 2000000) -> list:
+    """
+    Ejecuta todas las entradas a la vez con el simulador por lotes (NumPy).
+    
+    Cada n ocupa `repetitions` filas del lote. Como todas las filas avanzan
+    juntas, los campos de tiempo contienen la duración total del lote.
+    
+    Args:
+        config_path: Ruta al archivo de configuración
+        n_values: Lista de valores de n a probar
+        repetitions: Filas por valor de n
+        max_steps: Máximo de pasos permitidos por entrada
+    
+    Returns:
+        Lista de resultados de medición (mismo formato que measure_execution)
+    
+    Raises:
+        ValueError: Si la máquina tiene varias cintas
+    """
+    from batch import BatchSimulator
+    
+    config = load_machine_config(config_path)
+    if tape_count(config) > 1:
+        raise ValueError("El simulador por lotes solo admite máquinas de una cinta")
+    notation = get_notation(config)
+    simulator = BatchSimulator(compile_machine(config))
+    inputs = [encode_input(n, notation) for n in n_values for _ in range(repetitions)]
+    
+    print(f"\nSimulando {len(inputs)} entradas en lote...", end=" ", flush=True)
+    start = time.perf_counter()
+    lanes = simulator.run(inputs, max_steps=max_steps)
+    elapsed = time.perf_counter() - start
+    print(f"Tiempo: {elapsed*1000:.2f}ms")
+    
+    results = []
+    for i, n in enumerate(n_values):
+        lane = lanes[i * repetitions]
+        result = extract_result(lane['tape'], notation)
+        results.append({
+            'n': n,
+            'input': lane['input'],
+            'time_avg': elapsed,
+            'time_min': elapsed,
+            'time_max': elapsed,
+            'steps': lane['steps'],
+            'result': result,
+            'fib_value': decode_number(result, notation),
+            'completed': lane['accepted'],
+            'batch_lanes': len(inputs)
+        })
+    
+    return results
+
+
+def save_results(results: list, output_dir: str, prefix: str = "analysis"):
+    """Guarda los resultados en formato JSON (archivo <prefix>_<fecha>.json)."""
     os.makedirs(output_dir, exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filepath = os.path.join(output_dir, f"analysis_{timestamp}.json")
+    filepath = os.path.join(output_dir, f"{prefix}_{timestamp}.json")
     
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
@@ -124,6 +392,8 @@ def print_results_table(results: list):
     for r in results:
         ratio = f"{r['steps']/prev_steps:.3f}" if prev_steps and prev_steps > 0 else "-"
         estado = "OK" if r.get('completed', True) else "TIMEOUT"
+        if r.get('cached'):
+            estado += " (caché)"
         print(f"{r['n']:>4} | {r['fib_value']:>8} | "
               f"{r['steps']:>12,} | {ratio:>8} | "
               f"{r['time_avg']*1000:>12.2f} | {estado:>10}")
@@ -134,7 +404,13 @@ def print_results_table(results: list):
 
 
 def run_analysis_adaptive(config_path: str, max_n: int = 14, 
-                          time_limit: float = 30.0) -> list:
+                          time_limit: float = 30.0,
+                          tape_backend: str = 'memory',
+                          engine: str = 'step',
+                          checkpoint_dir: str = None,
+                          resume: bool = False,
+                          use_result_cache: bool = False,
+                          fresh: bool = False) -> list:
     """
     Ejecuta análisis adaptativo que para cuando el tiempo excede el límite.
     
@@ -142,12 +418,22 @@ def run_analysis_adaptive(config_path: str, max_n: int = 14,
         config_path: Ruta al archivo de configuración
         max_n: Valor máximo de n a probar
         time_limit: Límite de tiempo en segundos para cada medición
+        tape_backend: Tipo de cinta ('memory', 'mmap' o 'rle'); 'mmap'
+            permite cintas mayores que la memoria disponible
+        engine: Motor de ejecución (ver turing_machine.ENGINES)
+        checkpoint_dir: Directorio para checkpoints de cada medición
+        resume: Si continuar las mediciones desde sus checkpoints
+        use_result_cache: Si tomar de la caché de resultados las
+            mediciones ya hechas
+        fresh: Si medir de nuevo y actualizar la caché
     
     Returns:
         Lista de resultados de medición
     """
     config = load_machine_config(config_path)
-    machine = TuringMachine(config)
+    machine = TuringMachine(config, tape_backend=tape_backend, engine=engine,
+                            history_policy='none')
+    result_cache = ResultCache() if use_result_cache else None
     
     results = []
     
@@ -155,17 +441,20 @@ def run_analysis_adaptive(config_path: str, max_n: int = 14,
     print("ANÁLISIS EMPÍRICO - Complejidad Exponencial O(φⁿ)²")
     print(f"{'='*60}")
     print(f"Límite de tiempo por medición: {time_limit}s")
+    print(f"Motor de ejecución: {engine}")
     print(f"Rango de n: 0 a {max_n}")
     print("-" * 60)
     
     for n in range(max_n + 1):
-        # Reducir repeticiones para valores grandes (toma mucho tiempo)
-        reps = 3 if n <= 10 else 2 if n <= 12 else 1
+        reps = default_repetitions(n)
         
         print(f"[n={n:2d}] Midiendo ({reps}x)...", end=" ", flush=True)
         
         measurement = measure_execution(machine, n, repetitions=reps, 
-                                        max_steps=2000000)
+                                        max_steps=2000000,
+                                        checkpoint_dir=checkpoint_dir,
+                                        resume=resume, result_cache=result_cache,
+                                        fresh=fresh)
         results.append(measurement)
         
         tiempo = measurement['time_avg']
@@ -181,14 +470,249 @@ def run_analysis_adaptive(config_path: str, max_n: int = 14,
     return results
 
 
+def used_cells(machine) -> int:
+    """
+    Celdas entre el primer y el último símbolo no blanco de la cinta
+    final, sumando todas las cintas.
+    """
+    tapes = machine.tape if isinstance(machine.tape, list) else [machine.tape]
+    total = 0
+    for tape in tapes:
+        low, high = tape.get_bounds()
+        total += high - low + 1
+    return total
+
+
+def compare_machines(config_paths: list, n_values: list,
+                     engine: str = 'compiled', max_steps: int = 10 ** 10) -> list:
+    """
+    Mide varias máquinas sobre las mismas entradas.
+    
+    Args:
+        config_paths: Rutas a los archivos de configuración (de una o
+            varias cintas, en notación unaria o binaria); n se codifica en
+            la notación de cada máquina
+        n_values: Valores de n a probar
+        engine: Motor de ejecución común a todas las máquinas
+        max_steps: Máximo de pasos permitidos
+    
+    Returns:
+        Lista con un diccionario por n: n, fib_value (de la primera
+        máquina), steps, cells (ver used_cells), time_avg y fib_values
+        (listas con un valor por máquina) y completed
+    """
+    configs = [load_machine_config(path) for path in config_paths]
+    machines = [create_machine(config, engine=engine, history_policy='none')
+                for config in configs]
+    
+    results = []
+    for n in n_values:
+        row = {'n': n, 'steps': [], 'cells': [], 'time_avg': [],
+               'fib_values': [], 'completed': True}
+        for config, machine in zip(configs, machines):
+            machine.reset(encode_input(n, get_notation(config)))
+            start = time.perf_counter()
+            accepted = machine.run(max_steps=max_steps)
+            row['time_avg'].append(time.perf_counter() - start)
+            row['steps'].append(machine.step_count)
+            row['cells'].append(used_cells(machine))
+            row['fib_values'].append(machine.get_result_value())
+            row['completed'] = row['completed'] and accepted
+        row['fib_value'] = row['fib_values'][0]
+        results.append(row)
+        print(f"[n={n:2d}] Pasos: {', '.join(f'{s:,}' for s in row['steps'])}")
+    return results
+
+
+def growth_summary(results: list, tail: int = 4) -> dict:
+    """
+    Cuantifica el crecimiento asintótico de cada máquina.
+    
+    Args:
+        results: Resultado de compare_machines
+        tail: Número de cocientes finales T(n+1)/T(n) a promediar
+    
+    Returns:
+        Diccionario con growth (factor de crecimiento por unidad de n de
+        cada máquina, media geométrica de los últimos cocientes), degree
+        (pendiente de log T frente a log n en la segunda mitad de las
+        mediciones; T ≈ n^grado) y exponent (pendiente de log T_1 frente
+        a log T_k en el mismo tramo; T_1 ≈ T_k^exponente)
+    """
+    measured = [r for r in results if r['completed'] and min(r['steps']) > 1]
+    if len(measured) < 2:
+        raise ValueError("Se necesitan al menos dos mediciones completas")
+    
+    count = len(measured[0]['steps'])
+    last = measured[-min(tail, len(measured) - 1) - 1:]
+    span = last[-1]['n'] - last[0]['n']
+    growth = [(last[-1]['steps'][k] / last[0]['steps'][k]) ** (1 / span)
+              for k in range(count)]
+    
+    first, final = measured[len(measured) // 2], measured[-1]
+    logs = [math.log(final['steps'][k] / first['steps'][k]) for k in range(count)]
+    span = math.log(final['n'] / first['n'])
+    degree = [log / span for log in logs]
+    exponent = [logs[0] / log for log in logs]
+    return {'growth': growth, 'degree': degree, 'exponent': exponent}
+
+
+def _print_columns(title: str, results: list, values, width: int):
+    """Imprime una tabla con una columna por máquina y una fila por n."""
+    print(f"{title}")
+    print("-" * width)
+    for r in results:
+        print(f"{r['n']:>4} | {r['fib_value']:>8} | "
+              + '| '.join(f"{v:>20} " for v in values(r)))
+    print("-" * width)
+
+
+def print_comparison(config_paths: list, results: list):
+    """Imprime la comparación de varias máquinas lado a lado."""
+    names = [os.path.splitext(os.path.basename(p))[0] for p in config_paths]
+    width = 23 * len(names) + 20
+    
+    print("\n" + "=" * width)
+    print("COMPARACIÓN DE MÁQUINAS")
+    print("=" * width)
+    print(f"{'n':>4} | {'F(n)':>8} | " + '| '.join(f"{name[:20]:>20} " for name in names))
+    print("=" * width)
+    _print_columns("Pasos", results, lambda r: (f"{s:,}" for s in r['steps']), width)
+    _print_columns("Celdas usadas en la cinta final", results,
+                   lambda r: (f"{c:,}" for c in r['cells']), width)
+    _print_columns("Tiempo (ms)", results,
+                   lambda r: (f"{t * 1000:.2f}" for t in r['time_avg']), width)
+    
+    for r in results:
+        if not r['completed']:
+            print(f"n={r['n']}: alguna máquina no terminó")
+        elif len(set(r['fib_values'])) > 1:
+            print(f"n={r['n']}: resultados distintos {r['fib_values']}")
+    
+    summary = growth_summary(results)
+    print(f"{'Crecimiento/n':>17} | "
+          + '| '.join(f"{g:>20.4f} " for g in summary['growth']))
+    print(f"{'log T / log n':>17} | "
+          + '| '.join(f"{d:>20.4f} " for d in summary['degree']))
+    print(f"{'log T1 / log Tk':>17} | "
+          + '| '.join(f"{e:>20.4f} " for e in summary['exponent']))
+    print("=" * width)
+    print(f"Referencias: φ ≈ {PHI:.4f}, φ² ≈ {PHI ** 2:.4f}. Un crecimiento/n "
+          "constante mayor que 1 indica pasos exponenciales; un log T / log n "
+          "estable indica pasos polinomiales de ese grado. Un log T1 / log Tk "
+          "cercano a 2 indica que T1(n) ≈ Tk(n)².")
+
+
 if __name__ == "__main__":
     # Configuración por defecto
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     config_path = os.path.join(base_dir, "maquinas", "fibonacci.json")
     output_dir = os.path.join(base_dir, "resultados")
     
-    # Ejecutar análisis adaptativo (para cuando toma demasiado tiempo)
-    results = run_analysis_adaptive(config_path, max_n=15, time_limit=60.0)
+    parser = argparse.ArgumentParser(
+        description='Análisis empírico de la Máquina de Turing de Fibonacci'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='step',
+        help='Motor de ejecución'
+    )
+    parser.add_argument(
+        '--tape',
+        choices=list(TAPE_BACKENDS),
+        default='memory',
+        help='Implementación de la cinta'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Medir en paralelo con este número de procesos'
+    )
+    parser.add_argument(
+        '--pin',
+        action='store_true',
+        help='Fijar cada proceso a una CPU (con --workers)'
+    )
+    parser.add_argument(
+        '--checkpoint-dir',
+        help='Guardar checkpoints periódicos de cada medición en este directorio'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continuar las mediciones desde sus checkpoints (con --checkpoint-dir)'
+    )
+    parser.add_argument(
+        '--batch',
+        type=int,
+        metavar='MAX_N',
+        help='Simular n = 0..MAX_N en un solo lote vectorizado (NumPy)'
+    )
+    parser.add_argument(
+        '--compare',
+        nargs='*',
+        metavar='CONFIG',
+        help='Comparar varias máquinas lado a lado (por defecto la de una '
+             'cinta y la de tres cintas)'
+    )
+    parser.add_argument(
+        '--notations',
+        action='store_true',
+        help='Comparar las máquinas en notación unaria y binaria'
+    )
+    parser.add_argument(
+        '--result-cache',
+        action='store_true',
+        help='Reutilizar las mediciones de la caché de resultados (con su '
+             'tiempo original) y guardar las nuevas'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Con --result-cache, medir de nuevo y actualizar la caché'
+    )
+    parser.add_argument(
+        '--max-n',
+        type=int,
+        default=16,
+        help='Mayor n a medir con --compare (por defecto 16)'
+    )
+    args = parser.parse_args()
+    
+    if args.notations:
+        args.compare = [config_path, os.path.join(
+            base_dir, "maquinas", "fibonacci_binario.json")]
+    if args.compare is not None:
+        paths = args.compare or [config_path, os.path.join(
+            base_dir, "maquinas", "fibonacci_3cintas.json")]
+        engine = args.engine if args.engine != 'step' else 'compiled'
+        try:
+            results = compare_machines(paths, list(range(args.max_n + 1)), engine=engine)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print_comparison(paths, results)
+        save_results(results, output_dir, prefix="comparison")
+        sys.exit(0)
+    
+    if args.batch is not None:
+        results = run_analysis_batch(config_path, list(range(args.batch + 1)))
+    elif args.workers:
+        results = run_analysis_parallel(config_path, list(range(16)),
+                                        workers=args.workers, time_limit=60.0,
+                                        pin=args.pin, tape_backend=args.tape,
+                                        engine=args.engine,
+                                        use_result_cache=args.result_cache,
+                                        fresh=args.fresh)
+    else:
+        # Ejecutar análisis adaptativo (para cuando toma demasiado tiempo)
+        results = run_analysis_adaptive(config_path, max_n=15, time_limit=60.0,
+                                        tape_backend=args.tape, engine=args.engine,
+                                        checkpoint_dir=args.checkpoint_dir,
+                                        resume=args.resume,
+                                        use_result_cache=args.result_cache,
+                                        fresh=args.fresh)
     print_results_table(results)
     filepath = save_results(results, output_dir)
     
@@ -198,4 +722,8 @@ if __name__ == "__main__":
     print("La complejidad temporal es O(φⁿ) donde φ ≈ 1.618")
     print("Esto demuestra el crecimiento exponencial de la máquina")
     print("de Turing de una sola cinta para calcular Fibonacci.")
+    cached = sum(1 for r in results if r.get('cached'))
+    if cached:
+        print(f"Nota: {cached} de {len(results)} tiempos provienen de la caché "
+              "de resultados (mediciones anteriores; --fresh para medir de nuevo)")
     print("=" * 60)
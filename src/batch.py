@@ -0,0 +1,125 @@
+"""
+Módulo de simulación por lotes de una Máquina de Turing con NumPy.
+
+Muchas entradas de la misma máquina avanzan en paralelo: los estados, las
+posiciones de la cabeza y una matriz de cintas (una fila por entrada) se
+guardan en arreglos de NumPy, y cada iteración aplica un paso a todas las
+filas activas con lecturas vectorizadas de las tablas compiladas. Las
+filas detenidas se excluyen de las iteraciones siguientes.
+"""
+
+import numpy as np
+
+from compiled import HALT
+
+
+class BatchSimulator:
+    """Simulador en paralelo (lockstep) sobre una máquina compilada."""
+
+    def __init__(self, compiled):
+        """
+        Inicializa el simulador con las tablas de la máquina compilada.
+
+        Args:
+            compiled: Máquina compilada (CompiledMachine)
+        """
+        self.compiled = compiled
+        self.next_state = np.array(compiled.next_state, dtype=np.int64)
+        self.write_symbol = np.array(compiled.write_symbol, dtype=np.uint8)
+        self.move = np.array(compiled.move, dtype=np.int64)
+        self.halting = np.array(compiled.halting, dtype=bool)
+        self.accepting = np.array(compiled.accepting, dtype=bool)
+
+    def run(self, inputs: list, max_steps: int = 100000,
+            margin: int = 64) -> list:
+        """
+        Ejecuta la máquina sobre todas las entradas en paralelo.
+
+        Args:
+            inputs: Lista de cadenas de entrada
+            max_steps: Número máximo de pasos por entrada
+            margin: Celdas blancas iniciales a cada lado de la entrada
+
+        Returns:
+            Lista de diccionarios (uno por entrada, en el mismo orden) con
+            input, steps, halted, accepted, state, head y tape
+        """
+        compiled = self.compiled
+        lanes = len(inputs)
+        if not lanes:
+            return []
+
+        width = max(len(s) for s in inputs) + 2 * margin
+        origin = margin
+        tape = np.zeros((lanes, width), dtype=np.uint8)
+        for lane, input_string in enumerate(inputs):
+            codes = np.frombuffer(bytes(compiled.encode(input_string)), dtype=np.uint8)
+            tape[lane, origin:origin + len(codes)] = codes
+
+        states = np.full(lanes, compiled.initial_state, dtype=np.int64)
+        heads = np.full(lanes, origin, dtype=np.int64)
+        steps = np.zeros(lanes, dtype=np.int64)
+        halted = np.zeros(lanes, dtype=bool)
+        active = np.arange(lanes)
+        num_symbols = compiled.num_symbols
+
+        iteration = 0
+        while active.size and iteration < max_steps:
+            position = heads[active]
+            index = states[active] * num_symbols + tape[active, position]
+            target = self.next_state[index]
+
+            # Sin transición: la fila se detiene sin avanzar
+            moving = target != HALT
+            if not moving.all():
+                halted[active[~moving]] = True
+                active = active[moving]
+                position = position[moving]
+                index = index[moving]
+                target = target[moving]
+
+            tape[active, position] = self.write_symbol[index]
+            position += self.move[index]
+            heads[active] = position
+            states[active] = target
+            steps[active] += 1
+            iteration += 1
+
+            if position.size:
+                if position.min() < 0:
+                    grow = tape.shape[1]
+                    tape = np.concatenate(
+                        [np.zeros((lanes, grow), dtype=np.uint8), tape], axis=1)
+                    heads += grow
+                    position += grow
+                    origin += grow
+                if position.max() >= tape.shape[1]:
+                    grow = tape.shape[1]
+                    tape = np.concatenate(
+                        [tape, np.zeros((lanes, grow), dtype=np.uint8)], axis=1)
+
+            stop = self.halting[target]
+            if stop.any():
+                halted[active[stop]] = True
+                active = active[~stop]
+
+        results = []
+        for lane, input_string in enumerate(inputs):
+            row = tape[lane]
+            used = np.flatnonzero(row)
+            if used.size:
+                content = compiled.decode(row[used[0]:used[-1] + 1].tolist())
+            else:
+                content = ''
+
+            results.append({
+                'input': input_string,
+                'steps': int(steps[lane]),
+                'halted': bool(halted[lane]),
+                'accepted': bool(halted[lane] and self.accepting[states[lane]]),
+                'state': compiled.states[states[lane]],
+                'head': int(heads[lane] - origin),
+                'tape': content.strip(compiled.blank) or compiled.blank
+            })
+
+        return results
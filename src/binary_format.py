@@ -0,0 +1,76 @@
+"""
+Utilidades compartidas por los formatos binarios (checkpoint.py,
+tracefile.py) y los registros de deltas (history.py, undo.py).
+
+Los textos se guardan como UTF-8 precedidos por su longitud (uint32
+little-endian) y las tablas como un contador seguido de sus textos. Las
+lecturas fallan con ValueError si el archivo termina antes de tiempo.
+"""
+
+import struct
+
+COUNT = struct.Struct('<I')
+
+
+def write_text(f, text: str):
+    """Escribe un texto UTF-8 precedido por su longitud."""
+    data = text.encode('utf-8')
+    f.write(COUNT.pack(len(data)))
+    f.write(data)
+
+
+def write_table(f, texts: list):
+    """Escribe una tabla de textos precedida por su número de elementos."""
+    f.write(COUNT.pack(len(texts)))
+    for text in texts:
+        write_text(f, text)
+
+
+def read_exact(f, size: int) -> bytes:
+    """
+    Lee exactamente size bytes.
+
+    Raises:
+        ValueError: Si el archivo está truncado
+    """
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"Archivo truncado: {getattr(f, 'name', '?')}")
+    return data
+
+
+def read_count(f) -> int:
+    return COUNT.unpack(read_exact(f, COUNT.size))[0]
+
+
+def read_text(f) -> str:
+    return read_exact(f, read_count(f)).decode('utf-8')
+
+
+def read_table(f) -> list:
+    return [read_text(f) for _ in range(read_count(f))]
+
+
+class InternTable(list):
+    """
+    Lista de textos distintos (símbolos o estados) en orden de registro.
+
+    Los registros de deltas guardan el índice de cada texto en columnas de
+    tipo array; code() da ese índice registrando el texto si es nuevo, y
+    la tabla se indexa como una lista para traducirlo de vuelta.
+    """
+
+    def __init__(self, values=()):
+        super().__init__()
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        """Índice de value en la tabla, registrándolo si es nuevo."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self)
+            self.append(value)
+            self._codes[value] = code
+        return code
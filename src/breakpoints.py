@@ -0,0 +1,202 @@
+"""
+Módulo de puntos de parada (breakpoints) y de vigilancia (watchpoints)
+para la Máquina de Turing.
+
+Las condiciones se compilan como trampas en las tablas de transición (ver
+compiled.py):
+
+- Estado y (estado, símbolo): las transiciones afectadas apuntan a TRAP.
+- Rango de posiciones de la cabeza y celdas vigiladas: las celdas se
+  marcan en la cinta de códigos con símbolos sombra (código + n para las
+  vigiladas, código + 2n para las del rango, con n símbolos). Las filas
+  sombra de la tabla repiten las transiciones originales, escriben el
+  símbolo sombra para conservar la marca y apuntan a TRAP cuando la
+  condición se cumple: siempre en un rango y, en una celda vigilada, solo
+  si la transición cambia su contenido.
+- Número de paso: se usa como límite de pasos de la ejecución.
+
+Todas las condiciones se evalúan antes de aplicar la transición, es decir,
+la máquina se interrumpe en la configuración que la cumple.
+"""
+
+import copy
+from array import array
+
+from compiled import HALT, TRAP
+
+# Tipos de fila de la tabla con trampas: celda normal, vigilada o en rango
+_PLAIN = 0
+_WATCHED = 1
+_RANGE = 2
+
+
+class Breakpoints:
+    """Conjunto de condiciones de parada de una ejecución."""
+
+    def __init__(self):
+        self.states = set()
+        self.transitions = set()
+        self.head_ranges = []
+        self.steps = set()
+        self.watches = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.states or self.transitions or self.head_ranges
+                    or self.steps or self.watches)
+
+    def add_state(self, state: str):
+        """Parar cuando la máquina esté en state."""
+        self.states.add(state)
+
+    def add_transition(self, state: str, symbol: str):
+        """Parar cuando la máquina esté en state leyendo symbol."""
+        self.transitions.add((state, symbol))
+
+    def add_head_range(self, low: int, high: int = None):
+        """
+        Parar cuando la cabeza esté entre low y high (inclusive).
+
+        Raises:
+            ValueError: Si el rango está vacío
+        """
+        if high is None:
+            high = low
+        if low > high:
+            raise ValueError(f"Rango de cabeza vacío: {low}:{high}")
+        self.head_ranges.append((low, high))
+
+    def add_step(self, step: int):
+        """Parar al llegar al paso step."""
+        self.steps.add(step)
+
+    def add_watch(self, position: int):
+        """Parar antes de que un paso cambie el contenido de la celda."""
+        self.watches.add(position)
+
+    def next_step(self, step: int):
+        """Primer paso de parada en o después de step (o None)."""
+        return min((s for s in self.steps if s >= step), default=None)
+
+    def reasons(self, step: int, state: str, symbol: str, head: int,
+                transition) -> list:
+        """
+        Condiciones que se cumplen en una configuración.
+
+        Args:
+            step: Número de paso
+            state: Estado actual
+            symbol: Símbolo bajo la cabeza
+            head: Posición de la cabeza
+            transition: Transición a aplicar (nuevo_estado, símbolo,
+                dirección) o None si la máquina se detendría
+
+        Returns:
+            Lista de descripciones legibles (vacía si no se cumple ninguna)
+        """
+        reasons = []
+        if step in self.steps:
+            reasons.append(f"paso {step}")
+        if state in self.states:
+            reasons.append(f"estado {state}")
+        if (state, symbol) in self.transitions:
+            reasons.append(f"estado {state} leyendo {symbol!r}")
+        for low, high in self.head_ranges:
+            if low <= head <= high:
+                reasons.append(f"cabeza en [{low}, {high}]")
+        if head in self.watches and transition is not None \
+                and transition[1] != symbol:
+            reasons.append(f"celda {head}: {symbol!r} -> {transition[1]!r}")
+        return reasons
+
+
+class TrappedMachine:
+    """
+    Máquina compilada con las condiciones de un Breakpoints como trampas.
+
+    machine es una copia de la máquina compilada con las tablas
+    ampliadas, ejecutable con su método run(); mark() y clear() ponen y
+    quitan las marcas de las celdas en la cinta de códigos.
+    """
+
+    def __init__(self, compiled, breakpoints: Breakpoints):
+        """
+        Compila las trampas sobre una máquina compilada.
+
+        Args:
+            compiled: Máquina compilada (CompiledMachine)
+            breakpoints: Condiciones de parada
+
+        Raises:
+            ValueError: Si una condición usa un estado o símbolo que la
+                máquina no tiene, o si los símbolos sombra no caben en un
+                byte
+        """
+        for state in breakpoints.states | {s for s, _ in breakpoints.transitions}:
+            if state not in compiled.state_ids:
+                raise ValueError(f"Estado desconocido en punto de parada: {state}")
+        for _, symbol in breakpoints.transitions:
+            if symbol not in compiled.symbol_codes:
+                raise ValueError(f"Símbolo desconocido en punto de parada: {symbol!r}")
+
+        n = compiled.num_symbols
+        kinds = 3 if breakpoints.head_ranges or breakpoints.watches else 1
+        if kinds * n > 256:
+            raise ValueError("Demasiados símbolos para vigilar celdas de la cinta")
+
+        self.ranges = list(breakpoints.head_ranges)
+        self.watches = sorted(breakpoints.watches)
+
+        states = {compiled.state_ids[s] for s in breakpoints.states}
+        pairs = {(compiled.state_ids[s], compiled.symbol_codes[a])
+                 for s, a in breakpoints.transitions}
+
+        next_state = array('i')
+        write_symbol = array('B')
+        move = array('b')
+        for state in range(compiled.num_states):
+            base = state * n
+            for kind in range(kinds):
+                for code in range(n):
+                    index = base + code
+                    target = compiled.next_state[index]
+                    write = compiled.write_symbol[index]
+                    trap = (state in states or (state, code) in pairs
+                            or kind == _RANGE
+                            or (kind == _WATCHED and target != HALT
+                                and write != code))
+                    next_state.append(TRAP if trap else target)
+                    write_symbol.append(write + kind * n)
+                    move.append(compiled.move[index])
+
+        self.machine = copy.copy(compiled)
+        self.machine.num_symbols = kinds * n
+        self.machine.next_state = next_state
+        self.machine.write_symbol = write_symbol
+        self.machine.move = move
+
+        self._to_watched = bytes(c + n if c < n else c for c in range(256))
+        self._to_range = bytes(c % n + 2 * n if c < 3 * n else c for c in range(256))
+        self._to_plain = bytes(c % n if c < 3 * n else c for c in range(256))
+
+    def cover(self, start: int, end: int) -> tuple:
+        """Amplía la región [start, end) para incluir las celdas marcadas."""
+        for low, high in self.ranges:
+            start = min(start, low)
+            end = max(end, high + 1)
+        if self.watches:
+            start = min(start, self.watches[0])
+            end = max(end, self.watches[-1] + 1)
+        return start, end
+
+    def mark(self, cells: bytearray, origin: int):
+        """Marca las celdas vigiladas y en rango (cells[0] es la celda origin)."""
+        for position in self.watches:
+            index = position - origin
+            cells[index:index + 1] = cells[index:index + 1].translate(self._to_watched)
+        for low, high in self.ranges:
+            cells[low - origin:high - origin + 1] = \
+                cells[low - origin:high - origin + 1].translate(self._to_range)
+
+    def clear(self, cells: bytearray) -> bytearray:
+        """Cinta de códigos sin marcas."""
+        return cells.translate(self._to_plain)
@@ -0,0 +1,173 @@
+"""
+Módulo para guardar y restaurar puntos de control (checkpoints) de una
+Máquina de Turing en un formato binario compacto.
+
+Formato (little-endian):
+    cabecera   magic 'TMCK', versión, hash de la configuración, paso,
+               cabeza, tiempo acumulado, detenida, aceptada
+    textos     estado actual, entrada original
+    cinta      tabla de símbolos, offset y códigos de un byte en bruto
+    historial  configuración base y deltas de la cola (opcional)
+"""
+
+import os
+import struct
+
+from tape import Tape
+from history import ConfigurationHistory, RecentHistory, HeadTailHistory
+from loader import config_hash
+from binary_format import (COUNT, write_text, write_table, read_exact,
+                           read_count, read_text, read_table)
+
+MAGIC = b'TMCK'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sH32sqqd??')
+_OFFSET = struct.Struct('<qQ')
+_DELTA = struct.Struct('<qBBIb')
+
+
+def _delta_log(history):
+    """
+    Registro de deltas de un historial (ver ConfigurationHistory.delta_log),
+    o None si el historial no guarda deltas.
+    """
+    if isinstance(history, list):
+        return None
+    return history.delta_log()
+
+
+def save_checkpoint(machine, path: str, history_tail: int = 0):
+    """
+    Guarda el estado completo de una máquina en un archivo binario.
+
+    La escritura es atómica: se escribe un archivo temporal y luego se
+    reemplaza el destino, por lo que path siempre contiene el último
+    checkpoint completo.
+
+    Args:
+        machine: Instancia de TuringMachine
+        path: Ruta del archivo de checkpoint
+        history_tail: Número de pasos finales del historial a conservar
+            (limitado a los que conserve la política de historial)
+
+    Raises:
+        ValueError: Si se pide history_tail con un historial que no
+            guarda deltas (políticas 'none' y 'every-K')
+    """
+    codes, offset, symbols = machine.tape.export_codes()
+
+    tail = 0
+    if history_tail > 0:
+        source = _delta_log(machine.history)
+        if source is None:
+            raise ValueError("El historial de la máquina no guarda deltas; "
+                             "usa la política all, last-N o head-tail-N")
+        history, available = source
+        tail = min(history_tail, available)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION,
+                             bytes.fromhex(config_hash(machine.config)),
+                             machine.step_count, machine.head_position,
+                             machine.elapsed, machine.halted, machine.accepted))
+        write_text(f, machine.current_state)
+        write_text(f, machine.input_string)
+
+        write_table(f, symbols)
+        f.write(_OFFSET.pack(offset, len(codes)))
+        f.write(codes)
+
+        f.write(COUNT.pack(tail))
+        if tail:
+            base = len(history) - 1 - tail
+            write_text(f, history.state_table[history.states[base]])
+            f.write(_OFFSET.pack(history.positions[base] + history.moves[base], 0))
+
+            write_table(f, history.symbol_table)
+            write_table(f, history.state_table)
+            for index in range(base + 1, len(history)):
+                f.write(_DELTA.pack(history.positions[index],
+                                    history.old_symbols[index],
+                                    history.new_symbols[index],
+                                    history.states[index],
+                                    history.moves[index]))
+
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(machine, path: str):
+    """
+    Restaura en una máquina el estado guardado en un checkpoint.
+
+    La cinta se carga directamente desde los códigos en bruto, sin
+    reconstruir cadenas intermedias.
+
+    Args:
+        machine: Instancia de TuringMachine con la misma configuración
+        path: Ruta del archivo de checkpoint
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo no es un checkpoint válido o pertenece a
+            otra configuración
+    """
+    with open(path, 'rb') as f:
+        magic, version, digest, step_count, head, elapsed, halted, accepted = \
+            _HEADER.unpack(read_exact(f, _HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Formato de checkpoint no reconocido: {path}")
+        if digest.hex() != config_hash(machine.config):
+            raise ValueError("El checkpoint pertenece a otra configuración")
+
+        current_state = read_text(f)
+        input_string = read_text(f)
+
+        symbols = read_table(f)
+        offset, length = _OFFSET.unpack(read_exact(f, _OFFSET.size))
+        codes = read_exact(f, length)
+
+        machine.reset(input_string)
+        machine.tape.close()
+        machine.tape = machine.make_tape()
+        machine.tape.load_codes(codes, offset, symbols)
+        machine.current_state = current_state
+        machine.head_position = head
+        machine.step_count = step_count
+        machine.halted = halted
+        machine.accepted = accepted
+        machine.elapsed = elapsed
+
+        tail = read_count(f)
+        if not tail or machine.history_kind in ('none', 'every'):
+            machine.restart_history()
+            return
+
+        base_state = read_text(f)
+        base_head, _ = _OFFSET.unpack(read_exact(f, _OFFSET.size))
+        history_symbols = read_table(f)
+        history_states = read_table(f)
+        deltas = [_DELTA.unpack(read_exact(f, _DELTA.size)) for _ in range(tail)]
+
+    # Deshacer la cola sobre una copia de la cinta para obtener la base
+    base_tape = Tape("", machine.tape.blank)
+    base_tape.load_codes(codes, offset, symbols)
+    for position, old, _, _, _ in reversed(deltas):
+        base_tape.write(position, history_symbols[old])
+    base_content, base_offset = base_tape.get_content(margin=0)
+
+    # La cola se reconstruye con la política de historial de la máquina
+    arguments = (base_content, machine.tape.blank, base_state)
+    options = {'offset': base_offset, 'head': base_head,
+               'first_step': step_count - tail}
+    if machine.history_kind == 'last':
+        history = RecentHistory(machine.history_limit, *arguments, **options)
+    elif machine.history_kind == 'head-tail':
+        history = HeadTailHistory(machine.history_limit, *arguments, **options)
+    else:
+        history = ConfigurationHistory(*arguments, **options)
+    for position, old, new, state, move in deltas:
+        history.append(position, history_symbols[old], history_symbols[new],
+                       history_states[state], move)
+    machine.history = history
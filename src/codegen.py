@@ -0,0 +1,175 @@
+"""
+Módulo que especializa una Máquina de Turing en código fuente Python.
+
+A partir de la forma compilada (ver compiled.py) se genera una función
+con un bucle interno por estado: los símbolos son constantes enteras, la
+cinta y la cabeza son variables locales y las transiciones que no cambian
+de estado permanecen en el bucle interno sin volver a despachar el estado.
+"""
+
+from compiled import compile_machine, HALT
+from loader import config_hash
+
+# Funciones generadas por hash de la configuración: (compilada, fuente, función)
+_RUNNER_CACHE = {}
+
+
+def generate_source(compiled) -> str:
+    """
+    Genera el código fuente de la función especializada.
+
+    La función generada tiene la misma firma y el mismo resultado que
+    CompiledMachine.run, sin el argumento self.
+
+    Args:
+        compiled: Máquina compilada (CompiledMachine)
+
+    Returns:
+        String con la definición de la función run_machine
+    """
+    halting = {i for i, flag in enumerate(compiled.halting) if flag}
+    accepting = {i for i, flag in enumerate(compiled.accepting) if flag}
+
+    lines = [
+        "def run_machine(cells, head, state, steps=0, max_steps=100000):",
+        "    if not cells:",
+        "        cells.append(0)",
+        "    size = len(cells)",
+        "    shift = 0",
+        "    halted = False",
+        "    while steps < max_steps and not halted:",
+    ]
+
+    keyword = "if"
+    for state_id, state in enumerate(compiled.states):
+        base = state_id * compiled.num_symbols
+        branches = [
+            (symbol, base + symbol)
+            for symbol in range(compiled.num_symbols)
+            if compiled.next_state[base + symbol] != HALT
+        ]
+        if not branches:
+            continue
+
+        lines.append(f"        {keyword} state == {state_id}:  # {state!r}")
+        lines.append("            while steps < max_steps:")
+        lines.append("                symbol = cells[head]")
+        keyword = "elif"
+
+        symbol_keyword = "if"
+        for symbol, index in branches:
+            target = compiled.next_state[index]
+            write = compiled.write_symbol[index]
+            move = compiled.move[index]
+
+            lines.append(f"                {symbol_keyword} symbol == {symbol}:"
+                         f"  # {compiled.symbols[symbol]!r}")
+            symbol_keyword = "elif"
+
+            if write != symbol:
+                lines.append(f"                    cells[head] = {write}")
+            if move > 0:
+                lines.append("                    head += 1")
+            elif move < 0:
+                lines.append("                    head -= 1")
+            lines.append("                    steps += 1")
+            if move > 0:
+                lines.append("                    if head >= size:")
+                lines.append("                        cells.extend(bytes(size))")
+                lines.append("                        size += size")
+            elif move < 0:
+                lines.append("                    if head < 0:")
+                lines.append("                        cells[0:0] = bytes(size)")
+                lines.append("                        head += size")
+                lines.append("                        shift += size")
+                lines.append("                        size += size")
+
+            if target == state_id and target not in halting:
+                lines.append("                    continue")
+            else:
+                if target != state_id:
+                    lines.append(f"                    state = {target}"
+                                 f"  # {compiled.states[target]!r}")
+                if target in halting:
+                    lines.append("                    halted = True")
+                lines.append("                    break")
+
+        lines.append("                else:")
+        lines.append("                    halted = True")
+        lines.append("                    break")
+
+    if keyword == "if":
+        lines.append("        halted = True")
+    else:
+        lines.append("        else:")
+        lines.append("            halted = True")
+
+    lines.extend([
+        "    return {",
+        "        'state': state,",
+        "        'head': head,",
+        "        'steps': steps,",
+        "        'halted': halted,",
+        f"        'accepted': halted and state in {accepting or 'set()'},",
+        "        'trapped': False,",
+        "        'cells': cells,",
+        "        'shift': shift",
+        "    }",
+    ])
+
+    return '\n'.join(lines) + '\n'
+
+
+def compile_source(source: str):
+    """Compila el código generado a un objeto código (serializable con marshal)."""
+    return compile(source, '<turing-codegen>', 'exec')
+
+
+def build_runner(source: str, code=None):
+    """
+    Ejecuta el código generado, retornando la función.
+
+    Args:
+        source: Código fuente generado por generate_source
+        code: Objeto código ya compilado de source (opcional)
+    """
+    namespace = {}
+    exec(code if code is not None else compile_source(source), namespace)
+    return namespace['run_machine']
+
+
+def register_runner(key: str, compiled, source: str, code=None):
+    """
+    Registra una función ya generada para una configuración, por ejemplo
+    la cargada desde la caché en disco (ver machine_cache.py).
+
+    Args:
+        key: Hash de la configuración (loader.config_hash)
+        compiled: Máquina compilada de la configuración
+        source: Código fuente generado
+        code: Objeto código compilado de source (opcional)
+    """
+    _RUNNER_CACHE[key] = (compiled, source, build_runner(source, code))
+
+
+def get_runner(config: dict) -> tuple:
+    """
+    Obtiene la función especializada para una configuración.
+
+    El código se genera una sola vez por contenido de configuración y se
+    reutiliza en llamadas posteriores.
+
+    Args:
+        config: Diccionario con la configuración de la máquina
+
+    Returns:
+        Tupla (máquina compilada, función generada)
+    """
+    key = config_hash(config)
+    cached = _RUNNER_CACHE.get(key)
+    if cached is None:
+        compiled = compile_machine(config)
+        source = generate_source(compiled)
+        cached = (compiled, source, build_runner(source))
+        _RUNNER_CACHE[key] = cached
+    return cached[0], cached[2]
@@ -0,0 +1,266 @@
+"""
+Módulo que compila la configuración de una Máquina de Turing a tablas enteras.
+"""
+
+from array import array
+
+from loader import MOVES
+
+# Estado destino que indica que no hay transición (la máquina se detiene)
+HALT = -1
+
+# Estado destino de una transición trampa: la ejecución se interrumpe antes
+# de aplicarla (ver breakpoints.py)
+TRAP = -2
+
+
+class CompiledMachine:
+    """
+    Forma compilada de una Máquina de Turing.
+
+    Estados y símbolos se numeran de forma densa (el blanco es siempre el
+    símbolo 0) y las transiciones se guardan en tres tablas planas
+    indexadas por estado * num_symbols + símbolo: estado destino (HALT si
+    no hay transición), símbolo a escribir y desplazamiento de la cabeza.
+    Los estados de aceptación y rechazo se marcan en mapas de bytes.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Compila una configuración ya validada.
+
+        Args:
+            config: Diccionario con la configuración de la máquina
+        """
+        self.blank = config['simbolo_blanco']
+        transitions = config['transiciones']
+
+        # Numerar símbolos: blanco, alfabeto de cinta y los usados en transiciones
+        self.symbols = [self.blank]
+        self.symbol_codes = {self.blank: 0}
+        for symbol in config['alfabeto_cinta']:
+            self._add_symbol(symbol)
+        for trans_dict in transitions.values():
+            for symbol, (_, write_symbol, _) in trans_dict.items():
+                self._add_symbol(symbol)
+                self._add_symbol(write_symbol)
+
+        # Numerar estados: los declarados y los referenciados en transiciones
+        self.states = []
+        self.state_ids = {}
+        for state in config['estados']:
+            self._add_state(state)
+        for state, trans_dict in transitions.items():
+            self._add_state(state)
+            for next_state, _, _ in trans_dict.values():
+                self._add_state(next_state)
+
+        self.num_states = len(self.states)
+        self.num_symbols = len(self.symbols)
+        self.initial_state = self.state_ids[config['estado_inicial']]
+
+        size = self.num_states * self.num_symbols
+        self.next_state = array('i', [HALT]) * size
+        self.write_symbol = array('B', bytes(size))
+        self.move = array('b', bytes(size))
+
+        for state, trans_dict in transitions.items():
+            base = self.state_ids[state] * self.num_symbols
+            for symbol, (next_state, write_symbol, direction) in trans_dict.items():
+                index = base + self.symbol_codes[symbol]
+                self.next_state[index] = self.state_ids[next_state]
+                self.write_symbol[index] = self.symbol_codes[write_symbol]
+                self.move[index] = MOVES.get(direction, 0)
+
+        self.accepting = bytearray(self.num_states)
+        self.rejecting = bytearray(self.num_states)
+        for state in config['estados_aceptacion']:
+            self.accepting[self.state_ids[state]] = 1
+        for state in config.get('estados_rechazo', []):
+            self.rejecting[self.state_ids[state]] = 1
+        self.halting = bytearray(a | r for a, r in zip(self.accepting, self.rejecting))
+
+    def to_tables(self) -> dict:
+        """
+        Exporta la máquina compilada como un diccionario de tipos básicos
+        (listas, enteros y bytes) apto para marshal.
+        """
+        return {
+            'blank': self.blank,
+            'symbols': list(self.symbols),
+            'states': list(self.states),
+            'initial_state': self.initial_state,
+            'next_state': self.next_state.tobytes(),
+            'write_symbol': self.write_symbol.tobytes(),
+            'move': self.move.tobytes(),
+            'accepting': bytes(self.accepting),
+            'rejecting': bytes(self.rejecting)
+        }
+
+    @classmethod
+    def from_tables(cls, tables: dict) -> 'CompiledMachine':
+        """
+        Reconstruye una máquina compilada exportada con to_tables() sin
+        volver a recorrer la configuración.
+
+        Raises:
+            ValueError: Si las tablas no son coherentes
+        """
+        machine = cls.__new__(cls)
+        machine.blank = tables['blank']
+        machine.symbols = list(tables['symbols'])
+        machine.symbol_codes = {s: i for i, s in enumerate(machine.symbols)}
+        machine.states = list(tables['states'])
+        machine.state_ids = {s: i for i, s in enumerate(machine.states)}
+        machine.num_states = len(machine.states)
+        machine.num_symbols = len(machine.symbols)
+        machine.initial_state = tables['initial_state']
+
+        machine.next_state = array('i')
+        machine.next_state.frombytes(tables['next_state'])
+        machine.write_symbol = array('B', tables['write_symbol'])
+        machine.move = array('b')
+        machine.move.frombytes(tables['move'])
+        machine.accepting = bytearray(tables['accepting'])
+        machine.rejecting = bytearray(tables['rejecting'])
+        machine.halting = bytearray(a | r for a, r in
+                                    zip(machine.accepting, machine.rejecting))
+
+        size = machine.num_states * machine.num_symbols
+        if (len(machine.next_state) != size or len(machine.write_symbol) != size
+                or len(machine.move) != size
+                or len(machine.accepting) != machine.num_states):
+            raise ValueError("Tablas de máquina compilada incoherentes")
+        return machine
+
+    def _add_symbol(self, symbol: str):
+        """Registra un símbolo si aún no tiene código."""
+        if symbol not in self.symbol_codes:
+            if len(self.symbols) > 255:
+                raise ValueError("La máquina compilada admite como máximo 256 símbolos")
+            self.symbol_codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def _add_state(self, state: str):
+        """Registra un estado si aún no tiene identificador."""
+        if state not in self.state_ids:
+            self.state_ids[state] = len(self.states)
+            self.states.append(state)
+
+    def encode(self, content: str) -> bytearray:
+        """
+        Convierte una cadena de símbolos en un bytearray de códigos.
+
+        Raises:
+            ValueError: Si la cadena contiene un símbolo desconocido
+        """
+        try:
+            return bytearray(self.symbol_codes[symbol] for symbol in content)
+        except KeyError as e:
+            raise ValueError(f"Símbolo fuera del alfabeto de cinta: {e.args[0]}")
+
+    def decode(self, cells) -> str:
+        """Convierte una secuencia de códigos en la cadena de símbolos."""
+        symbols = self.symbols
+        return ''.join([symbols[code] for code in cells])
+
+    def transitions(self):
+        """
+        Recorre las transiciones definidas con nombres legibles.
+
+        Yields:
+            Tuplas (estado, símbolo, nuevo_estado, simbolo_escribir, desplazamiento)
+        """
+        for index, target in enumerate(self.next_state):
+            if target != HALT:
+                state, symbol = divmod(index, self.num_symbols)
+                yield (self.states[state], self.symbols[symbol],
+                       self.states[target],
+                       self.symbols[self.write_symbol[index]],
+                       self.move[index])
+
+    def run(self, cells: bytearray, head: int, state: int,
+            steps: int = 0, max_steps: int = 100000) -> dict:
+        """
+        Ejecuta la máquina sobre una cinta de códigos.
+
+        El bucle trabaja solo con variables locales y no crea objetos por
+        paso. La cinta crece duplicando su tamaño por el extremo que la
+        cabeza abandona; al crecer por la izquierda los índices se desplazan.
+        Una transición con destino TRAP interrumpe la ejecución sin aplicarla
+        y sin detener la máquina; como la comprobación es la misma que la de
+        HALT, las trampas no cuestan nada mientras no se disparan.
+
+        Args:
+            cells: Cinta como bytearray de códigos (se modifica en el lugar)
+            head: Índice de la cabeza dentro de cells
+            state: Identificador del estado actual
+            steps: Pasos ya ejecutados
+            max_steps: Número máximo de pasos permitidos
+
+        Returns:
+            Diccionario con state, head, steps, halted, accepted, trapped,
+            cells y shift (celdas añadidas por la izquierda)
+        """
+        next_state = self.next_state
+        write_symbol = self.write_symbol
+        move = self.move
+        halting = self.halting
+        num_symbols = self.num_symbols
+
+        if not cells:
+            cells.append(0)
+        size = len(cells)
+        shift = 0
+        halted = False
+        trapped = False
+
+        while steps < max_steps:
+            index = state * num_symbols + cells[head]
+            target = next_state[index]
+            if target < 0:
+                trapped = target == TRAP
+                halted = not trapped
+                break
+
+            cells[head] = write_symbol[index]
+            head += move[index]
+            state = target
+            steps += 1
+
+            if head < 0:
+                cells[0:0] = bytes(size)
+                head += size
+                shift += size
+                size += size
+            elif head >= size:
+                cells.extend(bytes(size))
+                size += size
+
+            if halting[state]:
+                halted = True
+                break
+
+        return {
+            'state': state,
+            'head': head,
+            'steps': steps,
+            'halted': halted,
+            'accepted': halted and bool(self.accepting[state]),
+            'trapped': trapped,
+            'cells': cells,
+            'shift': shift
+        }
+
+
+def compile_machine(config: dict) -> CompiledMachine:
+    """
+    Compila una configuración a tablas enteras densas.
+
+    Args:
+        config: Diccionario con la configuración de la máquina
+
+    Returns:
+        Instancia de CompiledMachine
+    """
+    return CompiledMachine(config)
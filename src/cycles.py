@@ -0,0 +1,325 @@
+"""
+Módulo para detectar ciclos (no terminación) durante la ejecución de una
+Máquina de Turing.
+
+Se detectan dos tipos de ciclo:
+
+- Exacto: la máquina repite una configuración (estado, cabeza, cinta).
+  Se usa el algoritmo de Brent sobre un hash polinomial de la cinta que se
+  actualiza en O(1) por paso; cada coincidencia de hash se confirma
+  comparando la cinta completa.
+- Desplazado: la máquina avanza sobre blancos que nunca visitó, llega a
+  una celda nueva en el mismo estado que en una celda nueva anterior y,
+  entre ambas, nunca volvió por detrás de la primera. Desde entonces
+  repite el mismo tramo desplazado indefinidamente.
+"""
+
+from tape import Tape
+from loader import get_transition, MOVES
+
+# Tipos de ciclo
+EXACT = 'exact'
+TRANSLATED = 'translated'
+
+# Parámetros del hash polinomial (módulo primo de Mersenne 2^61 - 1)
+MODULUS = (1 << 61) - 1
+BASE = 1000003
+INVERSE = pow(BASE, -1, MODULUS)
+
+
+class RollingConfiguration:
+    """
+    Hash de una configuración que se actualiza con cada paso.
+
+    El hash de la cinta es la suma de valor(símbolo) * BASE^posición, con
+    valor 0 para el blanco, por lo que escribir en la celda de la cabeza
+    solo requiere BASE^cabeza, que se mantiene al mover la cabeza.
+    """
+
+    def __init__(self, tape, state: str, head: int, step: int = 0):
+        """
+        Calcula el hash de la configuración actual.
+
+        Args:
+            tape: Cinta de la máquina
+            state: Estado actual
+            head: Posición de la cabeza
+            step: Número de paso actual
+        """
+        self._values = {tape.blank: 0}
+        self.state = state
+        self.head = head
+        self.step = step
+
+        content, offset = tape.get_content(margin=0)
+        self.hash = 0
+        power = pow(BASE, offset, MODULUS)
+        for symbol in content:
+            self.hash = (self.hash + self._value(symbol) * power) % MODULUS
+            power = power * BASE % MODULUS
+        self.power = pow(BASE, head, MODULUS)
+
+    def _value(self, symbol: str) -> int:
+        value = self._values.get(symbol)
+        if value is None:
+            value = len(self._values)
+            self._values[symbol] = value
+        return value
+
+    def update(self, old_symbol: str, new_symbol: str, state: str, move: int):
+        """Aplica un paso que escribió en la celda de la cabeza."""
+        if old_symbol != new_symbol:
+            delta = self._value(new_symbol) - self._value(old_symbol)
+            self.hash = (self.hash + delta * self.power) % MODULUS
+        if move > 0:
+            self.power = self.power * BASE % MODULUS
+        elif move < 0:
+            self.power = self.power * INVERSE % MODULUS
+        self.head += move
+        self.state = state
+        self.step += 1
+
+    def key(self) -> tuple:
+        return (self.state, self.head, self.hash)
+
+
+class CycleDetector:
+    """
+    Detector de ciclos alimentado con los pasos de la máquina.
+
+    observe() y observe_sweep() reciben los mismos datos que el historial
+    y devuelven el ciclo encontrado (o None). El ciclo es un diccionario
+    con kind ('exact' o 'translated'), start (primer paso del ciclo; en
+    los desplazados, un paso desde el que ya se repite), period (pasos
+    por vuelta) y detected_at (paso en que se detectó).
+    """
+
+    def __init__(self, config: dict, tape, state: str, head: int,
+                 step: int = 0):
+        """
+        Inicializa el detector en la configuración actual.
+
+        Args:
+            config: Diccionario con la configuración de la máquina
+            tape: Cinta de la máquina (se lee para confirmar coincidencias)
+            state: Estado actual
+            head: Posición de la cabeza
+            step: Número de paso actual
+        """
+        self.config = config
+        self.tape = tape
+        self.current = RollingConfiguration(tape, state, head, step)
+        self.cycle = None
+
+        # Configuración inicial, para localizar el inicio de un ciclo exacto
+        self._start = (tape.get_content(margin=0), tape.blank, state, head, step)
+
+        # Brent: la tortuga se reubica cuando lam alcanza limit
+        self._limit = 1
+        self._lam = 0
+        self._set_tortoise()
+
+        # Celdas nuevas: extremos visitados y candidatos por lado
+        # [paso, estado, cabeza, registros desde el candidato, límite, extremo]
+        low, high = tape.get_bounds()
+        self._right = max(high, head)
+        self._left = min(low, head)
+        self._candidates = {1: None, -1: None}
+
+    def _set_tortoise(self):
+        """Fija la tortuga de Brent en la configuración actual."""
+        current = self.current
+        self._tortoise = current.key()
+        self._tortoise_step = current.step
+        self._tortoise_content = self.tape.get_content(margin=0)
+
+    def _matches_tortoise(self) -> bool:
+        """Confirma una coincidencia de hash comparando la cinta."""
+        return self.tape.get_content(margin=0) == self._tortoise_content
+
+    def _found(self, kind: str, start: int, period: int) -> dict:
+        self.cycle = {
+            'kind': kind,
+            'start': start,
+            'period': period,
+            'detected_at': self.current.step
+        }
+        return self.cycle
+
+    def _record(self, direction: int):
+        """
+        Procesa la llegada de la cabeza a una celda nueva (todas las
+        celdas desde ella en la dirección del movimiento son blancas).
+        """
+        current = self.current
+        candidate = self._candidates[direction]
+        if candidate is not None:
+            if (candidate[1] == current.state and
+                    candidate[5] * direction >= candidate[2] * direction):
+                return self._found(TRANSLATED, candidate[0],
+                                   current.step - candidate[0])
+            candidate[3] += 1
+            if candidate[3] < candidate[4]:
+                return None
+
+        limit = candidate[4] * 2 if candidate is not None else 1
+        self._candidates[direction] = [current.step, current.state, current.head,
+                                       0, limit, current.head]
+        return None
+
+    def observe(self, position: int, old_symbol: str, new_symbol: str,
+                state: str, move: int):
+        """
+        Registra un paso ya aplicado a la cinta.
+
+        Returns:
+            Diccionario del ciclo si se detectó uno, o None
+        """
+        current = self.current
+        current.update(old_symbol, new_symbol, state, move)
+        head = current.head
+
+        # Ciclo exacto (Brent)
+        if current.key() == self._tortoise and self._matches_tortoise():
+            period = current.step - self._tortoise_step
+            return self._found(EXACT, self._find_start(period), period)
+        self._lam += 1
+        if self._lam == self._limit:
+            self._set_tortoise()
+            self._limit *= 2
+            self._lam = 0
+
+        # Extremos alcanzados desde cada candidato de ciclo desplazado
+        right = self._candidates[1]
+        if right is not None and head < right[5]:
+            right[5] = head
+        left = self._candidates[-1]
+        if left is not None and head > left[5]:
+            left[5] = head
+
+        # Ciclo desplazado
+        if head > self._right:
+            self._right = head
+            return self._record(1)
+        if head < self._left:
+            self._left = head
+            return self._record(-1)
+        return None
+
+    def observe_sweep(self, position: int, symbol: str, state: str,
+                      move: int, count: int) -> int:
+        """
+        Registra un barrido de count pasos sin aplicarlo todavía.
+
+        Durante un barrido la cinta y el estado no cambian y la cabeza
+        avanza siempre en la misma dirección, por lo que se procesa en
+        tramos sin recorrer cada paso.
+
+        Returns:
+            Número de pasos del barrido a ejecutar: count, o menos si se
+            detectó un ciclo dentro del barrido
+        """
+        current = self.current
+        first_step = current.step
+        done = 0
+
+        while done < count:
+            # Pasos hasta la próxima reubicación de la tortuga
+            chunk = min(count - done, self._limit - self._lam)
+            start_head = current.head
+
+            # ¿La tortuga está en el tramo recorrido con la misma cinta y estado?
+            tortoise_state, tortoise_head, tortoise_hash = self._tortoise
+            offset = (tortoise_head - start_head) * move
+            if (tortoise_state == state and tortoise_hash == current.hash
+                    and 1 <= offset <= chunk and self._matches_tortoise()):
+                self._advance(state, move, offset)
+                period = current.step - self._tortoise_step
+                self._found(EXACT, self._find_start(period), period)
+                return done + offset
+
+            # ¿El tramo entra en celdas nuevas?
+            extreme = self._right if move > 0 else self._left
+            fresh = (start_head + move * chunk - extreme) * move
+            if fresh > 0:
+                before = max(0, (extreme - start_head) * move)
+                self._advance(state, move, before + 1)
+                found = self._record(move)
+                if found is None and fresh >= 2:
+                    # Dos celdas nuevas seguidas en el mismo estado
+                    self._candidates[move] = [current.step, state, current.head,
+                                              0, 1, current.head]
+                    self._advance(state, move, 1)
+                    found = self._record(move)
+                if found is not None:
+                    return current.step - first_step
+                remaining = chunk - (current.head - start_head) * move
+                self._advance(state, move, remaining)
+            else:
+                self._advance(state, move, chunk)
+
+            done = current.step - first_step
+            if self._lam == self._limit:
+                self._set_tortoise()
+                self._limit *= 2
+                self._lam = 0
+
+        return count
+
+    def _advance(self, state: str, move: int, steps: int):
+        """Avanza la configuración steps pasos de barrido."""
+        if steps <= 0:
+            return
+        current = self.current
+        current.head += move * steps
+        current.power = current.power * pow(BASE if move > 0 else INVERSE,
+                                             steps, MODULUS) % MODULUS
+        current.state = state
+        current.step += steps
+        self._lam += steps
+        if move > 0:
+            self._right = max(self._right, current.head)
+            left = self._candidates[-1]
+            if left is not None:
+                left[5] = max(left[5], current.head)
+        else:
+            self._left = min(self._left, current.head)
+            right = self._candidates[1]
+            if right is not None:
+                right[5] = min(right[5], current.head)
+
+    def _find_start(self, period: int) -> int:
+        """
+        Localiza el primer paso del ciclo exacto repitiendo la ejecución
+        desde la configuración inicial con dos copias separadas por period
+        pasos, hasta que sus configuraciones coinciden.
+        """
+        first = _Replay(self.config, *self._start)
+        second = _Replay(self.config, *self._start)
+        for _ in range(period):
+            second.step()
+        while first.state.key() != second.state.key():
+            first.step()
+            second.step()
+        return first.state.step
+
+
+class _Replay:
+    """Copia mínima de la máquina para repetir una ejecución."""
+
+    def __init__(self, config: dict, start: tuple, blank: str, state: str,
+                 head: int, step: int):
+        self.config = config
+        content, offset = start
+        self.tape = Tape("", blank)
+        for i, symbol in enumerate(content):
+            self.tape.write(offset + i, symbol)
+        self.state = RollingConfiguration(self.tape, state, head, step)
+
+    def step(self):
+        current = self.state
+        symbol = self.tape.read(current.head)
+        new_state, write_symbol, direction = get_transition(
+            self.config, current.state, symbol)
+        self.tape.write(current.head, write_symbol)
+        current.update(symbol, write_symbol, new_state, MOVES.get(direction, 0))
@@ -2,16 +2,39 @@
 """
 Módulo para generar diagramas de transiciones de la Máquina de Turing.
 Genera archivos en formato Mermaid (.md) y DOT/Graphviz (.dot).
+
+Junto a los diagramas se guarda un hash del JSON del que se generaron
+(archivo .sha256); update_diagrams() solo los regenera si ese hash no
+coincide con el del JSON actual.
 """
 
 import os
 import sys
+import hashlib
 from datetime import datetime
 from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from loader import load_machine_config
 
+# Versión del formato de los diagramas; cambiarla fuerza su regeneración
+DIAGRAM_VERSION = 1
+
+
+def transition_label(symbol: str, write_symbol, direction) -> str:
+    """
+    Etiqueta de una transición: 'leído/escrito,dirección', con β como
+    blanco. En las máquinas de varias cintas cada parte es una tupla con
+    un elemento por cinta, por ejemplo '(1,β,β)/(β,1,β),(R,R,S)'.
+    """
+    def show(symbols):
+        return ','.join(s if s != '_' else 'β' for s in symbols)
+    
+    if isinstance(write_symbol, list):
+        return (f"({show(symbol.split(','))})/({show(write_symbol)}),"
+                f"({','.join(direction)})")
+    return f"{show([symbol])}/{show([write_symbol])},{direction}"
+
 
 def generate_mermaid_diagram(config: dict) -> str:
     """
@@ -39,11 +62,7 @@ def generate_mermaid_diagram(config: dict) -> str:
     
     for state, trans_dict in config['transiciones'].items():
         for symbol, (next_state, write_symbol, direction) in trans_dict.items():
-            # Usar caracteres especiales seguros para Mermaid
-            symbol_display = symbol if symbol != '_' else 'β'
-            write_display = write_symbol if write_symbol != '_' else 'β'
-            
-            label = f"{symbol_display}/{write_display},{direction}"
+            label = transition_label(symbol, write_symbol, direction)
             transitions_grouped[(state, next_state)].append(label)
     
     # Generar transiciones
@@ -91,11 +110,7 @@ def generate_dot_diagram(config: dict) -> str:
     
     for state, trans_dict in config['transiciones'].items():
         for symbol, (next_state, write_symbol, direction) in trans_dict.items():
-            # Usar caracteres especiales seguros
-            symbol_display = symbol if symbol != '_' else 'β'
-            write_display = write_symbol if write_symbol != '_' else 'β'
-            
-            label = f"{symbol_display}/{write_display},{direction}"
+            label = transition_label(symbol, write_symbol, direction)
             transitions_grouped[(state, next_state)].append(label)
     
     # Generar transiciones
@@ -222,7 +237,8 @@ def generate_markdown_file(config: dict, mermaid_diagram: str) -> str:
     return content
 
 
-def save_diagrams(config: dict, output_dir: str, verbose: bool = True) -> tuple:
+def save_diagrams(config: dict, output_dir: str, verbose: bool = True,
+                  base_name: str = 'fibonacci_diagrama') -> tuple:
     """
     Genera y guarda los archivos de diagrama.
     
@@ -230,6 +246,7 @@ def save_diagrams(config: dict, output_dir: str, verbose: bool = True) -> tuple:
         config: Configuración de la máquina de Turing
         output_dir: Directorio donde guardar los archivos
         verbose: Si mostrar mensajes de progreso
+        base_name: Nombre de los archivos sin extensión
     
     Returns:
         Tupla con las rutas de los archivos generados (md_path, dot_path)
@@ -241,11 +258,6 @@ def save_diagrams(config: dict, output_dir: str, verbose: bool = True) -> tuple:
     dot = generate_dot_diagram(config)
     markdown = generate_markdown_file(config, mermaid)
     
-    # Determinar nombre base del archivo
-    machine_name = config.get('nombre', 'turing_machine')
-    # Simplificar nombre para archivo
-    base_name = 'fibonacci_diagrama'
-    
     # Guardar archivos
     md_path = os.path.join(output_dir, f"{base_name}.md")
     dot_path = os.path.join(output_dir, f"{base_name}.dot")
@@ -277,13 +289,77 @@ def generate_from_json(json_path: str, output_dir: str = None,
         Tupla con las rutas de los archivos generados
     """
     config = load_machine_config(json_path)
+    output_dir = output_dir or default_output_dir()
     
-    if output_dir is None:
-        # Usar directorio diagramas/ relativo al proyecto
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        output_dir = os.path.join(project_root, 'diagramas')
+    paths = save_diagrams(config, output_dir, verbose, base_name(json_path))
+    with open(hash_path(json_path, output_dir), 'w', encoding='utf-8') as f:
+        f.write(source_hash(json_path) + "\n")
+    return paths
+
+
+def default_output_dir() -> str:
+    """Directorio diagramas/ relativo al proyecto."""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, 'diagramas')
+
+
+def base_name(json_path: str) -> str:
+    """Nombre de los diagramas de un JSON: maquinas/X.json -> X_diagrama."""
+    return os.path.splitext(os.path.basename(json_path))[0] + '_diagrama'
+
+
+def hash_path(json_path: str, output_dir: str) -> str:
+    """Ruta del archivo con el hash del JSON de los diagramas guardados."""
+    return os.path.join(output_dir, f"{base_name(json_path)}.sha256")
+
+
+def source_hash(json_path: str) -> str:
+    """Hash del contenido del JSON y de la versión del formato de diagramas."""
+    digest = hashlib.sha256(f"{DIAGRAM_VERSION}\n".encode('ascii'))
+    with open(json_path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def diagrams_up_to_date(json_path: str, output_dir: str = None) -> bool:
+    """
+    Indica si los diagramas guardados corresponden al JSON actual.
+    
+    Args:
+        json_path: Ruta al archivo JSON de configuración
+        output_dir: Directorio de los diagramas (por defecto: ../diagramas/)
     
-    return save_diagrams(config, output_dir, verbose)
+    Returns:
+        True si existen los diagramas y su hash coincide con el del JSON
+    """
+    output_dir = output_dir or default_output_dir()
+    for extension in ('md', 'dot'):
+        if not os.path.exists(os.path.join(output_dir, f"{base_name(json_path)}.{extension}")):
+            return False
+    try:
+        with open(hash_path(json_path, output_dir), 'r', encoding='utf-8') as f:
+            return f.read().strip() == source_hash(json_path)
+    except OSError:
+        return False
+
+
+def update_diagrams(json_path: str, output_dir: str = None,
+                    verbose: bool = False) -> bool:
+    """
+    Regenera los diagramas solo si el JSON cambió desde la última vez.
+    
+    Args:
+        json_path: Ruta al archivo JSON de configuración
+        output_dir: Directorio de salida (por defecto: ../diagramas/)
+        verbose: Si mostrar mensajes de progreso
+    
+    Returns:
+        True si se regeneraron los diagramas, False si ya estaban al día
+    """
+    if diagrams_up_to_date(json_path, output_dir):
+        return False
+    generate_from_json(json_path, output_dir, verbose)
+    return True
 
 
 def main():
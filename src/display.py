@@ -2,11 +2,20 @@
 Módulo para visualizar las configuraciones de la Máquina de Turing.
 """
 
+import sys
+
+from loader import get_notation
+from turing_machine import decode_number, extract_result
+
 
 def format_configuration(config: dict, show_tape_ruler: bool = False) -> str:
     """
     Formatea una configuración para mostrarla.
     
+    Las configuraciones de máquinas de varias cintas (claves heads, tapes
+    y offsets, ver multitape.py) se muestran con una línea y un indicador
+    de cabeza por cinta.
+    
     Args:
         config: Diccionario con la configuración (step, state, head, tape, offset)
         show_tape_ruler: Si mostrar números de posición
@@ -14,6 +23,9 @@ def format_configuration(config: dict, show_tape_ruler: bool = False) -> str:
     Returns:
         String formateado de la configuración
     """
+    if 'tapes' in config:
+        return format_multitape_configuration(config)
+    
     step = config['step']
     state = config['state']
     head = config['head']
@@ -36,16 +48,158 @@ def format_configuration(config: dict, show_tape_ruler: bool = False) -> str:
     return '\n'.join(lines)
 
 
+def format_multitape_configuration(config: dict) -> str:
+    """
+    Formatea una configuración de una máquina de varias cintas.
+    
+    Args:
+        config: Diccionario con la configuración (step, state, heads, tapes, offsets)
+    
+    Returns:
+        String formateado de la configuración
+    """
+    heads = config['heads']
+    positions = ', '.join(str(head) for head in heads)
+    lines = [f"Paso {config['step']:4d} | Estado: {config['state']:15s} | Cabezas: {positions}"]
+    
+    for i, (tape, offset, head) in enumerate(zip(config['tapes'], config['offsets'], heads)):
+        head_indicator = ' ' * (head - offset) + '^'
+        lines.append(f"         | Cinta {i + 1}: [{tape}]")
+        lines.append(f"         |          [{head_indicator}]")
+    
+    return '\n'.join(lines)
+
+
+# Configuraciones acumuladas antes de cada escritura en render_history
+RENDER_CHUNK = 256
+
+
+def crop_configuration(config: dict, window: int) -> dict:
+    """
+    Recorta la cinta de una configuración a las celdas a menos de window
+    posiciones de la cabeza. Admite configuraciones de varias cintas.
+    
+    Args:
+        config: Diccionario de configuración
+        window: Celdas a mostrar a cada lado de la cabeza
+    
+    Returns:
+        Nueva configuración con la cinta (o las cintas) recortada
+    """
+    def crop(tape, offset, head):
+        low = max(head - window, offset)
+        return tape[low - offset:head + window + 1 - offset], low
+    
+    cropped = dict(config)
+    if 'tapes' in config:
+        pieces = [crop(tape, offset, head) for tape, offset, head
+                  in zip(config['tapes'], config['offsets'], config['heads'])]
+        cropped['tapes'] = [tape for tape, _ in pieces]
+        cropped['offsets'] = [offset for _, offset in pieces]
+    else:
+        cropped['tape'], cropped['offset'] = crop(config['tape'], config['offset'],
+                                                  config['head'])
+    return cropped
+
+
+def select_configurations(history, first: int = None, last: int = None,
+                          every: int = 1, window: int = None):
+    """
+    Genera perezosamente las configuraciones de un rango de pasos.
+    
+    Los historiales con el método configurations (ver history.py)
+    reconstruyen solo las configuraciones seleccionadas; para los demás
+    (listas, historiales muestreados) se recorren las configuraciones
+    conservadas y se filtran por número de paso.
+    
+    Args:
+        history: Historial de configuraciones
+        first: Primer paso a mostrar (por defecto el primero)
+        last: Último paso a mostrar, incluido (por defecto el último)
+        every: Intervalo entre pasos, contado desde first (o desde la
+            primera configuración mostrada)
+        window: Celdas a mostrar a cada lado de la cabeza (None para toda
+            la cinta)
+    
+    Yields:
+        Diccionarios de configuración
+    """
+    if hasattr(history, 'configurations'):
+        yield from history.configurations(first, last, every, window)
+        return
+    
+    anchor = first
+    for config in history:
+        step = config['step']
+        if first is not None and step < first:
+            continue
+        if last is not None and step > last:
+            break
+        if anchor is None:
+            anchor = step
+        if (step - anchor) % every:
+            continue
+        yield config if window is None else crop_configuration(config, window)
+
+
+def render_history(history, first: int = None, last: int = None,
+                   every: int = 1, window: int = None, out=None) -> int:
+    """
+    Escribe las configuraciones seleccionadas, separadas por guiones.
+    
+    Las configuraciones se formatean a medida que se generan y se escriben
+    en bloques de RENDER_CHUNK, de modo que el costo depende solo de lo
+    que se muestra.
+    
+    Args:
+        history: Historial de configuraciones
+        first, last, every, window: Selección (ver select_configurations)
+        out: Flujo de salida (por defecto sys.stdout)
+    
+    Returns:
+        Número de configuraciones escritas
+    """
+    out = out or sys.stdout
+    separator = "-" * 50
+    lines = []
+    shown = 0
+    for config in select_configurations(history, first, last, every, window):
+        if shown:
+            lines.append(separator)
+        lines.append(format_configuration(config))
+        shown += 1
+        if len(lines) >= RENDER_CHUNK:
+            out.write('\n'.join(lines) + '\n')
+            lines.clear()
+    if lines:
+        out.write('\n'.join(lines) + '\n')
+    out.flush()
+    return shown
+
+
 def print_history(history: list, max_display: int = None, 
-                  show_all: bool = False, step_interval: int = 1):
+                  show_all: bool = False, step_interval: int = 1,
+                  first: int = None, last: int = None, window: int = None,
+                  total_steps: int = None):
     """
     Imprime el historial de configuraciones.
     
+    Acepta cualquier historial indexable (ver history.py), incluidos los
+    que solo conservan parte de las configuraciones; el número de paso de
+    cada configuración se toma de la propia configuración.
+    
     Args:
         history: Lista de configuraciones
         max_display: Máximo de configuraciones a mostrar
-        show_all: Si mostrar todas las configuraciones
+        show_all: Si mostrar todas las configuraciones (del rango
+            first..last, una cada step_interval pasos)
         step_interval: Intervalo entre pasos mostrados
+        first: Primer paso a mostrar
+        last: Último paso a mostrar, incluido
+        window: Celdas a mostrar a cada lado de la cabeza (None para toda
+            la cinta)
+        total_steps: Pasos de la ejecución, si se conocen (evita
+            reconstruir la última configuración solo para obtenerlos)
     """
     if not history:
         print("No hay historial de configuraciones.")
@@ -54,7 +208,9 @@ def print_history(history: list, max_display: int = None,
     total = len(history)
     
     if show_all or (max_display and total <= max_display):
-        configs_to_show = history[::step_interval]
+        shown = render_history(history, first, last, step_interval, window)
+        if shown == 0:
+            print("Ningún paso del historial está en el rango pedido.")
     else:
         # Mostrar primeras y últimas
         n = max_display or 20
@@ -63,14 +219,13 @@ def print_history(history: list, max_display: int = None,
         print(f"\n{'='*60}")
         print(f"Mostrando {n} de {total} configuraciones")
         print(f"{'='*60}\n")
+        render_history(configs_to_show, window=window)
     
-    for i, config in enumerate(configs_to_show):
-        print(format_configuration(config))
-        if i < len(configs_to_show) - 1:
-            print("-" * 50)
-    
+    last_step = history[-1]['step'] if total_steps is None else total_steps
     print(f"\n{'='*60}")
-    print(f"Total de pasos: {total - 1}")
+    print(f"Total de pasos: {last_step}")
+    if total - 1 != last_step:
+        print(f"Configuraciones conservadas: {total}")
 
 
 def print_summary(machine, input_str: str):
@@ -81,17 +236,49 @@ def print_summary(machine, input_str: str):
         machine: Instancia de TuringMachine
         input_str: Cadena de entrada
     """
+    print_record_summary(machine.config, input_str, {
+        'steps': machine.step_count,
+        'state': machine.current_state,
+        'accepted': machine.accepted,
+        'cycle': machine.cycle,
+        'tape': machine.get_result()
+    })
+
+
+def print_record_summary(config: dict, input_str: str, record: dict):
+    """
+    Imprime el resumen de una ejecución a partir de sus datos.
+    
+    Args:
+        config: Configuración de la máquina
+        input_str: Cadena de entrada
+        record: Diccionario con steps, state, accepted, tape (cinta final)
+            y opcionalmente cycle y, si viene de la caché de resultados
+            (ver result_cache.py), engine y time
+    """
     print(f"\n{'='*60}")
     print("RESUMEN DE EJECUCIÓN")
     print(f"{'='*60}")
-    print(f"Entrada (n):     '{input_str}' ({len(input_str)} en unario)")
-    print(f"Pasos totales:   {machine.step_count}")
-    print(f"Estado final:    {machine.current_state}")
-    print(f"Aceptado:        {'Sí' if machine.accepted else 'No'}")
+    notation = get_notation(config)
+    n = decode_number(input_str, notation)
+    label = 'en binario' if notation == 'binaria' else 'en unario'
+    print(f"Entrada (n):     '{input_str}' ({n} {label})")
+    print(f"Pasos totales:   {record['steps']}")
+    print(f"Estado final:    {record['state']}")
+    print(f"Aceptado:        {'Sí' if record['accepted'] else 'No'}")
+    
+    cycle = record.get('cycle')
+    if cycle:
+        kind = 'exacto' if cycle['kind'] == 'exact' else 'desplazado'
+        print(f"Ciclo detectado: {kind}, desde el paso {cycle['start']}, "
+              f"periodo {cycle['period']} (no termina)")
     
     # Obtener resultado limpio
-    clean_result = machine.get_clean_result()
-    fib_value = len(clean_result)
+    clean_result = extract_result(record['tape'], notation)
+    fib_value = decode_number(clean_result, notation)
     
-    print(f"Resultado:       '{clean_result}' (F({len(input_str)}) = {fib_value})")
+    print(f"Resultado:       '{clean_result}' (F({n}) = {fib_value})")
+    if 'time' in record:
+        print(f"Caché:           resultado guardado (motor {record['engine']}, "
+              f"{record['time']*1000:.2f} ms); use --fresh para ejecutar de nuevo")
     print(f"{'='*60}\n")
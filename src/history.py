@@ -0,0 +1,554 @@
+"""
+Módulo que implementa el historial de configuraciones de la Máquina de Turing.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+
+from tape import Tape
+from binary_format import InternTable
+
+# Políticas de retención del historial (ver parse_history_policy)
+HISTORY_POLICIES = ['all', 'none', 'last-N', 'every-K', 'head-tail-N']
+
+
+def parse_history_policy(policy: str) -> tuple:
+    """
+    Interpreta una política de retención del historial.
+
+    Políticas:
+        'all': todas las configuraciones
+        'none': ninguna (la máquina no registra pasos)
+        'last-N': las últimas N configuraciones (buffer circular)
+        'every-K': una configuración cada K pasos y la actual
+        'head-tail-N': las primeras N y las últimas N configuraciones
+
+    Args:
+        policy: Texto de la política
+
+    Returns:
+        Tupla (tipo, N) con tipo 'all', 'none', 'last', 'every' o
+        'head-tail' (N es 0 para 'all' y 'none')
+
+    Raises:
+        ValueError: Si la política no es válida
+    """
+    if policy in ('all', 'none'):
+        return (policy, 0)
+
+    kind, _, count = policy.rpartition('-')
+    if kind in ('last', 'every', 'head-tail') and count.isdigit() and int(count) > 0:
+        return (kind, int(count))
+
+    raise ValueError(f"Política de historial desconocida: {policy} "
+                     f"(opciones: {', '.join(HISTORY_POLICIES)})")
+
+
+class ConfigurationHistory:
+    """
+    Historial de configuraciones codificado como deltas por paso.
+
+    En lugar de guardar la cinta completa en cada paso, se registra un
+    delta de tamaño constante en columnas de tipo array: posición escrita,
+    símbolo anterior, símbolo nuevo, estado resultante y movimiento de la
+    cabeza. Las configuraciones completas se reconstruyen bajo demanda
+    avanzando o retrocediendo un cursor sobre una cinta de trabajo, por lo
+    que el acceso secuencial (en cualquier sentido) cuesta O(1) por paso.
+
+    Cada elemento accesible por índice es un diccionario con las claves
+    step, state, head, tape y offset, igual que el historial original.
+    """
+
+    def __init__(self, input_string: str, blank_symbol: str,
+                 initial_state: str, margin: int = 3, offset: int = 0,
+                 head: int = 0, first_step: int = 0):
+        """
+        Inicializa el historial con la configuración inicial.
+
+        Args:
+            input_string: Cadena inicial en la cinta
+            blank_symbol: Símbolo que representa el blanco
+            initial_state: Estado inicial de la máquina
+            margin: Celdas blancas a mostrar en los extremos de la cinta
+            offset: Posición del primer carácter de input_string
+            head: Posición inicial de la cabeza
+            first_step: Número de paso de la configuración inicial (para
+                historiales que empiezan a mitad de una ejecución)
+        """
+        self.input_string = input_string
+        self.blank = blank_symbol
+        self.margin = margin
+        self.offset = offset
+        self.first_step = first_step
+
+        self._symbols = InternTable()
+        self._states = InternTable()
+
+        # Columnas del registro de deltas
+        self.positions = array('q')
+        self.old_symbols = array('B')
+        self.new_symbols = array('B')
+        self.states = array('I')
+        self.moves = array('b')
+
+        # La configuración 0 es un delta nulo en la posición de la cabeza
+        first = self._new_tape().read(head)
+        self.append(head, first, first, initial_state, 0)
+
+        self._cursor_tape = None
+        self._cursor = 0
+
+    @property
+    def symbol_table(self) -> list:
+        """Símbolos registrados, indexados por los códigos de los deltas."""
+        return self._symbols
+
+    @property
+    def state_table(self) -> list:
+        """Estados registrados, indexados por los identificadores de los deltas."""
+        return self._states
+
+    def delta_log(self) -> tuple:
+        """
+        Registro de deltas que respalda el historial.
+
+        Returns:
+            Tupla (log, n): el ConfigurationHistory con los deltas y el
+            número de sus últimos deltas que forman parte del historial
+        """
+        return (self, len(self) - 1)
+
+    def append(self, position: int, old_symbol: str, new_symbol: str,
+               state: str, move: int):
+        """
+        Registra el delta de un paso.
+
+        Args:
+            position: Posición de la cabeza al escribir
+            old_symbol: Símbolo que había en la posición
+            new_symbol: Símbolo escrito
+            state: Estado resultante tras el paso
+            move: Desplazamiento de la cabeza (-1, 0 o 1)
+        """
+        self.positions.append(position)
+        self.old_symbols.append(self._symbols.code(old_symbol))
+        self.new_symbols.append(self._symbols.code(new_symbol))
+        self.states.append(self._states.code(state))
+        self.moves.append(move)
+
+    def append_sweep(self, position: int, symbol: str, state: str,
+                     move: int, count: int):
+        """
+        Registra de una vez count pasos de un barrido que reescribe el
+        mismo símbolo y mueve la cabeza siempre en la misma dirección.
+
+        Args:
+            position: Posición de la cabeza en el primer paso
+            symbol: Símbolo leído y reescrito en cada paso
+            state: Estado (sin cambios) durante el barrido
+            move: Desplazamiento de la cabeza (-1 o 1)
+            count: Número de pasos del barrido
+        """
+        code = self._symbols.code(symbol)
+        self.positions.extend(range(position, position + move * count, move))
+        self.old_symbols.extend(array('B', [code]) * count)
+        self.new_symbols.extend(array('B', [code]) * count)
+        self.states.extend(array('I', [self._states.code(state)]) * count)
+        self.moves.extend(array('b', [move]) * count)
+
+    def discard(self, count: int):
+        """
+        Descarta las primeras count configuraciones.
+
+        La configuración count pasa a ser la configuración inicial del
+        historial: su cinta se toma como nueva base y los deltas
+        anteriores se eliminan.
+
+        Args:
+            count: Número de configuraciones a descartar
+        """
+        if count <= 0:
+            return
+
+        tape = self._seek(count)
+        self.input_string, self.offset = tape.get_content(margin=0)
+        self.first_step += count
+        for column in (self.positions, self.old_symbols, self.new_symbols,
+                       self.states, self.moves):
+            del column[:count]
+
+        # La cinta del cursor ya corresponde a la nueva configuración 0
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _new_tape(self) -> Tape:
+        """Crea una cinta con el contenido de la configuración inicial."""
+        tape = Tape("", self.blank)
+        for i, symbol in enumerate(self.input_string):
+            tape.write(self.offset + i, symbol)
+        return tape
+
+    def _seek(self, index: int) -> Tape:
+        """Mueve el cursor de reconstrucción hasta la configuración dada."""
+        if self._cursor_tape is None:
+            self._cursor_tape = self._new_tape()
+            self._cursor = 0
+
+        tape = self._cursor_tape
+        symbols = self._symbols
+        positions = self.positions
+
+        while self._cursor < index:
+            self._cursor += 1
+            tape.write(positions[self._cursor],
+                       symbols[self.new_symbols[self._cursor]])
+        while self._cursor > index:
+            tape.write(positions[self._cursor],
+                       symbols[self.old_symbols[self._cursor]])
+            self._cursor -= 1
+
+        return tape
+
+    def _configuration(self, index: int, tape: Tape) -> dict:
+        """Construye el diccionario de la configuración con la cinta dada."""
+        tape_content, offset = tape.get_content(margin=self.margin)
+        return {
+            'step': self.first_step + index,
+            'state': self._states[self.states[index]],
+            'head': self.positions[index] + self.moves[index],
+            'tape': tape_content,
+            'offset': offset
+        }
+
+    def _window_configuration(self, index: int, tape: Tape, window: int) -> dict:
+        """
+        Como _configuration, pero la cinta contiene solo las celdas a menos
+        de window posiciones de la cabeza (sin salir de la cinta completa).
+        """
+        head = self.positions[index] + self.moves[index]
+        low, high = tape.get_bounds()
+        low = max(head - window, low - self.margin)
+        high = min(head + window, high + self.margin)
+        return {
+            'step': self.first_step + index,
+            'state': self._states[self.states[index]],
+            'head': head,
+            'tape': tape.get_window(low, high),
+            'offset': low
+        }
+
+    def configurations(self, first: int = None, last: int = None,
+                       every: int = 1, window: int = None):
+        """
+        Genera las configuraciones de un rango de pasos sin construir las
+        demás.
+
+        Una cinta de trabajo propia avanza aplicando los deltas, así que
+        saltar pasos cuesta O(1) por paso y solo se copian las cintas de
+        las configuraciones generadas; con window, cada copia tiene como
+        mucho 2 * window + 1 celdas.
+
+        Args:
+            first: Primer paso (por defecto el primero del historial)
+            last: Último paso, incluido (por defecto el último)
+            every: Intervalo entre los pasos generados, contado desde first
+            window: Celdas a cada lado de la cabeza (None para toda la cinta)
+
+        Yields:
+            Diccionarios de configuración (step, state, head, tape, offset)
+        """
+        start = 0 if first is None else first - self.first_step
+        if start < 0:
+            start %= every
+        stop = len(self) if last is None else min(last - self.first_step + 1,
+                                                  len(self))
+        tape = self._new_tape()
+        symbols = self._symbols
+        positions = self.positions
+        new_symbols = self.new_symbols
+        cursor = 0
+        for index in range(start, stop, every):
+            while cursor < index:
+                cursor += 1
+                tape.write(positions[cursor], symbols[new_symbols[cursor]])
+            if window is None:
+                yield self._configuration(index, tape)
+            else:
+                yield self._window_configuration(index, tape, window)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+
+        index = key + len(self) if key < 0 else key
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de historial fuera de rango")
+
+        return self._configuration(index, self._seek(index))
+
+    def __iter__(self):
+        tape = self._new_tape()
+        symbols = self._symbols
+
+        yield self._configuration(0, tape)
+        for index in range(1, len(self)):
+            tape.write(self.positions[index],
+                       symbols[self.new_symbols[index]])
+            yield self._configuration(index, tape)
+
+
+class RetainedHistory(ABC):
+    """
+    Base de los historiales parciales.
+
+    Las subclases implementan __len__ y _get(index); esta clase aporta el
+    acceso por índice (incluidos negativos y slices) y la iteración, de
+    modo que se usan igual que ConfigurationHistory.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de configuraciones conservadas."""
+
+    @abstractmethod
+    def _get(self, index: int) -> dict:
+        """Configuración conservada en la posición index (0 <= index < len)."""
+
+    def delta_log(self) -> tuple:
+        """
+        Registro de deltas que respalda el historial (ver
+        ConfigurationHistory.delta_log), o None si no guarda deltas.
+        """
+        return None
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._get(i) for i in range(*key.indices(len(self)))]
+
+        index = key + len(self) if key < 0 else key
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de historial fuera de rango")
+
+        return self._get(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get(index)
+
+
+class RecentHistory(RetainedHistory):
+    """
+    Historial que conserva solo las últimas configuraciones (buffer circular).
+
+    Los deltas se acumulan en un ConfigurationHistory y, cuando superan el
+    límite por más de max(límite, MIN_SLACK), los más antiguos se descartan
+    de una vez, por lo que el costo amortizado por paso sigue siendo O(1).
+    """
+
+    MIN_SLACK = 4096
+
+    def __init__(self, limit: int, input_string: str, blank_symbol: str,
+                 initial_state: str, margin: int = 3, offset: int = 0,
+                 head: int = 0, first_step: int = 0):
+        """
+        Inicializa el historial con la configuración inicial.
+
+        Args:
+            limit: Número de configuraciones a conservar
+            (resto): Igual que en ConfigurationHistory
+        """
+        self.limit = limit
+        self.slack = max(limit, self.MIN_SLACK)
+        self.log = ConfigurationHistory(input_string, blank_symbol,
+                                        initial_state, margin=margin,
+                                        offset=offset, head=head,
+                                        first_step=first_step)
+
+    def _trim(self):
+        if len(self.log) > self.limit + self.slack:
+            self.log.discard(len(self.log) - self.limit)
+
+    def append(self, position: int, old_symbol: str, new_symbol: str,
+               state: str, move: int):
+        """Registra el delta de un paso (ver ConfigurationHistory.append)."""
+        self.log.append(position, old_symbol, new_symbol, state, move)
+        self._trim()
+
+    def append_sweep(self, position: int, symbol: str, state: str,
+                     move: int, count: int):
+        """Registra un barrido (ver ConfigurationHistory.append_sweep)."""
+        self.log.append_sweep(position, symbol, state, move, count)
+        self._trim()
+
+    def __len__(self) -> int:
+        return min(len(self.log), self.limit)
+
+    def _get(self, index: int) -> dict:
+        return self.log[len(self.log) - len(self) + index]
+
+    def delta_log(self) -> tuple:
+        return (self.log, len(self) - 1)
+
+    def configurations(self, first: int = None, last: int = None,
+                       every: int = 1, window: int = None):
+        """
+        Genera las configuraciones conservadas de un rango de pasos (ver
+        ConfigurationHistory.configurations).
+        """
+        oldest = self.log.first_step + len(self.log) - len(self)
+        if first is None:
+            first = oldest
+        elif first < oldest:
+            first += -(-(oldest - first) // every) * every
+        return self.log.configurations(first, last, every, window)
+
+
+class HeadTailHistory(RetainedHistory):
+    """
+    Historial que conserva las primeras y las últimas configuraciones.
+
+    Las primeras se guardan en un ConfigurationHistory que deja de crecer
+    al llenarse y las últimas en un RecentHistory. Si la ejecución es
+    corta y ambas partes se solapan, cada configuración aparece una vez.
+    """
+
+    def __init__(self, limit: int, input_string: str, blank_symbol: str,
+                 initial_state: str, margin: int = 3, offset: int = 0,
+                 head: int = 0, first_step: int = 0):
+        """
+        Inicializa el historial con la configuración inicial.
+
+        Args:
+            limit: Configuraciones a conservar en cada extremo
+            (resto): Igual que en ConfigurationHistory
+        """
+        self.limit = limit
+        self.first = ConfigurationHistory(input_string, blank_symbol,
+                                          initial_state, margin=margin,
+                                          offset=offset, head=head,
+                                          first_step=first_step)
+        self.last = RecentHistory(limit, input_string, blank_symbol,
+                                  initial_state, margin=margin, offset=offset,
+                                  head=head, first_step=first_step)
+        self.total = 1
+
+    def append(self, position: int, old_symbol: str, new_symbol: str,
+               state: str, move: int):
+        """Registra el delta de un paso (ver ConfigurationHistory.append)."""
+        if len(self.first) < self.limit:
+            self.first.append(position, old_symbol, new_symbol, state, move)
+        self.last.append(position, old_symbol, new_symbol, state, move)
+        self.total += 1
+
+    def append_sweep(self, position: int, symbol: str, state: str,
+                     move: int, count: int):
+        """Registra un barrido (ver ConfigurationHistory.append_sweep)."""
+        room = min(self.limit - len(self.first), count)
+        if room > 0:
+            self.first.append_sweep(position, symbol, state, move, room)
+        self.last.append_sweep(position, symbol, state, move, count)
+        self.total += count
+
+    def _overlap(self) -> int:
+        """Configuraciones de last que ya están en first."""
+        return max(0, len(self.first) - (self.total - len(self.last)))
+
+    def __len__(self) -> int:
+        return len(self.first) + len(self.last) - self._overlap()
+
+    def _get(self, index: int) -> dict:
+        if index < len(self.first):
+            return self.first[index]
+        return self.last[index - len(self.first) + self._overlap()]
+
+    def delta_log(self) -> tuple:
+        """Deltas de la parte final (las primeras no se guardan en checkpoints)."""
+        return self.last.delta_log()
+
+
+class SampledHistory(RetainedHistory):
+    """
+    Historial que conserva una configuración cada K pasos.
+
+    Las configuraciones muestreadas se copian de la cinta de la máquina en
+    el momento del paso. La última configuración es siempre la actual y
+    se lee de la misma cinta, que la máquina sigue modificando.
+    """
+
+    def __init__(self, every: int, tape, initial_state: str, margin: int = 3,
+                 head: int = 0, first_step: int = 0):
+        """
+        Inicializa el historial con la configuración actual.
+
+        Args:
+            every: Intervalo de muestreo en pasos
+            tape: Cinta de la máquina (se lee, nunca se modifica)
+            initial_state: Estado actual de la máquina
+            margin: Celdas blancas a mostrar en los extremos de la cinta
+            head: Posición actual de la cabeza
+            first_step: Número de paso actual
+        """
+        self.every = every
+        self.tape = tape
+        self.margin = margin
+        self.step = first_step
+        self.state = initial_state
+        self.head = head
+        self.samples = []
+        self._sample(head)
+
+    def _sample(self, head: int):
+        """Copia la configuración del paso actual con la cabeza dada."""
+        tape_content, offset = self.tape.get_content(margin=self.margin)
+        self.samples.append({
+            'step': self.step,
+            'state': self.state,
+            'head': head,
+            'tape': tape_content,
+            'offset': offset
+        })
+
+    def append(self, position: int, old_symbol: str, new_symbol: str,
+               state: str, move: int):
+        """Registra un paso ya aplicado a la cinta."""
+        self.step += 1
+        self.state = state
+        self.head = position + move
+        if self.step % self.every == 0:
+            self._sample(self.head)
+
+    def append_sweep(self, position: int, symbol: str, state: str,
+                     move: int, count: int):
+        """
+        Registra un barrido ya aplicado. La cinta no cambia durante el
+        barrido, así que cada muestra solo difiere en la cabeza.
+        """
+        start = self.step
+        self.state = state
+        first = start + self.every - start % self.every
+        for step in range(first, start + count + 1, self.every):
+            self.step = step
+            self._sample(position + move * (step - start))
+        self.step = start + count
+        self.head = position + move * count
+
+    def _current(self) -> bool:
+        """Indica si la configuración actual falta entre las muestras."""
+        return self.samples[-1]['step'] != self.step
+
+    def __len__(self) -> int:
+        return len(self.samples) + self._current()
+
+    def _get(self, index: int) -> dict:
+        if index < len(self.samples):
+            return self.samples[index]
+        tape_content, offset = self.tape.get_content(margin=self.margin)
+        return {
+            'step': self.step,
+            'state': self.state,
+            'head': self.head,
+            'tape': tape_content,
+            'offset': offset
+        }
@@ -2,8 +2,15 @@
 Módulo para cargar configuraciones de Máquinas de Turing desde archivos.
 """
 
+import os
 import json
-from pathlib import Path
+import hashlib
+
+# Desplazamiento de la cabeza para cada dirección ('S' = sin movimiento)
+MOVES = {'L': -1, 'R': 1, 'S': 0}
+
+# Notaciones de la entrada n y del resultado F(n) (campo opcional 'notacion')
+NOTATIONS = ['unaria', 'binaria']
 
 
 def load_machine_config(filepath: str) -> dict:
@@ -21,12 +28,10 @@ def load_machine_config(filepath: str) -> dict:
         json.JSONDecodeError: Si el archivo no es JSON válido
         ValueError: Si faltan campos requeridos
     """
-    path = Path(filepath)
-    
-    if not path.exists():
+    if not os.path.exists(filepath):
         raise FileNotFoundError(f"No se encontró el archivo: {filepath}")
     
-    with open(path, 'r', encoding='utf-8') as f:
+    with open(filepath, 'r', encoding='utf-8') as f:
         config = json.load(f)
     
     validate_config(config)
@@ -35,13 +40,15 @@ def load_machine_config(filepath: str) -> dict:
 
 def validate_config(config: dict):
     """
-    Valida que la configuración tenga todos los campos requeridos.
+    Valida que la configuración tenga todos los campos requeridos y que
+    todos los estados, símbolos y movimientos referenciados estén declarados.
     
     Args:
         config: Diccionario de configuración
     
     Raises:
-        ValueError: Si falta algún campo requerido
+        ValueError: Si falta algún campo requerido o hay una referencia
+            no declarada
     """
     required_fields = [
         'estados',
@@ -61,10 +68,97 @@ def validate_config(config: dict):
     if config['estado_inicial'] not in config['estados']:
         raise ValueError("El estado inicial no está en la lista de estados")
     
-    # Validar estados de aceptación
+    # Validar estados de aceptación y rechazo
+    states = set(config['estados'])
     for state in config['estados_aceptacion']:
-        if state not in config['estados']:
+        if state not in states:
             raise ValueError(f"Estado de aceptación '{state}' no está en estados")
+    for state in config.get('estados_rechazo', []):
+        if state not in states:
+            raise ValueError(f"Estado de rechazo '{state}' no está en estados")
+    
+    # Validar símbolos
+    symbols = set(config['alfabeto_cinta'])
+    if config['simbolo_blanco'] not in symbols:
+        raise ValueError("El símbolo blanco no está en el alfabeto de cinta")
+    for symbol in config.get('alfabeto_entrada', []):
+        if symbol not in symbols:
+            raise ValueError(f"Símbolo de entrada '{symbol}' no está en el alfabeto de cinta")
+    
+    if config.get('notacion', 'unaria') not in NOTATIONS:
+        raise ValueError(f"Notación '{config['notacion']}' no es {', '.join(NOTATIONS)}")
+    
+    tapes = config.get('cintas', 1)
+    if not isinstance(tapes, int) or tapes < 1:
+        raise ValueError("El número de cintas debe ser un entero positivo")
+    if tapes > 1 and ',' in symbols:
+        raise ValueError("Las máquinas de varias cintas no admiten ',' como símbolo")
+    
+    # Validar que las transiciones solo usen estados, símbolos y
+    # movimientos declarados
+    for state, trans_dict in config['transiciones'].items():
+        if state not in states:
+            raise ValueError(f"Estado '{state}' con transiciones no está en estados")
+        for key, transition in trans_dict.items():
+            where = f"δ({state}, {key})"
+            if not isinstance(transition, (list, tuple)) or len(transition) != 3:
+                raise ValueError(f"{where}: se espera [nuevo_estado, símbolo, dirección]")
+            next_state, write_symbol, direction = transition
+            if tapes == 1:
+                reads, writes, moves = [key], [write_symbol], [direction]
+            else:
+                reads, writes, moves = split_symbols(key), write_symbol, direction
+                if (len(reads) != tapes or not isinstance(writes, list)
+                        or len(writes) != tapes or not isinstance(moves, list)
+                        or len(moves) != tapes):
+                    raise ValueError(f"{where}: se esperan {tapes} símbolos leídos, "
+                                     f"{tapes} escritos y {tapes} direcciones")
+            for symbol in reads:
+                if symbol not in symbols:
+                    raise ValueError(f"{where}: símbolo leído '{symbol}' no está en el alfabeto de cinta")
+            if next_state not in states:
+                raise ValueError(f"{where}: estado destino '{next_state}' no está en estados")
+            for symbol in writes:
+                if symbol not in symbols:
+                    raise ValueError(f"{where}: símbolo escrito '{symbol}' no está en el alfabeto de cinta")
+            for move in moves:
+                if move not in MOVES:
+                    raise ValueError(f"{where}: dirección '{move}' no es {', '.join(MOVES)}")
+
+
+def tape_count(config: dict) -> int:
+    """Número de cintas de la máquina (campo opcional 'cintas', por defecto 1)."""
+    return config.get('cintas', 1)
+
+
+def get_notation(config: dict) -> str:
+    """Notación de la entrada y el resultado (campo 'notacion', por defecto 'unaria')."""
+    return config.get('notacion', 'unaria')
+
+
+def split_symbols(key: str) -> tuple:
+    """
+    Símbolos leídos por una transición de varias cintas.
+    
+    En las máquinas de k cintas, las claves de las transiciones son los k
+    símbolos leídos separados por comas (por ejemplo '1,_,_'), y cada
+    transición es [nuevo_estado, [k símbolos a escribir], [k direcciones]].
+    """
+    return tuple(key.split(','))
+
+
+def config_hash(config: dict) -> str:
+    """
+    Calcula un hash del contenido normalizado de una configuración.
+    
+    Args:
+        config: Diccionario de configuración
+    
+    Returns:
+        Hash SHA-256 en hexadecimal, independiente del orden de las claves
+    """
+    canonical = json.dumps(config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
 
 
 def get_transition(config: dict, state: str, symbol: str) -> tuple:
@@ -0,0 +1,174 @@
+"""
+Módulo de caché en disco de máquinas compiladas.
+
+Cada entrada guarda con marshal la configuración ya validada, las tablas
+de la máquina compilada (ver compiled.py) y el objeto código de la función
+generada (ver codegen.py), de modo que cargar una máquina conocida no
+vuelve a interpretar ni validar el JSON ni a compilar nada.
+
+El nombre de la entrada combina un hash de la ruta del archivo con un hash
+de su contenido, de CACHE_VERSION y de la versión de marshal del
+intérprete. Al guardar una entrada nueva se borran las anteriores del
+mismo archivo, y las entradas ilegibles se borran al intentar leerlas.
+"""
+
+import os
+import marshal
+import hashlib
+import importlib.util
+
+from loader import load_machine_config, config_hash, tape_count
+from compiled import CompiledMachine, compile_machine
+from codegen import generate_source, compile_source, register_runner
+
+# Versión del formato de las entradas; cambiarla invalida toda la caché
+CACHE_VERSION = 1
+
+MAGIC = b'TMCC'
+
+# Máximo de entradas conservadas en el directorio
+MAX_ENTRIES = 256
+
+
+def default_cache_dir() -> str:
+    """
+    Directorio de caché por defecto: $TURING_CACHE_DIR o, si no está
+    definido, turing-fibonacci dentro de $XDG_CACHE_HOME (~/.cache).
+    """
+    path = os.environ.get('TURING_CACHE_DIR')
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'turing-fibonacci')
+
+
+def _entry_names(filepath: str, data: bytes) -> tuple:
+    """Prefijo (por ruta) y nombre completo de la entrada de un archivo."""
+    path_key = hashlib.sha256(os.path.abspath(filepath).encode('utf-8'))
+    content_key = hashlib.sha256(data)
+    content_key.update(f"{CACHE_VERSION}".encode('ascii'))
+    content_key.update(importlib.util.MAGIC_NUMBER)
+    prefix = path_key.hexdigest()[:16]
+    return prefix, f"{prefix}-{content_key.hexdigest()[:32]}.bin"
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_entry(path: str) -> dict:
+    """
+    Lee una entrada de la caché.
+
+    Raises:
+        OSError: Si el archivo no se puede leer
+        ValueError: Si el archivo no es una entrada válida
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"Entrada de caché no reconocida: {path}")
+    try:
+        entry = marshal.loads(data[4:])
+    except (EOFError, TypeError) as e:
+        raise ValueError(f"Entrada de caché corrupta: {path}") from e
+    if not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION:
+        raise ValueError(f"Entrada de caché de otra versión: {path}")
+    return entry
+
+
+def _write_entry(cache_dir: str, prefix: str, name: str, entry: dict):
+    """Guarda una entrada de forma atómica y borra las obsoletas."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, name)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(marshal.dumps(entry))
+    os.replace(temp_path, path)
+
+    # Entradas anteriores del mismo archivo y exceso de entradas
+    entries = [e for e in os.listdir(cache_dir) if e.endswith('.bin')]
+    for other in entries:
+        if other.startswith(prefix) and other != name:
+            _remove(os.path.join(cache_dir, other))
+    entries = [e for e in entries if not e.startswith(prefix)]
+    if len(entries) >= MAX_ENTRIES:
+        entries.sort(key=lambda e: os.path.getmtime(os.path.join(cache_dir, e)))
+        for other in entries[:len(entries) - MAX_ENTRIES + 1]:
+            _remove(os.path.join(cache_dir, other))
+
+
+def load_machine(filepath: str, cache_dir: str = None) -> tuple:
+    """
+    Carga una máquina usando la caché en disco.
+
+    Si hay una entrada válida para el contenido actual del archivo, la
+    configuración, la máquina compilada y la función generada se toman de
+    ella; si no, se cargan y compilan normalmente y se guarda la entrada.
+    La función generada queda registrada en codegen, por lo que el motor
+    'codegen' no la vuelve a generar. Los errores de escritura de la caché
+    se ignoran.
+
+    Args:
+        filepath: Ruta al archivo JSON de configuración
+        cache_dir: Directorio de la caché (por defecto default_cache_dir())
+
+    Returns:
+        Tupla (configuración, máquina compilada); la máquina compilada es
+        None para las configuraciones de varias cintas
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        json.JSONDecodeError: Si el archivo no es JSON válido
+        ValueError: Si la configuración no es válida
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"No se encontró el archivo: {filepath}")
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    prefix, name = _entry_names(filepath, data)
+    path = os.path.join(cache_dir, name)
+
+    if os.path.exists(path):
+        try:
+            entry = _read_entry(path)
+            if entry['tables'] is None:
+                return entry['config'], None
+            compiled = CompiledMachine.from_tables(entry['tables'])
+            register_runner(entry['hash'], compiled, entry['source'],
+                            entry['code'])
+            return entry['config'], compiled
+        except (OSError, ValueError, KeyError, TypeError):
+            _remove(path)
+
+    config = load_machine_config(filepath)
+    key = config_hash(config)
+    entry = {
+        'version': CACHE_VERSION,
+        'config': config,
+        'hash': key,
+        'tables': None,
+        'source': None,
+        'code': None
+    }
+    # Las máquinas de varias cintas compilan sus propias tablas (ver
+    # multitape.py); de ellas solo se guarda la configuración validada
+    compiled = None
+    if tape_count(config) == 1:
+        compiled = compile_machine(config)
+        source = generate_source(compiled)
+        code = compile_source(source)
+        register_runner(key, compiled, source, code)
+        entry.update(tables=compiled.to_tables(), source=source, code=code)
+
+    try:
+        _write_entry(cache_dir, prefix, name, entry)
+    except OSError:
+        pass
+    return config, compiled
@@ -0,0 +1,153 @@
+"""
+Módulo que simula una Máquina de Turing como macro-máquina por bloques.
+
+La cinta se divide en bloques de k celdas. Un macro-paso simula a la
+máquina base mientras la cabeza permanece dentro de un bloque, y su
+efecto (estado de salida, lado de salida, nuevo contenido del bloque y
+número de pasos base) se memoriza en una caché LRU acotada indexada por
+(estado, contenido del bloque, posición de entrada). Los pasos base se
+suman exactamente, por lo que step_count coincide con el motor 'step'.
+"""
+
+from functools import lru_cache
+
+
+class MacroMachine:
+    """Macro-máquina de bloques sobre una máquina compilada."""
+
+    def __init__(self, compiled, block_size: int = 16,
+                 cache_size: int = 1 << 16, block_step_limit: int = 10000):
+        """
+        Inicializa la macro-máquina.
+
+        Args:
+            compiled: Máquina compilada (CompiledMachine)
+            block_size: Número de celdas por bloque (k)
+            cache_size: Máximo de macro-transiciones memorizadas
+            block_step_limit: Máximo de pasos base por macro-paso; acota
+                los bucles que nunca salen de un bloque
+
+        Raises:
+            ValueError: Si el tamaño de bloque no es positivo
+        """
+        if block_size < 1:
+            raise ValueError("El tamaño de bloque debe ser positivo")
+
+        self.compiled = compiled
+        self.block_size = block_size
+        self.block_step_limit = block_step_limit
+        self.macro_step = lru_cache(maxsize=cache_size)(self._macro_step)
+
+    def _simulate(self, state: int, block: bytes, offset: int,
+                  budget: int) -> tuple:
+        """
+        Simula la máquina base dentro de un bloque.
+
+        Args:
+            state: Estado al entrar al bloque
+            block: Contenido del bloque
+            offset: Posición de la cabeza dentro del bloque
+            budget: Máximo de pasos base a simular
+
+        Returns:
+            Tupla (estado, bloque, pasos, detenida, posición). La posición
+            es -1 o block_size si la cabeza salió del bloque.
+        """
+        compiled = self.compiled
+        next_state = compiled.next_state
+        write_symbol = compiled.write_symbol
+        move = compiled.move
+        halting = compiled.halting
+        num_symbols = compiled.num_symbols
+        size = self.block_size
+
+        cells = bytearray(block)
+        steps = 0
+        while steps < budget:
+            index = state * num_symbols + cells[offset]
+            target = next_state[index]
+            if target < 0:
+                return (state, bytes(cells), steps, True, offset)
+
+            cells[offset] = write_symbol[index]
+            offset += move[index]
+            state = target
+            steps += 1
+
+            if halting[state]:
+                return (state, bytes(cells), steps, True, offset)
+            if offset < 0 or offset >= size:
+                break
+
+        return (state, bytes(cells), steps, False, offset)
+
+    def _macro_step(self, state: int, block: bytes, offset: int) -> tuple:
+        """Macro-transición memorizable (ver _simulate)."""
+        return self._simulate(state, block, offset, self.block_step_limit)
+
+    def run(self, cells: bytearray, head: int, state: int,
+            steps: int = 0, max_steps: int = 100000) -> dict:
+        """
+        Ejecuta la máquina por macro-pasos sobre una cinta de códigos.
+
+        Tiene la misma firma y el mismo resultado que CompiledMachine.run.
+        Si un macro-paso memorizado excede el límite de pasos restante, ese
+        bloque se simula sin caché con el presupuesto exacto.
+
+        Args:
+            cells: Cinta como bytearray de códigos
+            head: Índice de la cabeza dentro de cells
+            state: Identificador del estado actual
+            steps: Pasos ya ejecutados
+            max_steps: Número máximo de pasos permitidos
+
+        Returns:
+            Diccionario con state, head, steps, halted, accepted, trapped
+            (siempre False), cells y shift (celdas añadidas por la izquierda)
+        """
+        size = self.block_size
+        blank_block = bytes(size)
+        macro_step = self.macro_step
+
+        if len(cells) % size or not cells:
+            cells.extend(bytes(size - len(cells) % size))
+        blocks = [bytes(cells[i:i + size]) for i in range(0, len(cells), size)]
+        current, offset = divmod(head, size)
+        shift = 0
+        halted = False
+
+        while steps < max_steps:
+            block = blocks[current]
+            result = macro_step(state, block, offset)
+            if steps + result[2] > max_steps:
+                result = self._simulate(state, block, offset, max_steps - steps)
+
+            state, blocks[current], count, halted, offset = result
+            steps += count
+            if halted:
+                break
+
+            if offset < 0:
+                current -= 1
+                offset = size - 1
+                if current < 0:
+                    grow = len(blocks)
+                    blocks[0:0] = [blank_block] * grow
+                    current += grow
+                    shift += grow * size
+            elif offset >= size:
+                current += 1
+                offset = 0
+                if current >= len(blocks):
+                    blocks.extend([blank_block] * len(blocks))
+
+        return {
+            'state': state,
+            'head': current * size + offset,
+            'steps': steps,
+            'halted': halted,
+            'accepted': halted and bool(self.compiled.accepting[state]),
+            'trapped': False,
+            'cells': bytearray(b''.join(blocks)),
+            'shift': shift
+        }
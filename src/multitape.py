@@ -0,0 +1,391 @@
+"""
+Módulo que implementa la Máquina de Turing determinista de k cintas.
+
+Formato de la configuración (ver loader.validate_config): el campo
+'cintas' indica k, las claves de las transiciones son los k símbolos
+leídos separados por comas y cada transición es
+[nuevo_estado, [k símbolos a escribir], [k direcciones]]. La entrada se
+escribe en la primera cinta, que contiene también el resultado.
+"""
+
+import time
+from array import array
+
+from tape import Tape
+from loader import MOVES, tape_count, split_symbols, get_notation
+from compiled import HALT
+from turing_machine import TuringMachine, extract_result, decode_number
+
+# Motores de ejecución de la máquina de k cintas
+MULTITAPE_ENGINES = ['step', 'compiled']
+
+
+class CompiledMultiTape:
+    """
+    Forma compilada de una Máquina de Turing de k cintas.
+
+    Sigue el diseño de CompiledMachine: estados y símbolos numerados de
+    forma densa (el blanco es el símbolo 0) y tablas planas indexadas por
+    ((estado * n + s1) * n + s2) ... * n + sk, con n símbolos. El estado
+    destino ocupa una entrada por índice y los símbolos a escribir y los
+    desplazamientos k entradas consecutivas.
+    """
+
+    def __init__(self, config: dict):
+        """
+        Compila una configuración de k cintas ya validada.
+
+        Args:
+            config: Diccionario con la configuración de la máquina
+
+        Raises:
+            ValueError: Si las tablas no caben en memoria razonable
+        """
+        self.tapes = tape_count(config)
+        self.blank = config['simbolo_blanco']
+        self.symbols = [self.blank] + [s for s in config['alfabeto_cinta']
+                                       if s != self.blank]
+        self.symbol_codes = {s: i for i, s in enumerate(self.symbols)}
+        self.states = list(config['estados'])
+        self.state_ids = {s: i for i, s in enumerate(self.states)}
+        self.num_states = len(self.states)
+        self.num_symbols = len(self.symbols)
+        self.initial_state = self.state_ids[config['estado_inicial']]
+
+        k = self.tapes
+        size = self.num_states * self.num_symbols ** k
+        if size > 1 << 24:
+            raise ValueError("Demasiados estados y símbolos para compilar "
+                             f"una máquina de {k} cintas")
+        self.next_state = array('i', [HALT]) * size
+        self.write_symbol = array('B', bytes(size * k))
+        self.move = array('b', bytes(size * k))
+
+        for state, trans_dict in config['transiciones'].items():
+            for key, (next_state, writes, directions) in trans_dict.items():
+                index = self.index(self.state_ids[state],
+                                   [self.symbol_codes[s] for s in split_symbols(key)])
+                self.next_state[index] = self.state_ids[next_state]
+                for tape in range(k):
+                    self.write_symbol[index * k + tape] = self.symbol_codes[writes[tape]]
+                    self.move[index * k + tape] = MOVES[directions[tape]]
+
+        self.accepting = bytearray(self.num_states)
+        for state in config['estados_aceptacion']:
+            self.accepting[self.state_ids[state]] = 1
+        self.halting = bytearray(self.accepting)
+        for state in config.get('estados_rechazo', []):
+            self.halting[self.state_ids[state]] = 1
+
+    def index(self, state: int, codes: list) -> int:
+        """Índice en las tablas de un estado y los códigos leídos."""
+        for code in codes:
+            state = state * self.num_symbols + code
+        return state
+
+    def run(self, cells: list, heads: list, state: int,
+            steps: int = 0, max_steps: int = 100000) -> dict:
+        """
+        Ejecuta la máquina sobre k cintas de códigos.
+
+        Como en CompiledMachine.run, cada cinta crece duplicando su tamaño
+        por el extremo que su cabeza abandona.
+
+        Args:
+            cells: Lista de k bytearrays (se modifican en el lugar)
+            heads: Lista de k índices de cabeza
+            state: Identificador del estado actual
+            steps: Pasos ya ejecutados
+            max_steps: Número máximo de pasos permitidos
+
+        Returns:
+            Diccionario con state, heads, steps, halted, accepted, cells y
+            shifts (celdas añadidas por la izquierda en cada cinta)
+        """
+        next_state = self.next_state
+        write_symbol = self.write_symbol
+        move = self.move
+        halting = self.halting
+        num_symbols = self.num_symbols
+        k = self.tapes
+        tapes = range(k)
+
+        heads = list(heads)
+        shifts = [0] * k
+        for tape in cells:
+            if not tape:
+                tape.append(0)
+        halted = False
+
+        while steps < max_steps:
+            index = state
+            for tape in tapes:
+                index = index * num_symbols + cells[tape][heads[tape]]
+            target = next_state[index]
+            if target < 0:
+                halted = True
+                break
+
+            base = index * k
+            for tape in tapes:
+                tape_cells = cells[tape]
+                head = heads[tape]
+                tape_cells[head] = write_symbol[base + tape]
+                head += move[base + tape]
+                if head < 0:
+                    size = len(tape_cells)
+                    tape_cells[0:0] = bytes(size)
+                    head += size
+                    shifts[tape] += size
+                elif head >= len(tape_cells):
+                    tape_cells.extend(bytes(len(tape_cells)))
+                heads[tape] = head
+            state = target
+            steps += 1
+
+            if halting[state]:
+                halted = True
+                break
+
+        return {
+            'state': state,
+            'heads': heads,
+            'steps': steps,
+            'halted': halted,
+            'accepted': halted and bool(self.accepting[state]),
+            'cells': cells,
+            'shifts': shifts
+        }
+
+
+class MultiTapeMachine:
+    """
+    Máquina de Turing determinista de k cintas.
+
+    Ofrece la interfaz de TuringMachine que usan el simulador y el
+    análisis (reset, step, run, history, get_result y get_clean_result).
+    El historial guarda configuraciones completas, con las claves tapes,
+    offsets y heads en lugar de tape, offset y head.
+    """
+
+    def __init__(self, config: dict, engine: str = 'step',
+                 history_policy: str = 'all'):
+        """
+        Inicializa la máquina con una configuración de k cintas.
+
+        Args:
+            config: Diccionario con la configuración de la máquina
+            engine: 'step' (paso a paso, con historial) o 'compiled'
+                (tablas enteras, sin historial)
+            history_policy: 'all' para conservar todas las configuraciones
+                del motor 'step' o 'none' para no registrar ninguna
+
+        Raises:
+            ValueError: Si el motor o la política de historial no existen
+                para máquinas de varias cintas
+        """
+        if engine not in MULTITAPE_ENGINES:
+            raise ValueError(f"El motor '{engine}' no admite varias cintas; "
+                             f"use {' o '.join(MULTITAPE_ENGINES)}")
+        if history_policy not in ('all', 'none'):
+            raise ValueError("Las máquinas de varias cintas solo admiten las "
+                             "políticas de historial 'all' y 'none'")
+
+        self.config = config
+        self.tapes = tape_count(config)
+        self.engine = engine
+        self.history_policy = history_policy
+        self.recording = history_policy != 'none'
+        self.transitions = {
+            state: {split_symbols(key): (next_state, writes,
+                                         [MOVES[d] for d in directions])
+                    for key, (next_state, writes, directions) in trans_dict.items()}
+            for state, trans_dict in config['transiciones'].items()
+        }
+        self.accepting = set(config['estados_aceptacion'])
+        self.rejecting = set(config.get('estados_rechazo', []))
+        self.compiled = None
+
+        self.tape = []
+        self.heads = [0] * self.tapes
+        self.current_state = config['estado_inicial']
+        self.halted = False
+        self.accepted = False
+        self.step_count = 0
+        self.history = []
+        self.input_string = ""
+        self.elapsed = 0.0
+        # Atributos de TuringMachine sin equivalente en varias cintas
+        self.checkpoint = None
+        self.cycle = None
+
+    def reset(self, input_string: str = ""):
+        """Reinicia la máquina con la entrada en la primera cinta."""
+        blank = self.config['simbolo_blanco']
+        self.tape = [Tape(input_string if i == 0 else "", blank)
+                     for i in range(self.tapes)]
+        self.heads = [0] * self.tapes
+        self.input_string = input_string
+        self.current_state = self.config['estado_inicial']
+        self.halted = False
+        self.accepted = False
+        self.step_count = 0
+        self.elapsed = 0.0
+        self.restart_history()
+
+    def restart_history(self):
+        """Reinicia el historial en la configuración actual."""
+        self.history = [self.get_configuration()] if self.recording else []
+
+    @property
+    def head_position(self) -> int:
+        """Posición de la cabeza de la primera cinta."""
+        return self.heads[0]
+
+    def get_configuration(self, margin: int = 3) -> dict:
+        """Configuración actual con las k cintas."""
+        contents = [tape.get_content(margin=margin) for tape in self.tape]
+        return {
+            'step': self.step_count,
+            'state': self.current_state,
+            'heads': list(self.heads),
+            'tapes': [content for content, _ in contents],
+            'offsets': [offset for _, offset in contents]
+        }
+
+    def step(self) -> bool:
+        """
+        Ejecuta un paso de la máquina.
+
+        Returns:
+            True si la máquina puede continuar, False si se detuvo
+        """
+        if self.halted:
+            return False
+
+        symbols = tuple(tape.read(head) for tape, head in zip(self.tape, self.heads))
+        transition = self.transitions.get(self.current_state, {}).get(symbols)
+        if transition is None:
+            self.halted = True
+            self.accepted = self.current_state in self.accepting
+            return False
+
+        next_state, writes, moves = transition
+        for i, tape in enumerate(self.tape):
+            tape.write(self.heads[i], writes[i])
+            self.heads[i] += moves[i]
+        self.current_state = next_state
+        self.step_count += 1
+        if self.recording:
+            self.history.append(self.get_configuration())
+
+        if next_state in self.accepting:
+            self.halted = True
+            self.accepted = True
+        elif next_state in self.rejecting:
+            self.halted = True
+            self.accepted = False
+
+        return not self.halted
+
+    def run(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina hasta que se detenga o alcance el límite.
+
+        Args:
+            max_steps: Número máximo de pasos permitidos
+
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        start = time.perf_counter()
+        if self.engine == 'compiled':
+            self.run_compiled(max_steps)
+        else:
+            while self.step_count < max_steps and self.step():
+                pass
+        self.elapsed += time.perf_counter() - start
+        return self.accepted
+
+    def run_compiled(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina con las tablas precompiladas desde la
+        configuración actual. No registra el historial: al terminar,
+        history solo contiene la configuración final.
+
+        Args:
+            max_steps: Número máximo de pasos permitidos
+
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        if self.halted:
+            return self.accepted
+        if self.compiled is None:
+            self.compiled = CompiledMultiTape(self.config)
+        compiled = self.compiled
+
+        cells = []
+        starts = []
+        for tape, head in zip(self.tape, self.heads):
+            codes, offset, symbols = tape.export_codes()
+            translate = [compiled.symbol_codes[s] for s in symbols]
+            start = min(offset, head)
+            end = max(offset + len(codes), head + 1)
+            cells.append(bytearray(offset - start)
+                         + bytearray(translate[c] for c in codes)
+                         + bytearray(end - offset - len(codes)))
+            starts.append(start)
+
+        result = compiled.run(cells, [h - s for h, s in zip(self.heads, starts)],
+                              compiled.state_ids[self.current_state],
+                              self.step_count, max_steps)
+
+        blank = self.config['simbolo_blanco']
+        for i in range(self.tapes):
+            origin = starts[i] - result['shifts'][i]
+            tape = Tape("", blank)
+            tape.load_codes(bytes(result['cells'][i]), origin, compiled.symbols)
+            self.tape[i] = tape
+            self.heads[i] = origin + result['heads'][i]
+        self.current_state = compiled.states[result['state']]
+        self.step_count = result['steps']
+        self.halted = result['halted']
+        self.accepted = result['accepted']
+        self.restart_history()
+
+        return self.accepted
+
+    def get_result(self) -> str:
+        """Obtiene el resultado (contenido de la primera cinta)."""
+        return str(self.tape[0])
+
+    def get_clean_result(self) -> str:
+        """Obtiene el resultado limpio de la primera cinta."""
+        return extract_result(self.get_result(), get_notation(self.config))
+
+    def get_result_value(self) -> int:
+        """Obtiene el valor numérico del resultado según la notación."""
+        return decode_number(self.get_clean_result(), get_notation(self.config))
+
+
+def create_machine(config: dict, engine: str = 'step',
+                   history_policy: str = 'all', **options):
+    """
+    Crea la máquina adecuada para una configuración.
+
+    Args:
+        config: Diccionario con la configuración de la máquina
+        engine: Motor de ejecución
+        history_policy: Política de historial
+        **options: Opciones adicionales de TuringMachine (una cinta)
+
+    Returns:
+        MultiTapeMachine si la configuración tiene varias cintas o
+        TuringMachine en caso contrario
+    """
+    if tape_count(config) > 1:
+        return MultiTapeMachine(config, engine=engine,
+                                history_policy=history_policy)
+    return TuringMachine(config, engine=engine, history_policy=history_policy,
+                         **options)
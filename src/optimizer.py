@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Optimizador de la tabla de transiciones de una Máquina de Turing.
+
+Aplica sobre una configuración ya validada (ver loader.validate_config):
+
+1. Eliminación de estados inalcanzables desde el estado inicial y de las
+   transiciones que nunca se ejecutan (las de estados de parada).
+2. Fusión de movimientos 'S': una transición que no mueve la cabeza hacia
+   un estado que no es de parada se sustituye por la transición que la
+   sigue, que lee el símbolo recién escrito en la misma celda.
+3. Minimización por refinamiento de particiones: se fusionan los estados
+   con el mismo comportamiento (mismo tipo de parada y, para cada símbolo,
+   misma escritura, mismo movimiento y destinos equivalentes).
+
+La máquina optimizada deja la misma cinta final y el mismo resultado para
+toda entrada; con la fusión de movimientos 'S' ejecuta menos pasos. El
+resultado incluye el mapeo de cada estado nuevo a los estados originales.
+"""
+
+import os
+import sys
+import copy
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loader import load_machine_config, validate_config, tape_count, get_notation
+
+
+def _halting_states(config: dict) -> set:
+    halting = set(config['estados_aceptacion'])
+    halting.update(config.get('estados_rechazo', []))
+    return halting
+
+
+def remove_dead_states(config: dict) -> dict:
+    """
+    Elimina los estados inalcanzables y las transiciones de los estados de
+    parada, que nunca se ejecutan porque la máquina se detiene al entrar.
+
+    Args:
+        config: Configuración validada
+
+    Returns:
+        Nueva configuración
+    """
+    halting = _halting_states(config)
+    transitions = config['transiciones']
+
+    reachable = {config['estado_inicial']}
+    pending = [config['estado_inicial']]
+    while pending:
+        state = pending.pop()
+        if state in halting:
+            continue
+        for next_state, _, _ in transitions.get(state, {}).values():
+            if next_state not in reachable:
+                reachable.add(next_state)
+                pending.append(next_state)
+
+    result = copy.deepcopy(config)
+    result['estados'] = [s for s in config['estados'] if s in reachable]
+    result['estados_aceptacion'] = [s for s in config['estados_aceptacion']
+                                    if s in reachable]
+    if 'estados_rechazo' in config:
+        result['estados_rechazo'] = [s for s in config['estados_rechazo']
+                                     if s in reachable]
+    result['transiciones'] = {
+        state: copy.deepcopy(trans_dict)
+        for state, trans_dict in transitions.items()
+        if state in reachable and state not in halting and trans_dict
+    }
+    return result
+
+
+def fuse_stay_moves(config: dict) -> tuple:
+    """
+    Fusiona cada transición con movimiento 'S' con la transición siguiente.
+
+    Si δ(p, a) = (q, b, S) y q no es de parada, la máquina ejecutará a
+    continuación δ(q, b) = (r, c, D) sobre la misma celda, así que δ(p, a)
+    pasa a ser (r, c, D). Las cadenas de movimientos 'S' se recorren hasta
+    un movimiento real; se conservan sin cambios las que terminan en una
+    parada por falta de transición y las que forman un ciclo.
+
+    Args:
+        config: Configuración validada
+
+    Returns:
+        Tupla (nueva configuración, número de transiciones fusionadas)
+    """
+    halting = _halting_states(config)
+    transitions = config['transiciones']
+
+    result = copy.deepcopy(config)
+    fused = 0
+    for state, trans_dict in result['transiciones'].items():
+        for symbol, transition in trans_dict.items():
+            next_state, write_symbol, direction = transition
+            seen = {(state, symbol)}
+            while direction == 'S' and next_state not in halting:
+                following = transitions.get(next_state, {}).get(write_symbol)
+                if following is None or (next_state, write_symbol) in seen:
+                    break
+                seen.add((next_state, write_symbol))
+                next_state, write_symbol, direction = following
+            else:
+                if len(seen) > 1:
+                    trans_dict[symbol] = [next_state, write_symbol, direction]
+                    fused += 1
+    return result, fused
+
+
+def minimize_states(config: dict) -> tuple:
+    """
+    Fusiona los estados equivalentes por refinamiento de particiones.
+
+    La partición inicial separa estados de aceptación, de rechazo y el
+    resto; cada ronda separa los estados de un bloque cuyas transiciones
+    (escritura, movimiento y bloque destino por símbolo, o ausencia de
+    transición) difieren, hasta que la partición no cambia. Cada bloque
+    toma el nombre de su primer estado en el orden de 'estados'.
+
+    Args:
+        config: Configuración validada
+
+    Returns:
+        Tupla (nueva configuración, {estado original: estado nuevo})
+    """
+    accepting = set(config['estados_aceptacion'])
+    rejecting = set(config.get('estados_rechazo', []))
+    transitions = config['transiciones']
+    states = config['estados']
+
+    def kind(state):
+        if state in accepting:
+            return 'accept'
+        if state in rejecting:
+            return 'reject'
+        return 'run'
+
+    block = {state: kind(state) for state in states}
+    count = len(set(block.values()))
+    while True:
+        signatures = {}
+        for state in states:
+            behavior = ()
+            if kind(state) == 'run':
+                behavior = tuple(sorted(
+                    (symbol, write_symbol, direction, block[next_state])
+                    for symbol, (next_state, write_symbol, direction)
+                    in transitions.get(state, {}).items()
+                ))
+            signatures[state] = (block[state], behavior)
+        ids = {}
+        block = {state: ids.setdefault(signatures[state], len(ids))
+                 for state in states}
+        if len(ids) == count:
+            break
+        count = len(ids)
+
+    representative = {}
+    for state in states:
+        representative.setdefault(block[state], state)
+    mapping = {state: representative[block[state]] for state in states}
+
+    def unique(names):
+        return list(dict.fromkeys(mapping[s] for s in names))
+
+    result = copy.deepcopy(config)
+    result['estados'] = unique(states)
+    result['estado_inicial'] = mapping[config['estado_inicial']]
+    result['estados_aceptacion'] = unique(config['estados_aceptacion'])
+    if 'estados_rechazo' in config:
+        result['estados_rechazo'] = unique(config['estados_rechazo'])
+    result['transiciones'] = {
+        state: {symbol: [mapping[next_state], write_symbol, direction]
+                for symbol, (next_state, write_symbol, direction)
+                in trans_dict.items()}
+        for state, trans_dict in transitions.items()
+        if mapping[state] == state
+    }
+    return result, mapping
+
+
+def _count_transitions(config: dict) -> int:
+    return sum(len(t) for t in config['transiciones'].values())
+
+
+def optimize_config(config: dict, fuse: bool = True,
+                    minimize: bool = True) -> tuple:
+    """
+    Aplica todas las pasadas de optimización.
+
+    Args:
+        config: Configuración validada
+        fuse: Si fusionar los movimientos 'S'
+        minimize: Si fusionar estados equivalentes
+
+    Returns:
+        Tupla (configuración optimizada, informe). El informe tiene
+        mapeo_estados ({estado nuevo: [estados originales]}),
+        estados_eliminados, transiciones_fusionadas y el número de estados
+        y transiciones antes y después.
+
+    Raises:
+        ValueError: Si la máquina tiene varias cintas
+    """
+    if tape_count(config) > 1:
+        raise ValueError("El optimizador solo admite máquinas de una cinta")
+    original = config
+    optimized = remove_dead_states(config)
+    fused = 0
+    if fuse:
+        optimized, fused = fuse_stay_moves(optimized)
+        optimized = remove_dead_states(optimized)
+
+    mapping = {state: state for state in optimized['estados']}
+    if minimize:
+        optimized, mapping = minimize_states(optimized)
+
+    state_map = {}
+    for state, new_state in mapping.items():
+        state_map.setdefault(new_state, []).append(state)
+
+    descriptions = original.get('descripcion_estados')
+    if descriptions:
+        optimized['descripcion_estados'] = {
+            state: ' / '.join(descriptions[s] for s in originals if s in descriptions)
+            for state, originals in state_map.items()
+        }
+    validate_config(optimized)
+
+    report = {
+        'mapeo_estados': state_map,
+        'estados_eliminados': [s for s in original['estados'] if s not in mapping],
+        'transiciones_fusionadas': fused,
+        'estados': [len(original['estados']), len(optimized['estados'])],
+        'transiciones': [_count_transitions(original),
+                         _count_transitions(optimized)]
+    }
+    return optimized, report
+
+
+def compare_machines(original: dict, optimized: dict, inputs: list) -> list:
+    """
+    Ejecuta ambas máquinas sobre las mismas entradas con el motor
+    'compiled' y compara el resultado.
+
+    Returns:
+        Lista de diccionarios con entrada, pasos de cada máquina e
+        iguales (misma aceptación y misma cinta final)
+    """
+    from turing_machine import TuringMachine
+
+    machines = [TuringMachine(c, engine='compiled', history_policy='none')
+                for c in (original, optimized)]
+    rows = []
+    for input_string in inputs:
+        outcomes = []
+        for machine in machines:
+            machine.reset(input_string)
+            machine.run(max_steps=10 ** 9)
+            outcomes.append((machine.accepted, machine.get_result(),
+                             machine.step_count))
+        rows.append({
+            'entrada': input_string,
+            'pasos_original': outcomes[0][2],
+            'pasos_optimizada': outcomes[1][2],
+            'iguales': outcomes[0][:2] == outcomes[1][:2]
+        })
+    return rows
+
+
+def print_report(report: dict):
+    """Imprime el informe de optimización."""
+    print("\n" + "=" * 60)
+    print("OPTIMIZACIÓN DE LA TABLA DE TRANSICIONES")
+    print("=" * 60)
+    print(f"Estados:        {report['estados'][0]} -> {report['estados'][1]}")
+    print(f"Transiciones:   {report['transiciones'][0]} -> {report['transiciones'][1]}")
+    print(f"Movimientos S fusionados: {report['transiciones_fusionadas']}")
+    if report['estados_eliminados']:
+        print(f"Estados eliminados: {', '.join(report['estados_eliminados'])}")
+    merged = {s: o for s, o in report['mapeo_estados'].items() if len(o) > 1}
+    for state, originals in merged.items():
+        print(f"Estados fusionados en {state}: {', '.join(originals)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Optimiza la tabla de transiciones de una Máquina de Turing'
+    )
+    parser.add_argument('config', help='Archivo JSON de configuración')
+    parser.add_argument('-o', '--output',
+                        help='Archivo JSON de salida (por defecto CONFIG.opt.json)')
+    parser.add_argument('--no-fuse', action='store_true',
+                        help="No fusionar los movimientos 'S'")
+    parser.add_argument('--no-minimize', action='store_true',
+                        help='No fusionar estados equivalentes')
+    parser.add_argument('--verify', type=int, default=10, metavar='N',
+                        help='Comparar ambas máquinas con n = 0..N (por defecto 10, -1 para omitir)')
+    args = parser.parse_args()
+
+    try:
+        config = load_machine_config(args.config)
+    except (OSError, ValueError) as e:
+        print(f"Error al cargar la configuración: {e}")
+        sys.exit(1)
+
+    try:
+        optimized, report = optimize_config(config, fuse=not args.no_fuse,
+                                            minimize=not args.no_minimize)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    optimized['mapeo_estados'] = report['mapeo_estados']
+    print_report(report)
+
+    if args.verify >= 0:
+        from turing_machine import encode_input
+        print(f"{'n':>4} | {'Pasos original':>15} | {'Pasos optimizada':>16} | Igual")
+        print("-" * 50)
+        for n, row in enumerate(compare_machines(config, optimized,
+                                                 [encode_input(n, get_notation(config))
+                                                  for n in range(args.verify + 1)])):
+            print(f"{n:>4} | {row['pasos_original']:>15} | "
+                  f"{row['pasos_optimizada']:>16} | {'Sí' if row['iguales'] else 'NO'}")
+
+    output = args.output or os.path.splitext(args.config)[0] + '.opt.json'
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(optimized, f, indent=2, ensure_ascii=False)
+    print(f"\nMáquina optimizada guardada en: {output}")
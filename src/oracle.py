@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Oráculo de número de pasos de la Máquina de Turing.
+
+Mide T(n) para n pequeños con un motor rápido, ajusta una recurrencia
+lineal exacta con Berlekamp-Massey sobre los racionales, la valida con
+puntos reservados que no se usaron en el ajuste y predice T(n) exacto para
+n grandes sin ejecutar la máquina.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loader import load_machine_config, get_notation
+from turing_machine import TuringMachine, ENGINES, encode_input
+
+
+def berlekamp_massey(sequence: list) -> list:
+    """
+    Encuentra la recurrencia lineal más corta que genera una secuencia.
+
+    Args:
+        sequence: Lista de números (enteros o racionales)
+
+    Returns:
+        Lista de coeficientes [c1, ..., cL] (Fraction) tales que
+        s[k] = c1*s[k-1] + ... + cL*s[k-L] para todo k >= L
+    """
+    values = [Fraction(v) for v in sequence]
+    current = [Fraction(1)]
+    previous = [Fraction(1)]
+    length = 0
+    shift = 1
+    last_discrepancy = Fraction(1)
+
+    for k, value in enumerate(values):
+        discrepancy = value + sum(current[i] * values[k - i]
+                                  for i in range(1, length + 1))
+        if discrepancy == 0:
+            shift += 1
+            continue
+
+        saved = list(current)
+        factor = discrepancy / last_discrepancy
+        current.extend([Fraction(0)] * (len(previous) + shift - len(current)))
+        for i, coefficient in enumerate(previous):
+            current[i + shift] -= factor * coefficient
+
+        if 2 * length <= k:
+            length = k + 1 - length
+            previous = saved
+            last_discrepancy = discrepancy
+            shift = 1
+        else:
+            shift += 1
+
+    current.extend([Fraction(0)] * (length + 1 - len(current)))
+    return [-c for c in current[1:length + 1]]
+
+
+def extend_sequence(coefficients: list, values: list, count: int) -> list:
+    """
+    Extiende una secuencia con su recurrencia.
+
+    Args:
+        coefficients: Coeficientes [c1, ..., cL] de la recurrencia
+        values: Al menos L valores iniciales
+        count: Número de valores nuevos a calcular
+
+    Returns:
+        Lista con los count valores siguientes
+    """
+    order = len(coefficients)
+    window = [Fraction(v) for v in values[len(values) - order:]] if order else []
+    result = []
+    for _ in range(count):
+        value = sum(c * window[-1 - i] for i, c in enumerate(coefficients))
+        result.append(value)
+        window = window[1:] + [value] if order else window
+    return result
+
+
+def fit_recurrence(steps: dict, holdout: int = 2, max_skip: int = 4) -> dict:
+    """
+    Ajusta una recurrencia lineal a T(n) y la valida.
+
+    Los primeros valores pueden no seguir la recurrencia (casos base de la
+    máquina), así que se prueba a descartar hasta max_skip valores
+    iniciales y se elige la recurrencia de menor orden que queda
+    determinada por los datos de ajuste (al menos 2L valores) y predice
+    exactamente los holdout valores reservados.
+
+    Args:
+        steps: Diccionario {n: T(n)} con n consecutivos desde el menor
+        holdout: Número de valores finales reservados para validar
+        max_skip: Máximo de valores iniciales a descartar
+
+    Returns:
+        Diccionario con coefficients (lista de Fraction), order, first_n
+        (primer n desde el que vale la recurrencia), fitted_on y
+        validated_on (listas de n)
+
+    Raises:
+        ValueError: Si ninguna recurrencia se valida con los datos
+    """
+    ns = sorted(steps)
+    values = [steps[n] for n in ns]
+    best = None
+
+    for skip in range(0, max_skip + 1):
+        train = values[skip:len(values) - holdout]
+        test = values[len(values) - holdout:]
+        if not train:
+            break
+
+        coefficients = berlekamp_massey(train)
+        order = len(coefficients)
+        if 2 * order > len(train):
+            continue
+        if extend_sequence(coefficients, train, holdout) != test:
+            continue
+        if best is None or order < best['order']:
+            best = {
+                'coefficients': coefficients,
+                'order': order,
+                'first_n': ns[skip],
+                'fitted_on': ns[skip:len(ns) - holdout],
+                'validated_on': ns[len(ns) - holdout:]
+            }
+
+    if best is None:
+        raise ValueError("No se encontró una recurrencia validada con "
+                         f"{len(values)} valores; mida más valores de n (una "
+                         f"recurrencia de orden L necesita 2L + {holdout})")
+    return best
+
+
+def predict_steps(recurrence: dict, steps: dict, n_values: list) -> dict:
+    """
+    Predice T(n) exacto con la recurrencia ajustada.
+
+    Args:
+        recurrence: Resultado de fit_recurrence
+        steps: Valores medidos {n: T(n)} usados como valores iniciales
+        n_values: Valores de n a predecir (mayores que el último medido)
+
+    Returns:
+        Diccionario {n: T(n)} con enteros
+    """
+    last = max(steps)
+    known = [steps[n] for n in sorted(steps) if n >= recurrence['first_n']]
+    target = max(n_values, default=last)
+    extended = extend_sequence(recurrence['coefficients'], known, target - last)
+
+    predictions = {}
+    for n in n_values:
+        value = extended[n - last - 1]
+        if value.denominator != 1:
+            raise ValueError(f"La recurrencia no produce un entero para n={n}")
+        predictions[n] = int(value)
+    return predictions
+
+
+def format_recurrence(coefficients: list) -> str:
+    """Representación legible de la recurrencia."""
+    terms = []
+    for i, c in enumerate(coefficients, start=1):
+        if c == 0:
+            continue
+        sign = '-' if c < 0 else '+'
+        magnitude = abs(c)
+        factor = '' if magnitude == 1 else f"{magnitude}·"
+        terms.append(f"{sign} {factor}T(n-{i})")
+    text = ' '.join(terms).lstrip('+ ')
+    return f"T(n) = {text}"
+
+
+def fibonacci(n: int) -> int:
+    """F(n) con F(0) = 0 y F(1) = 1."""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def measure_steps(config_path: str, n_values: list,
+                  engine: str = 'macro') -> list:
+    """
+    Mide T(n) ejecutando la máquina.
+
+    Args:
+        config_path: Ruta al archivo de configuración
+        n_values: Valores de n a medir
+        engine: Motor de ejecución (ver turing_machine.ENGINES)
+
+    Returns:
+        Lista de diccionarios con n, steps, fib_value, time_avg y source
+    """
+    config = load_machine_config(config_path)
+    machine = TuringMachine(config, engine=engine, history_policy='none')
+
+    results = []
+    for n in n_values:
+        machine.reset(encode_input(n, get_notation(config)))
+        start = time.perf_counter()
+        accepted = machine.run(max_steps=10 ** 12)
+        elapsed = time.perf_counter() - start
+        results.append({
+            'n': n,
+            'steps': machine.step_count,
+            'fib_value': machine.get_result_value(),
+            'time_avg': elapsed,
+            'completed': accepted,
+            'source': 'measured'
+        })
+    return results
+
+
+def run_oracle(config_path: str, measure_to: int = 18, predict_to: int = 30,
+               holdout: int = 2, engine: str = 'macro') -> tuple:
+    """
+    Mide, ajusta, valida y predice T(n).
+
+    Args:
+        config_path: Ruta al archivo de configuración
+        measure_to: Mayor n a medir (se mide desde 0)
+        predict_to: Mayor n a predecir
+        holdout: Valores medidos reservados para validar
+        engine: Motor de ejecución para las mediciones
+
+    Returns:
+        Tupla (recurrencia, resultados); los resultados predichos tienen
+        source 'predicted'
+    """
+    measured = measure_steps(config_path, list(range(measure_to + 1)), engine)
+    steps = {r['n']: r['steps'] for r in measured}
+
+    recurrence = fit_recurrence(steps, holdout=holdout)
+
+    start = time.perf_counter()
+    predictions = predict_steps(recurrence, steps,
+                                list(range(measure_to + 1, predict_to + 1)))
+    elapsed = time.perf_counter() - start
+    recurrence['prediction_time'] = elapsed
+
+    results = list(measured)
+    for n, value in sorted(predictions.items()):
+        results.append({
+            'n': n,
+            'steps': value,
+            'fib_value': fibonacci(n),
+            'source': 'predicted'
+        })
+    return recurrence, results
+
+
+def print_oracle_report(recurrence: dict, results: list):
+    """Imprime la recurrencia y la tabla de valores medidos y predichos."""
+    print("\n" + "=" * 70)
+    print("ORÁCULO DE PASOS - Recurrencia lineal ajustada")
+    print("=" * 70)
+    print(format_recurrence(recurrence['coefficients']))
+    print(f"Orden: {recurrence['order']}, válida desde n = {recurrence['first_n']}")
+    print(f"Ajustada con n = {recurrence['fitted_on'][0]}..{recurrence['fitted_on'][-1]}, "
+          f"validada con n = {', '.join(map(str, recurrence['validated_on']))}")
+    print(f"Tiempo de predicción: {recurrence['prediction_time'] * 1e6:.1f} µs")
+    print("-" * 70)
+    print(f"{'n':>4} | {'F(n)':>10} | {'Pasos':>24} | {'Ratio':>8} | {'Origen':>9}")
+    print("-" * 70)
+
+    prev_steps = None
+    for r in results:
+        ratio = f"{r['steps']/prev_steps:.4f}" if prev_steps else "-"
+        origin = "medido" if r['source'] == 'measured' else "PREDICHO"
+        print(f"{r['n']:>4} | {r['fib_value']:>10} | {r['steps']:>24,} | "
+              f"{ratio:>8} | {origin:>9}")
+        prev_steps = r['steps']
+
+    print("=" * 70)
+    print("Nota: el ratio tiende a φ² ≈ 2.618")
+
+
+def save_oracle_results(recurrence: dict, results: list, output_dir: str) -> str:
+    """Guarda la recurrencia y los resultados en formato JSON."""
+    os.makedirs(output_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(output_dir, f"oracle_{timestamp}.json")
+
+    data = {
+        'recurrence': {
+            'coefficients': [str(c) for c in recurrence['coefficients']],
+            'order': recurrence['order'],
+            'first_n': recurrence['first_n'],
+            'fitted_on': recurrence['fitted_on'],
+            'validated_on': recurrence['validated_on']
+        },
+        'results': results
+    }
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    print(f"\nResultados guardados en: {filepath}")
+    return filepath
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_path = os.path.join(base_dir, "maquinas", "fibonacci.json")
+    results_dir = os.path.join(base_dir, "resultados")
+
+    parser = argparse.ArgumentParser(
+        description='Predice T(n) ajustando una recurrencia lineal a mediciones'
+    )
+    parser.add_argument('--measure-to', type=int, default=18,
+                        help='Mayor n a medir (por defecto 18)')
+    parser.add_argument('--predict-to', type=int, default=30,
+                        help='Mayor n a predecir (por defecto 30)')
+    parser.add_argument('--holdout', type=int, default=2,
+                        help='Valores medidos reservados para validar')
+    parser.add_argument('--engine', choices=ENGINES, default='macro',
+                        help='Motor de ejecución para medir (por defecto macro)')
+    args = parser.parse_args()
+
+    try:
+        recurrence, results = run_oracle(config_path, args.measure_to,
+                                         args.predict_to, args.holdout,
+                                         args.engine)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print_oracle_report(recurrence, results)
+    save_oracle_results(recurrence, results, results_dir)
@@ -6,10 +6,10 @@ Genera diagrama de dispersión con regresión exponencial y polinomial.
 
 import os
 import json
-import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime
-from scipy.optimize import curve_fit
+
+# numpy y matplotlib se importan dentro de cada función: cargar resultados
+# o importar este módulo no debe pagar su tiempo de importación
 
 
 def load_analysis_results(filepath: str) -> list:
@@ -20,6 +20,7 @@ def load_analysis_results(filepath: str) -> list:
 
 def exponential_func(x, a, b):
     """Función exponencial: a * b^x"""
+    import numpy as np
     return a * np.power(b, x)
 
 
@@ -33,6 +34,9 @@ def plot_exponential_analysis(results: list, output_dir: str,
         output_dir: Directorio para guardar los gráficos
         metric: 'steps' para pasos o 'time' para tiempo
     """
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
     os.makedirs(output_dir, exist_ok=True)
     
     # Extraer datos (filtrar n=0 para evitar problemas)
@@ -114,6 +118,9 @@ def plot_ratio_analysis(results: list, output_dir: str):
     Genera gráfico del ratio de crecimiento entre pasos consecutivos.
     Debería converger a φ ≈ 1.618 para crecimiento O(φⁿ).
     """
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
     os.makedirs(output_dir, exist_ok=True)
     
     # Calcular ratios
@@ -175,7 +182,8 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         results_file = sys.argv[1]
     else:
-        json_files = [f for f in os.listdir(results_dir) if f.endswith('.json')]
+        json_files = [f for f in os.listdir(results_dir)
+                      if f.startswith('analysis_') and f.endswith('.json')]
         if not json_files:
             print("No se encontraron archivos de resultados.")
             print("Ejecute primero: python analysis.py")
@@ -0,0 +1,195 @@
+"""
+Módulo de caché persistente de resultados de ejecución.
+
+Las ejecuciones son deterministas: la misma máquina con la misma entrada
+da siempre los mismos pasos, la misma aceptación y la misma cinta final.
+Cada fila de la base SQLite (results.sqlite en el directorio de
+machine_cache.default_cache_dir) guarda ese resultado para el hash de la
+configuración normalizada (loader.config_hash), la cadena de entrada, el
+motor, el tipo de cinta y el número de repeticiones de la medición, junto
+con el tiempo (mínimo de las repeticiones) de la ejecución que lo produjo.
+
+Solo se guardan ejecuciones que se detuvieron por sí mismas (no las que
+cortó la detección de ciclos), de modo que una fila sirve para cualquier
+límite de pasos mayor o igual que sus pasos. La cinta se guarda
+comprimida con zlib. Cada lectura actualiza el momento de último
+uso y, cuando el tamaño de las cintas supera max_bytes, se borran las
+filas usadas hace más tiempo (LRU). Los errores de SQLite se ignoran: la
+caché nunca impide ejecutar la máquina.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+
+from loader import config_hash
+from machine_cache import default_cache_dir
+
+# Versión del esquema; cambiarla vacía la caché
+RESULT_CACHE_VERSION = 3
+
+RESULT_CACHE_FILE = 'results.sqlite'
+
+# Tamaño máximo de las cintas comprimidas guardadas
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResultCache:
+    """Caché de resultados en SQLite con expulsión LRU por tamaño."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Abre (o crea) la base de datos de la caché.
+
+        Args:
+            cache_dir: Directorio de la caché (por defecto default_cache_dir())
+            max_bytes: Tamaño máximo de las cintas guardadas
+        """
+        self.path = os.path.join(cache_dir or default_cache_dir(), RESULT_CACHE_FILE)
+        self.max_bytes = max_bytes
+        self.connection = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self._create_schema()
+        except (OSError, sqlite3.Error):
+            self.close()
+
+    def _create_schema(self):
+        connection = self.connection
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != RESULT_CACHE_VERSION:
+            connection.execute("DROP TABLE IF EXISTS results")
+            connection.execute(f"PRAGMA user_version = {RESULT_CACHE_VERSION}")
+        # WAL permite leer mientras otro proceso (p. ej. un trabajador) escribe
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                machine TEXT NOT NULL,
+                input TEXT NOT NULL,
+                steps INTEGER NOT NULL,
+                accepted INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                tape BLOB NOT NULL,
+                engine TEXT NOT NULL,
+                tape_backend TEXT NOT NULL,
+                repetitions INTEGER NOT NULL,
+                time REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (machine, input, engine, tape_backend, repetitions)
+            )""")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+        connection.commit()
+
+    def close(self):
+        """Cierra la conexión; la caché queda desactivada."""
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+
+    def get(self, config: dict, input_str: str, max_steps: int,
+            engine: str = None, tape_backend: str = None,
+            repetitions: int = None) -> dict:
+        """
+        Busca el resultado de una ejecución.
+
+        Los pasos y la cinta final no dependen de cómo se ejecutó la
+        máquina; el tiempo sí, así que para reutilizarlo hay que indicar
+        engine, tape_backend y repetitions. Los criterios que se omiten
+        aceptan cualquier valor y se usa el resultado usado más
+        recientemente.
+
+        Args:
+            config: Configuración de la máquina
+            input_str: Cadena de entrada
+            max_steps: Límite de pasos de la ejecución buscada
+            engine: Motor con el que se midió
+            tape_backend: Tipo de cinta con el que se midió
+            repetitions: Repeticiones de la medición
+
+        Returns:
+            Diccionario con steps, accepted, state, tape (cinta final),
+            engine, tape_backend, repetitions y time (segundos de la
+            ejecución original), o None si no hay resultado válido para
+            max_steps
+        """
+        if self.connection is None:
+            return None
+        key = config_hash(config)
+        try:
+            row = self.connection.execute(
+                "SELECT rowid, steps, accepted, state, tape, engine, "
+                "tape_backend, repetitions, time FROM results "
+                "WHERE machine = ? AND input = ? AND steps <= ? "
+                "AND engine = COALESCE(?, engine) "
+                "AND tape_backend = COALESCE(?, tape_backend) "
+                "AND repetitions = COALESCE(?, repetitions) "
+                "ORDER BY last_used DESC",
+                (key, input_str, max_steps, engine, tape_backend,
+                 repetitions)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE results SET last_used = ? WHERE rowid = ?",
+                (time.time(), row[0]))
+            self.connection.commit()
+            tape = zlib.decompress(row[4]).decode('utf-8')
+        except (sqlite3.Error, zlib.error):
+            return None
+        _, steps, accepted, state, _, row_engine, row_tape, row_repetitions, \
+            elapsed = row
+        return {'steps': steps, 'accepted': bool(accepted), 'state': state,
+                'tape': tape, 'engine': row_engine, 'tape_backend': row_tape,
+                'repetitions': row_repetitions, 'time': elapsed}
+
+    def put(self, config: dict, input_str: str, machine, elapsed: float = None,
+            repetitions: int = 1):
+        """
+        Guarda el resultado de una máquina que terminó de ejecutar la
+        entrada. No hace nada si la máquina no se detuvo o si la detuvo la
+        detección de ciclos (ese paso no es el final de la ejecución).
+
+        Args:
+            config: Configuración de la máquina
+            input_str: Cadena de entrada
+            machine: Máquina (TuringMachine o MultiTapeMachine) detenida
+            elapsed: Tiempo a guardar (por defecto machine.elapsed)
+            repetitions: Repeticiones de las que elapsed es el mínimo
+        """
+        if (self.connection is None or not machine.halted
+                or getattr(machine, 'looping', False)):
+            return
+        tape = zlib.compress(machine.get_result().encode('utf-8'))
+        if elapsed is None:
+            elapsed = machine.elapsed
+        # Las máquinas de k cintas solo tienen cintas en memoria
+        tape_backend = getattr(machine, 'tape_backend', 'memory')
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (config_hash(config), input_str, machine.step_count,
+                 int(machine.accepted), machine.current_state, tape,
+                 machine.engine, tape_backend, repetitions, elapsed,
+                 time.time()))
+            self._evict()
+            self.connection.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        """Borra las filas menos usadas hasta que las cintas quepan en max_bytes."""
+        total = self.connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(tape)), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        expired = []
+        for rowid, size in self.connection.execute(
+                "SELECT rowid, LENGTH(tape) FROM results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            expired.append((rowid,))
+            total -= size
+        self.connection.executemany("DELETE FROM results WHERE rowid = ?", expired)
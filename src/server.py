@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Servidor de simulación de Máquinas de Turing.
+
+Carga y compila una sola vez todas las máquinas de un directorio (por
+defecto maquinas/) y atiende peticiones HTTP con asyncio, por TCP o por
+un socket Unix. Las simulaciones se ejecutan en un pool de procesos en
+el que cada trabajador tiene sus propias máquinas ya compiladas, de modo
+que el bucle de eventos sigue aceptando conexiones mientras tanto y cada
+petición solo paga el tiempo de ejecución.
+
+Rutas:
+    GET  /health    Estado del servidor y número de máquinas
+    GET  /machines  Máquinas disponibles (nombre, cintas, notación...)
+    POST /run       Ejecuta una entrada. Cuerpo JSON con machine (nombre
+                    del archivo sin .json), input (en decimal o en la
+                    notación de la máquina) o n, y opcionalmente
+                    max_steps y timeout (segundos)
+
+La respuesta de /run tiene los campos del modo por lotes del simulador
+(n, steps, accepted, result, time) más machine y timed_out. Los errores
+se devuelven como {"error": mensaje} con el código HTTP correspondiente.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loader import tape_count, get_notation
+from machine_cache import load_machine
+from simulator import create_batch_machine, parse_entry, result_record
+
+DEFAULT_MACHINES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maquinas')
+
+# Pasos del primer tramo de una ejecución; los tramos se duplican hasta
+# MAX_CHUNK_STEPS y entre ellos se comprueba el límite de tiempo
+FIRST_CHUNK_STEPS = 1 << 16
+MAX_CHUNK_STEPS = 1 << 18
+
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class RequestError(Exception):
+    """Petición inválida; status es el código HTTP de la respuesta."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def load_machines(directory: str) -> dict:
+    """
+    Carga (con la caché en disco) todas las máquinas de un directorio.
+
+    Las configuraciones optimizadas (*.opt.json) se cargan como máquinas
+    distintas. Los archivos que no se pueden cargar se omiten con un aviso.
+
+    Args:
+        directory: Directorio con los archivos JSON
+
+    Returns:
+        Diccionario {nombre: (configuración, máquina compilada)}, donde el
+        nombre es el del archivo sin la extensión .json
+    """
+    machines = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            machines[filename[:-len('.json')]] = load_machine(
+                os.path.join(directory, filename))
+        except (OSError, ValueError) as e:
+            print(f"Aviso: se omite {filename}: {e}", file=sys.stderr)
+    return machines
+
+
+def describe_machine(name: str, config: dict) -> dict:
+    """Resumen de una máquina para la ruta /machines."""
+    return {
+        'machine': name,
+        'nombre': config.get('nombre', name),
+        'cintas': tape_count(config),
+        'notacion': get_notation(config),
+        'estados': len(config['estados']),
+        'transiciones': sum(len(t) for t in config['transiciones'].values())
+    }
+
+
+# Máquinas de cada proceso trabajador (ver _init_worker)
+_worker_machines = {}
+
+
+def _init_worker(machines: dict):
+    """Inicializa un proceso trabajador compilando todas las máquinas."""
+    # Las señales de terminación las atiende el proceso principal, que
+    # cierra el pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name, (config, compiled) in machines.items():
+        _worker_machines[name] = create_batch_machine(config, 'compiled',
+                                                      compiled=compiled)
+
+
+def run_limited(machine, input_str: str, max_steps: int, timeout: float) -> dict:
+    """
+    Ejecuta una entrada con límite de pasos y de tiempo.
+
+    La ejecución avanza por tramos de pasos crecientes y se detiene en el
+    primer tramo que termina después de agotar timeout, así que el tiempo
+    puede excederse como mucho en un tramo.
+
+    Args:
+        machine: Máquina ya creada (se reinicia con la entrada)
+        input_str: Cadena de entrada
+        max_steps: Máximo de pasos permitidos
+        timeout: Tiempo máximo de ejecución en segundos
+
+    Returns:
+        Diccionario de result_record con timed_out
+    """
+    machine.reset(input_str)
+    deadline = time.perf_counter() + timeout
+    chunk = FIRST_CHUNK_STEPS
+    timed_out = False
+    while not machine.halted and machine.step_count < max_steps:
+        before = machine.step_count
+        machine.run(min(before + chunk, max_steps))
+        if machine.step_count == before:
+            break
+        if not machine.halted and time.perf_counter() >= deadline:
+            timed_out = True
+            break
+        chunk = min(2 * chunk, MAX_CHUNK_STEPS)
+    return {**result_record(machine, input_str), 'timed_out': timed_out}
+
+
+def _ready() -> bool:
+    """Tarea vacía para arrancar los trabajadores antes de la primera petición."""
+    return True
+
+
+def _run_in_worker(name: str, input_str: str, max_steps: int,
+                   timeout: float) -> dict:
+    """Ejecuta una entrada con la máquina del proceso trabajador."""
+    return run_limited(_worker_machines[name], input_str, max_steps, timeout)
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """
+    Lee una petición HTTP/1.x.
+
+    Returns:
+        Tupla (método, ruta, cabeceras, cuerpo), o None si el cliente
+        cerró la conexión
+
+    Raises:
+        RequestError: Si la petición está mal formada o el cuerpo es
+            demasiado grande
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+        raise RequestError(400, "Línea de petición inválida")
+    method, path, version = parts
+
+    headers = {'version': version}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise RequestError(400, "Content-Length inválido")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, "Cuerpo demasiado grande")
+    body = await reader.readexactly(length) if length > 0 else b''
+    return method, path.split('?', 1)[0], headers, body
+
+
+def encode_response(status: int, payload, keep_alive: bool) -> bytes:
+    """Codifica una respuesta HTTP con cuerpo JSON."""
+    body = (json.dumps(payload, ensure_ascii=False) + "\n").encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+class SimulationServer:
+    """Atiende las peticiones con las máquinas precargadas y el pool."""
+
+    def __init__(self, machines: dict, executor, max_steps: int = 10 ** 7,
+                 timeout: float = 10.0):
+        """
+        Args:
+            machines: Diccionario {nombre: (configuración, máquina compilada)}
+            executor: Pool de procesos inicializado con _init_worker
+            max_steps: Límite de pasos por defecto y máximo por petición
+            timeout: Límite de tiempo por defecto y máximo por petición
+        """
+        self.configs = {name: config for name, (config, _) in machines.items()}
+        self.executor = executor
+        self.max_steps = max_steps
+        self.timeout = timeout
+
+    def _limit(self, request: dict, key: str, default, kind):
+        value = request.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, kind) or value <= 0:
+            raise RequestError(400, f"{key} debe ser un número positivo")
+        if value > default:
+            raise RequestError(400, f"{key} no puede superar {default}")
+        return value
+
+    async def run(self, body: bytes) -> dict:
+        """
+        Ejecuta la petición de /run en el pool.
+
+        Raises:
+            RequestError: Si el cuerpo no es válido o la máquina no existe
+        """
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            raise RequestError(400, "El cuerpo no es JSON válido")
+        if not isinstance(request, dict):
+            raise RequestError(400, "El cuerpo debe ser un objeto JSON")
+
+        name = request.get('machine')
+        if name not in self.configs:
+            raise RequestError(404, f"Máquina desconocida: {name}")
+        if 'n' in request:
+            n = request['n']
+            if isinstance(n, bool) or not isinstance(n, int) or n < 0:
+                raise RequestError(400, "n debe ser un entero no negativo")
+            entry = str(n)
+        else:
+            entry = request.get('input', '')
+            if not isinstance(entry, str):
+                raise RequestError(400, "input debe ser una cadena")
+        try:
+            input_str = parse_entry(self.configs[name], entry.strip())
+        except ValueError as e:
+            raise RequestError(400, str(e))
+        max_steps = self._limit(request, 'max_steps', self.max_steps, int)
+        timeout = self._limit(request, 'timeout', self.timeout, (int, float))
+
+        loop = asyncio.get_running_loop()
+        record = await loop.run_in_executor(self.executor, _run_in_worker,
+                                            name, input_str, max_steps, timeout)
+        return {'machine': name, **record}
+
+    async def dispatch(self, method: str, path: str, body: bytes):
+        """Devuelve (código, contenido) para una petición."""
+        routes = {
+            '/health': ('GET', None),
+            '/machines': ('GET', None),
+            '/run': ('POST', self.run)
+        }
+        if path not in routes:
+            raise RequestError(404, f"Ruta desconocida: {path}")
+        if method != routes[path][0]:
+            raise RequestError(405, f"{path} solo admite {routes[path][0]}")
+        if path == '/health':
+            return 200, {'status': 'ok', 'machines': len(self.configs)}
+        if path == '/machines':
+            return 200, [describe_machine(name, config)
+                         for name, config in self.configs.items()]
+        return 200, await self.run(body)
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter):
+        """Atiende las peticiones de una conexión (con keep-alive)."""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = (connection == 'keep-alive' or
+                                  (headers['version'] == 'HTTP/1.1' and
+                                   connection != 'close'))
+                    status, payload = await self.dispatch(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server: SimulationServer, host: str = '127.0.0.1',
+                port: int = 8765, unix_path: str = None):
+    """
+    Atiende conexiones hasta recibir SIGINT o SIGTERM.
+
+    Args:
+        server: Servidor con las máquinas y el pool
+        host: Dirección TCP
+        port: Puerto TCP
+        unix_path: Ruta del socket Unix (si se indica, no se usa TCP)
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        listener = await asyncio.start_unix_server(server.handle_connection,
+                                                   path=unix_path)
+        address = unix_path
+    else:
+        listener = await asyncio.start_server(server.handle_connection,
+                                              host, port)
+        address = f"http://{host}:{port}"
+    print(f"Servidor escuchando en {address} "
+          f"({len(server.configs)} máquinas)", file=sys.stderr)
+
+    async with listener:
+        await stop.wait()
+    if unix_path and os.path.exists(unix_path):
+        os.unlink(unix_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Servidor HTTP de simulación con las máquinas precargadas'
+    )
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Dirección TCP (por defecto 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Puerto TCP (por defecto 8765)')
+    parser.add_argument('--unix', metavar='RUTA',
+                        help='Escuchar en un socket Unix en lugar de TCP')
+    parser.add_argument('--machines', default=DEFAULT_MACHINES_DIR, metavar='DIR',
+                        help='Directorio de máquinas (por defecto maquinas/)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Procesos de simulación (por defecto uno por CPU)')
+    parser.add_argument('--max-steps', type=int, default=10 ** 7,
+                        help='Límite de pasos por defecto y máximo por petición')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='Límite de tiempo (s) por defecto y máximo por petición')
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.max_steps < 1 or args.timeout <= 0:
+        print("Error: --workers, --max-steps y --timeout deben ser positivos")
+        sys.exit(1)
+
+    machines = load_machines(args.machines)
+    if not machines:
+        print(f"Error: no hay máquinas válidas en {args.machines}")
+        sys.exit(1)
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # 'spawn': los trabajadores no heredan el bucle de eventos ni sus
+    # manejadores de señales
+    executor = ProcessPoolExecutor(max_workers=args.workers,
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(machines,))
+    # Los procesos se crean bajo demanda: se arrancan (y compilan sus
+    # máquinas) antes de aceptar conexiones
+    for future in [executor.submit(_ready) for _ in range(args.workers)]:
+        future.result()
+    server = SimulationServer(machines, executor, args.max_steps, args.timeout)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -6,51 +6,105 @@ Proyecto 1 - Análisis y Diseño de Algoritmos
 
 import sys
 import os
+import json
+import argparse
 
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from loader import load_machine_config
-from turing_machine import TuringMachine
-from display import print_history, print_summary
-from diagram_generator import generate_from_json
+from loader import load_machine_config, tape_count, get_notation
+from machine_cache import load_machine
+from result_cache import ResultCache
+from turing_machine import (TuringMachine, ENGINES, TAPE_BACKENDS, RECORDING_ENGINES,
+                            encode_input, decode_number)
+from history import HISTORY_POLICIES
+from tracefile import KEYFRAME_EVERY
+from breakpoints import Breakpoints
+from multitape import MultiTapeMachine
+from display import (print_history, print_summary, print_record_summary,
+                     format_configuration)
 
 
-def get_input_string() -> str:
-    """Solicita al usuario la cadena de entrada."""
+def get_input_string(notation: str = 'unaria') -> str:
+    """Solicita al usuario la cadena de entrada en la notación de la máquina."""
     print("\n" + "="*60)
     print("ENTRADA")
     print("="*60)
-    print("Ingrese n para calcular F(n) en notación unaria.")
-    print("Ejemplos: '' (vacío) para F(0), '1' para F(1), '111' para F(3)")
+    if notation == 'binaria':
+        print("Ingrese n para calcular F(n) en notación binaria.")
+        print("Ejemplos: '0' para F(0), '1' para F(1), '11' para F(3)")
+        digits, label = '01', 'binario'
+    else:
+        print("Ingrese n para calcular F(n) en notación unaria.")
+        print("Ejemplos: '' (vacío) para F(0), '1' para F(1), '111' para F(3)")
+        digits, label = '1', 'unario'
     print("-"*60)
     
     while True:
-        entrada = input("Entrada (n en unario): ").strip()
+        entrada = input(f"Entrada (n en {label}): ").strip()
         
-        # Validar que solo contenga '1's o esté vacía
-        if all(c == '1' for c in entrada):
+        # Validar que solo contenga dígitos de la notación o esté vacía
+        if all(c in digits for c in entrada):
             return entrada
         
-        print("Error: La entrada debe contener solo '1's o estar vacía.")
+        print(f"Error: La entrada debe contener solo {' y '.join(repr(d) for d in digits)} "
+              "o estar vacía.")
 
 
 def run_simulation(machine: TuringMachine, input_str: str, 
-                   show_steps: bool = True, max_steps: int = 100000):
+                   show_steps: bool = True, max_steps: int = 100000,
+                   resume: bool = False, trace_path: str = None,
+                   keyframe_every: int = KEYFRAME_EVERY, result_cache=None,
+                   fresh: bool = False, history_view: dict = None):
     """
     Ejecuta la simulación de la máquina.
     
+    Sin mostrar los pasos, sin traza ni checkpoints, el resultado se busca
+    primero en result_cache; si está, no se ejecuta la máquina. Las
+    ejecuciones que terminan se guardan en la caché.
+    
     Args:
         machine: Máquina de Turing configurada
         input_str: Cadena de entrada
         show_steps: Si mostrar los pasos de la simulación
         max_steps: Máximo de pasos permitidos
+        resume: Si continuar desde el checkpoint configurado en la máquina
+            (si existe) en lugar de empezar desde la entrada
+        trace_path: Archivo donde grabar la traza binaria de la ejecución
+        keyframe_every: Pasos entre configuraciones completas de la traza
+        result_cache: Caché de resultados (ResultCache) o None
+        fresh: Si ejecutar aunque el resultado esté en la caché (para
+            medir el tiempo de nuevo)
+        history_view: Selección del historial a mostrar (first, last,
+            step_interval y window, ver display.print_history)
     
     Returns:
         Tupla (aceptado, pasos, resultado)
     """
-    machine.reset(input_str)
+    if show_steps or trace_path or resume or machine.checkpoint:
+        result_cache = None
+    if result_cache is not None and not fresh:
+        record = result_cache.get(machine.config, input_str, max_steps)
+        if record is not None:
+            print_record_summary(machine.config, input_str, record)
+            return (record['accepted'], record['steps'], record['tape'])
+    
+    checkpoint = machine.checkpoint
+    if resume and checkpoint and os.path.exists(checkpoint['path']):
+        machine.restore_checkpoint()
+        input_str = machine.input_string
+        print(f"Reanudando desde {checkpoint['path']} (paso {machine.step_count})")
+    else:
+        machine.reset(input_str)
+    if trace_path:
+        machine.start_trace(trace_path, keyframe_every)
     accepted = machine.run(max_steps)
+    if result_cache is not None:
+        result_cache.put(machine.config, input_str, machine)
+    if trace_path:
+        machine.stop_trace()
+        print(f"Traza guardada en: {trace_path} "
+              f"(ver con: python src/tracefile.py {trace_path} [paso ...])")
     
     if show_steps:
         print("\n" + "="*60)
@@ -58,7 +112,8 @@ def run_simulation(machine: TuringMachine, input_str: str,
         print("="*60)
         
         # Decidir cuántos pasos mostrar
-        print_history(machine.history, show_all=True)
+        print_history(machine.history, show_all=True,
+                      total_steps=machine.step_count, **(history_view or {}))
 
     print_summary(machine, input_str)
     
@@ -76,30 +131,564 @@ Para limitar la cantidad de pasos mostrados, se puede modificar la función prin
 """
 
 
-def to_unary(input_str: str) -> str:
-    """Convierte entrada a unario si es número decimal."""
+def run_to_breakpoint(machine: TuringMachine, input_str: str,
+                      max_steps: int = 100000, context: int = 3):
+    """
+    Ejecuta la máquina a máxima velocidad hasta el primer punto de parada
+    y muestra las configuraciones que lo rodean.
+    
+    Las configuraciones anteriores a la parada se obtienen repitiendo la
+    ejecución sin puntos de parada hasta context pasos antes, por lo que
+    no hace falta conservar el historial completo.
+    
+    Args:
+        machine: Máquina con puntos de parada activados
+        input_str: Cadena de entrada
+        max_steps: Máximo de pasos permitidos
+        context: Configuraciones a mostrar antes y después de la parada
+    
+    Returns:
+        Diccionario de la parada (ver TuringMachine.set_breakpoints) o None
+    """
+    machine.reset(input_str)
+    machine.run(max_steps)
+    hit = machine.hit
+    if hit is None:
+        print("\nNinguna condición de parada se cumplió.")
+        print_summary(machine, input_str)
+        return None
+    
+    print("\n" + "="*60)
+    print(f"PUNTO DE PARADA EN EL PASO {hit['step']}")
+    print("="*60)
+    print(f"Condiciones: {', '.join(hit['reasons'])}")
+    print("-"*60)
+    
+    breakpoints = machine.breakpoints
+    machine.clear_breakpoints()
+    machine.reset(input_str)
+    machine.run(max(hit['step'] - context, 0))
+    last = hit['step'] + context
+    while True:
+        marker = "  <-- parada" if machine.step_count == hit['step'] else ""
+        print(format_configuration(machine.get_configuration()) + marker)
+        if machine.step_count >= last or not machine.step():
+            break
+        print("-" * 50)
+    machine.set_breakpoints(breakpoints)
+    
+    return hit
+
+
+def build_breakpoints(args: argparse.Namespace):
+    """
+    Construye los puntos de parada indicados en la línea de comandos.
+    
+    Returns:
+        Instancia de Breakpoints, o None si no se indicó ninguno
+    
+    Raises:
+        ValueError: Si una condición está mal escrita
+    """
+    breakpoints = Breakpoints()
+    for state in args.break_state or []:
+        breakpoints.add_state(state)
+    for text in args.break_on or []:
+        state, separator, symbol = text.rpartition(':')
+        if not separator or not state or len(symbol) != 1:
+            raise ValueError(f"Use ESTADO:SÍMBOLO en --break-on: {text}")
+        breakpoints.add_transition(state, symbol)
+    for text in args.break_head or []:
+        low, _, high = text.partition(':')
+        breakpoints.add_head_range(int(low), int(high) if high else None)
+    for step in args.break_step or []:
+        breakpoints.add_step(step)
+    for position in args.watch or []:
+        breakpoints.add_watch(position)
+    return breakpoints or None
+
+
+def navigate(machine: TuringMachine):
+    """
+    Permite recorrer la ejecución hacia adelante y hacia atrás.
+    
+    Comandos: Enter o '+' avanza un paso, '-' retrocede un paso, un número
+    salta a ese paso y 'q' termina la navegación.
+    
+    Args:
+        machine: Máquina con el registro de deshacer activado
+    """
+    print("\n" + "="*60)
+    print("NAVEGACIÓN")
+    print("="*60)
+    print("Enter/+: siguiente paso | -: paso anterior | N: ir al paso N | q: salir")
+    print("-"*60)
+    
+    print(format_configuration(machine.get_configuration()))
+    while True:
+        command = input("Paso> ").strip().lower()
+        
+        if command == 'q':
+            break
+        if command in ('', '+'):
+            machine.seek(machine.step_count + 1)
+        elif command == '-':
+            if not machine.step_back():
+                print("Ya está en el primer paso.")
+                continue
+        elif command.isdigit():
+            machine.seek(int(command))
+        else:
+            print("Comando no reconocido.")
+            continue
+        
+        print(format_configuration(machine.get_configuration()))
+
+
+def check_multitape_options(args: argparse.Namespace):
+    """
+    Comprueba que las opciones sean compatibles con una máquina de varias
+    cintas, que solo admite los motores y las políticas de historial de
+    multitape.py y ninguna de las herramientas de depuración.
+    
+    Raises:
+        ValueError: Si alguna opción no está disponible con varias cintas
+    """
+    unsupported = [
+        ('--tape', args.tape != 'memory'),
+        ('--trace', args.trace),
+        ('--detect-cycles', args.detect_cycles),
+        ('--checkpoint', args.checkpoint or args.resume),
+        ('los puntos de parada', build_breakpoints(args) is not None)
+    ]
+    for option, used in unsupported:
+        if used:
+            raise ValueError(f"{option} no está disponible con varias cintas")
+
+
+# Máquina de cada proceso trabajador del modo por lotes (ver _init_batch_worker)
+_batch_machine = None
+
+
+def read_batch_inputs(stream):
+    """
+    Lee las entradas del modo por lotes, una por línea, sin cargarlas
+    todas en memoria. Se ignoran las líneas vacías y las que empiezan
+    por '#'.
+    
+    Args:
+        stream: Archivo de texto abierto
+    
+    Yields:
+        Tuplas (número de línea, entrada sin espacios)
+    """
+    for number, line in enumerate(stream, start=1):
+        entry = line.strip()
+        if entry and not entry.startswith('#'):
+            yield number, entry
+
+
+def parse_entry(config: dict, entry: str) -> str:
+    """
+    Convierte una entrada en decimal o en la notación de la máquina en la
+    cadena de entrada de la cinta.
+    
+    Args:
+        config: Configuración de la máquina
+        entry: Entrada en decimal o en la notación de la máquina
+    
+    Returns:
+        Cadena de entrada
+    
+    Raises:
+        ValueError: Si la entrada no es válida para la notación de la máquina
+    """
+    notation = get_notation(config)
+    input_str = to_unary(entry, notation)
+    alphabet = set(config.get('alfabeto_entrada', []))
+    if not set(input_str) <= alphabet:
+        raise ValueError(f"Entrada no válida para la notación {notation}")
+    return input_str
+
+
+def result_record(machine, input_str: str) -> dict:
+    """
+    Resume una ejecución terminada (o detenida por el límite de pasos).
+    
+    Returns:
+        Diccionario con n, steps, accepted, result (valor de F(n), None si
+        la máquina no se detuvo) y time (segundos)
+    """
+    return {
+        'n': decode_number(input_str, get_notation(machine.config)),
+        'steps': machine.step_count,
+        'accepted': machine.accepted,
+        'result': machine.get_result_value() if machine.halted else None,
+        'time': machine.elapsed
+    }
+
+
+def run_batch_input(machine, line: int, entry: str, max_steps: int) -> dict:
+    """
+    Ejecuta una entrada del modo por lotes.
+    
+    Args:
+        machine: Máquina ya creada (se reinicia con la entrada)
+        line: Número de línea de la entrada
+        entry: Entrada en decimal o en la notación de la máquina
+        max_steps: Máximo de pasos permitidos
+    
+    Returns:
+        Diccionario con line y los campos de result_record, o con line,
+        input y error si la entrada no es válida para la máquina
+    """
+    try:
+        input_str = parse_entry(machine.config, entry)
+    except ValueError as e:
+        return {'line': line, 'input': entry, 'error': str(e)}
+    
+    machine.reset(input_str)
+    machine.run(max_steps)
+    return {'line': line, **result_record(machine, input_str)}
+
+
+def create_batch_machine(config: dict, engine: str, tape_backend: str = 'memory',
+                         compiled=None):
+    """Crea una máquina sin historial y ya compilada para muchas entradas."""
+    if tape_count(config) > 1:
+        machine = MultiTapeMachine(config, engine=engine, history_policy='none')
+    else:
+        machine = TuringMachine(config, tape_backend=tape_backend, engine=engine,
+                                history_policy='none', compiled=compiled)
+    # Ejecución vacía para compilar/generar el motor antes de la primera entrada
+    machine.reset("")
+    machine.run(0)
+    return machine
+
+
+def _init_batch_worker(config: dict, engine: str, tape_backend: str):
+    """Inicializa un proceso trabajador con su propia máquina compilada."""
+    global _batch_machine
+    _batch_machine = create_batch_machine(config, engine, tape_backend)
+
+
+def _run_in_batch_worker(line: int, entry: str, max_steps: int) -> dict:
+    """Ejecuta una entrada con la máquina del proceso trabajador."""
+    return run_batch_input(_batch_machine, line, entry, max_steps)
+
+
+def run_batch(config: dict, inputs, engine: str = 'compiled',
+              tape_backend: str = 'memory', max_steps: int = 100000,
+              workers: int = None, compiled=None, output=None):
+    """
+    Ejecuta muchas entradas y escribe una línea JSON por resultado en
+    cuanto termina.
+    
+    Con workers, las entradas se reparten entre procesos que compilan la
+    máquina una sola vez; los resultados se escriben en el orden en que
+    terminan (el campo line indica la entrada). Como mucho hay 4 entradas
+    por proceso pendientes a la vez, de modo que la memoria no depende
+    del tamaño del lote.
+    
+    Args:
+        config: Configuración de la máquina
+        inputs: Iterable de tuplas (número de línea, entrada), por ejemplo
+            read_batch_inputs(archivo)
+        engine: Motor de ejecución
+        tape_backend: Tipo de cinta ('memory', 'mmap' o 'rle')
+        max_steps: Máximo de pasos permitidos por entrada
+        workers: Número de procesos (None para ejecutar en este proceso)
+        compiled: Forma compilada de config ya disponible
+        output: Flujo de salida (por defecto sys.stdout)
+    
+    Returns:
+        Número de entradas procesadas
+    """
+    output = output or sys.stdout
+    
+    def emit(record):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+    
+    count = 0
+    if not workers:
+        machine = create_batch_machine(config, engine, tape_backend, compiled)
+        for line, entry in inputs:
+            emit(run_batch_input(machine, line, entry, max_steps))
+            count += 1
+        return count
+    
+    # Importación diferida: el pool de procesos solo se usa con workers
+    from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+    
+    window = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(config, engine, tape_backend)) as executor:
+        pending = set()
+        for line, entry in inputs:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+                    count += 1
+            pending.add(executor.submit(_run_in_batch_worker, line, entry, max_steps))
+        for future in as_completed(pending):
+            emit(future.result())
+            count += 1
+    return count
+
+
+def check_batch_options(args: argparse.Namespace):
+    """
+    Comprueba que las opciones sean compatibles con el modo por lotes.
+    
+    Raises:
+        ValueError: Si se combina --batch con una entrada, con las
+            herramientas de depuración o con un número de procesos inválido
+    """
+    if args.entrada is not None:
+        raise ValueError("--batch no admite una entrada por argumento")
+    unsupported = [
+        ('--trace', args.trace),
+        ('--detect-cycles', args.detect_cycles),
+        ('--checkpoint', args.checkpoint or args.resume),
+        ('los puntos de parada', build_breakpoints(args) is not None)
+    ]
+    for option, used in unsupported:
+        if used:
+            raise ValueError(f"{option} no está disponible con --batch")
+    if args.workers is not None and args.workers < 1:
+        raise ValueError("--workers debe ser al menos 1")
+
+
+def to_unary(input_str: str, notation: str = 'unaria') -> str:
+    """
+    Convierte entrada a la notación de la máquina (unario por defecto) si
+    es número decimal.
+    """
     if input_str.isdigit():
-        return '1' * int(input_str)
+        return encode_input(int(input_str), notation)
     return input_str
 
 
-def main():
-    """Función principal del simulador."""
+def parse_arguments(argv: list = None) -> argparse.Namespace:
+    """
+    Interpreta los argumentos de línea de comandos.
+    
+    Uso: python simulator.py [config.json] [entrada] [verbose] [--engine E]
+                             [--checkpoint RUTA [--resume]]
+    """
     # Ruta por defecto al archivo de configuración
     default_config = os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
         "maquinas", "fibonacci.json"
     )
     
-    # Permitir especificar configuración y entrada por argumentos
-    # Uso: python simulator.py [config.json] [entrada] [verbose]
-    config_path = sys.argv[1] if len(sys.argv) > 1 else default_config
-    input_arg = sys.argv[2] if len(sys.argv) > 2 else None
-    verbose = len(sys.argv) <= 3 or sys.argv[3] != "0"
+    parser = argparse.ArgumentParser(
+        description='Simulador de Máquina de Turing determinista de una cinta'
+    )
+    parser.add_argument(
+        'config',
+        nargs='?',
+        default=default_config,
+        help='Archivo JSON de configuración de la máquina'
+    )
+    parser.add_argument(
+        'entrada',
+        nargs='?',
+        help='Valor de n en unario o decimal (sin ella: modo interactivo)'
+    )
+    parser.add_argument(
+        'verbose',
+        nargs='?',
+        default='1',
+        help="'0' para no mostrar los pasos"
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        help="Motor de ejecución (solo 'step' y 'sweep' registran el historial; "
+             "por defecto 'step', o 'compiled' con --batch)"
+    )
+    parser.add_argument(
+        '--tape',
+        choices=list(TAPE_BACKENDS),
+        default='memory',
+        help='Implementación de la cinta'
+    )
+    parser.add_argument(
+        '--history',
+        default='all',
+        metavar='POLÍTICA',
+        help=f"Configuraciones a conservar: {', '.join(HISTORY_POLICIES)}"
+    )
+    parser.add_argument(
+        '--from',
+        dest='first',
+        type=int,
+        metavar='PASO',
+        help='Mostrar el historial desde este paso'
+    )
+    parser.add_argument(
+        '--to',
+        dest='last',
+        type=int,
+        metavar='PASO',
+        help='Mostrar el historial hasta este paso (incluido)'
+    )
+    parser.add_argument(
+        '--every',
+        type=int,
+        default=1,
+        metavar='K',
+        help='Mostrar una configuración cada K pasos del historial'
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=40,
+        metavar='N',
+        help='Celdas de la cinta a mostrar a cada lado de la cabeza '
+             '(por defecto 40, 0 para la cinta completa)'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='RUTA',
+        help="Grabar la traza binaria de la ejecución (motores 'step' y 'sweep')"
+    )
+    parser.add_argument(
+        '--trace-keyframes',
+        type=int,
+        default=KEYFRAME_EVERY,
+        metavar='K',
+        help='Pasos entre configuraciones completas de la traza'
+    )
+    parser.add_argument(
+        '--detect-cycles',
+        action='store_true',
+        help="Detener la simulación al detectar un ciclo (motores 'step' y 'sweep')"
+    )
+    parser.add_argument(
+        '--max-steps',
+        type=int,
+        default=100000,
+        help='Número máximo de pasos de la simulación'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        metavar='RUTA',
+        help='Guardar checkpoints periódicos de la simulación en este archivo'
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        metavar='K',
+        help='Guardar un checkpoint cada K pasos'
+    )
+    parser.add_argument(
+        '--checkpoint-seconds',
+        type=float,
+        metavar='T',
+        help='Guardar un checkpoint cada T segundos (por defecto 60)'
+    )
+    parser.add_argument(
+        '--checkpoint-history',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Incluir en el checkpoint los últimos N pasos del historial '
+             '(políticas all, last-N y head-tail-N)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continuar desde el checkpoint indicado con --checkpoint'
+    )
+    parser.add_argument(
+        '--break-state',
+        action='append',
+        metavar='ESTADO',
+        help='Parar cuando la máquina esté en ESTADO (repetible)'
+    )
+    parser.add_argument(
+        '--break-on',
+        action='append',
+        metavar='ESTADO:SÍMBOLO',
+        help='Parar cuando la máquina esté en ESTADO leyendo SÍMBOLO (repetible)'
+    )
+    parser.add_argument(
+        '--break-head',
+        action='append',
+        metavar='A[:B]',
+        help='Parar cuando la cabeza esté en la celda A o entre A y B (repetible)'
+    )
+    parser.add_argument(
+        '--break-step',
+        action='append',
+        type=int,
+        metavar='N',
+        help='Parar al llegar al paso N (repetible)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='append',
+        type=int,
+        metavar='CELDA',
+        help='Parar antes de que un paso cambie el contenido de CELDA (repetible)'
+    )
+    parser.add_argument(
+        '--context',
+        type=int,
+        default=3,
+        metavar='N',
+        help='Configuraciones a mostrar antes y después de una parada'
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='ARCHIVO',
+        help="Ejecutar las entradas de ARCHIVO ('-' para la entrada estándar), "
+             "una por línea, y escribir una línea JSON por resultado"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Ejecutar el lote en paralelo con N procesos (con --batch)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Directorio de la caché de máquinas compiladas '
+             '(por defecto $TURING_CACHE_DIR o ~/.cache/turing-fibonacci)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Cargar y compilar la máquina y ejecutar sin usar las cachés en disco'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Ejecutar aunque el resultado esté en la caché de resultados '
+             '(por ejemplo, para medir el tiempo de nuevo)'
+    )
     
-    # Convertir entrada decimal a unario si aplica
-    if input_arg is not None:
-        input_arg = to_unary(input_arg)
+    return parser.parse_args(argv)
+
+
+def main():
+    """Función principal del simulador."""
+    args = parse_arguments()
+    if args.every < 1 or args.window < 0:
+        print("Error: --every debe ser al menos 1 y --window no puede ser negativo")
+        sys.exit(1)
+    history_view = {'first': args.first, 'last': args.last,
+                    'step_interval': args.every, 'window': args.window or None}
+    config_path = args.config
+    input_arg = args.entrada
+    verbose = args.verbose != "0" and not args.batch
+    if args.engine is None:
+        args.engine = 'compiled' if args.batch else 'step'
     
     if verbose:
         print("\n" + "="*60)
@@ -108,31 +697,117 @@ def main():
         print("="*60)
         print(f"\nCargando configuración desde: {config_path}")
     
+    compiled = None
     try:
-        config = load_machine_config(config_path)
+        if args.no_cache:
+            config = load_machine_config(config_path)
+        else:
+            config, compiled = load_machine(config_path, args.cache_dir)
         if verbose:
             print(f"Máquina cargada: {config.get('nombre', 'Sin nombre')}")
             print(f"Descripción: {config.get('descripcion', 'Sin descripción')}")
             
-            # Generar diagramas automáticamente
-            print("\nActualizando diagramas de transiciones...")
-            generate_from_json(config_path, verbose=False)
-            print("Diagramas actualizados en: diagramas/")
+            # Regenerar los diagramas solo si el JSON cambió
+            from diagram_generator import update_diagrams
+            if update_diagrams(config_path):
+                print("\nDiagramas de transiciones actualizados en: diagramas/")
+            else:
+                print("\nDiagramas de transiciones al día en: diagramas/")
     except Exception as e:
         print(f"Error al cargar la configuración: {e}")
         sys.exit(1)
     
-    machine = TuringMachine(config)
+    # Modo por lotes: una línea JSON por entrada en la salida estándar
+    if args.batch:
+        try:
+            check_batch_options(args)
+            if tape_count(config) > 1:
+                check_multitape_options(args)
+            stream = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            with stream:
+                run_batch(config, read_batch_inputs(stream), engine=args.engine,
+                          tape_backend=args.tape, max_steps=args.max_steps,
+                          workers=args.workers, compiled=compiled)
+        except BrokenPipeError:
+            # La salida se cerró antes de terminar (por ejemplo, con head)
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+        return
     
-    # Modo no interactivo si se proporcionó entrada por argumento
+    # Convertir entrada decimal a la notación de la máquina si aplica
+    notation = get_notation(config)
     if input_arg is not None:
-        run_simulation(machine, input_arg, show_steps=verbose)
+        input_arg = to_unary(input_arg, notation)
+    
+    try:
+        if tape_count(config) > 1:
+            check_multitape_options(args)
+            machine = MultiTapeMachine(config, engine=args.engine,
+                                       history_policy=args.history)
+        else:
+            machine = TuringMachine(config, tape_backend=args.tape,
+                                    engine=args.engine, history_policy=args.history,
+                                    compiled=compiled)
+        if args.trace and args.engine not in RECORDING_ENGINES:
+            raise ValueError(f"--trace requiere el motor {' o '.join(RECORDING_ENGINES)}")
+        if args.detect_cycles:
+            machine.enable_cycle_detection()
+        breakpoints = build_breakpoints(args)
+        if breakpoints is not None:
+            if args.trace or args.resume or args.checkpoint:
+                raise ValueError("Los puntos de parada no se combinan con "
+                                 "--trace, --checkpoint ni --resume")
+            machine.set_breakpoints(breakpoints)
+        if args.checkpoint:
+            machine.enable_checkpoints(args.checkpoint,
+                                       every_steps=args.checkpoint_every,
+                                       every_seconds=args.checkpoint_seconds,
+                                       history_tail=args.checkpoint_history)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    # Con puntos de parada se muestra solo el entorno de la primera parada
+    if breakpoints is not None:
+        if input_arg is None:
+            input_arg = get_input_string(notation)
+        run_to_breakpoint(machine, input_arg, max_steps=args.max_steps,
+                          context=args.context)
         return
     
+    # Modo no interactivo si se proporcionó entrada por argumento
+    if input_arg is not None or args.resume:
+        result_cache = None
+        if not args.no_cache:
+            result_cache = ResultCache(args.cache_dir)
+        run_simulation(machine, input_arg or "", show_steps=verbose,
+                       max_steps=args.max_steps, resume=args.resume,
+                       trace_path=args.trace, keyframe_every=args.trace_keyframes,
+                       result_cache=result_cache, fresh=args.fresh,
+                       history_view=history_view)
+        return
+    
+    # En modo interactivo se puede navegar la ejecución paso a paso
+    can_navigate = (args.engine in RECORDING_ENGINES
+                    and isinstance(machine, TuringMachine))
+    if can_navigate:
+        machine.enable_undo()
+    
     # Bucle principal (modo interactivo)
     while True:
-        input_str = get_input_string()
-        run_simulation(machine, input_str)
+        input_str = get_input_string(notation)
+        run_simulation(machine, input_str, max_steps=args.max_steps,
+                       trace_path=args.trace, keyframe_every=args.trace_keyframes,
+                       history_view=history_view)
+        
+        if can_navigate:
+            print("¿Desea navegar por la ejecución? (s/n): ", end="")
+            if input().strip().lower() == 's':
+                navigate(machine)
         
         print("\n¿Desea realizar otra simulación? (s/n): ", end="")
         if input().strip().lower() != 's':
@@ -2,64 +2,591 @@
 Módulo que implementa la cinta de la Máquina de Turing.
 """
 
+import mmap
+from bisect import bisect_right
+from itertools import groupby
+
+
 class Tape:
-    """Representa la cinta infinita de una Máquina de Turing."""
-    
+    """
+    Representa la cinta infinita de una Máquina de Turing.
+
+    Las celdas se almacenan en dos bytearray que crecen bajo demanda:
+    uno para las posiciones no negativas y otro para las negativas
+    (la posición -1 está en el índice 0). Cada símbolo se interna como
+    un código entero de un byte; el código 0 es siempre el blanco.
+    Los límites de la región usada se mantienen de forma incremental.
+    """
+
     def __init__(self, input_string: str = "", blank_symbol: str = "_"):
         """
         Inicializa la cinta con una cadena de entrada.
-        
+
         Args:
             input_string: Cadena inicial en la cinta
             blank_symbol: Símbolo que representa el blanco
         """
         self.blank = blank_symbol
-        self.cells = {}
-        
+        self._symbols = [blank_symbol]
+        self._codes = {blank_symbol: 0}
+        self._decode = {0: blank_symbol}
+        self._right = self._allocate()
+        self._left = self._allocate()
+        # Límites de las celdas no blancas (vacía si _min > _max)
+        self._min = 0
+        self._max = -1
+
         # Escribir la cadena de entrada en la cinta
         for i, symbol in enumerate(input_string):
-            self.cells[i] = symbol
-    
+            self.write(i, symbol)
+
+    def intern(self, symbol: str) -> int:
+        """
+        Obtiene el código interno de un símbolo, registrándolo si es nuevo.
+
+        Raises:
+            ValueError: Si el alfabeto excede 256 símbolos
+        """
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            if code > 255:
+                raise ValueError("La cinta admite como máximo 256 símbolos")
+            self._symbols.append(symbol)
+            self._codes[symbol] = code
+            self._decode[code] = symbol
+        return code
+
+    def read(self, position: int) -> str:
+        """Lee el símbolo en la posición dada."""
+        if position >= 0:
+            cells, index = self._right, position
+        else:
+            cells, index = self._left, ~position
+        if index < len(cells):
+            return self._symbols[cells[index]]
+        return self.blank
+
+    def run_length(self, position: int, direction: int) -> float:
+        """
+        Cuenta las celdas consecutivas iguales a la de la posición dada.
+
+        Args:
+            position: Posición inicial (incluida en la cuenta)
+            direction: 1 para avanzar a la derecha, -1 a la izquierda
+
+        Returns:
+            Longitud de la racha, o infinito si es de blancos sin fin
+        """
+        symbol = self.read(position)
+        if symbol == self.blank and (
+                self._min > self._max
+                or (direction > 0 and position > self._max)
+                or (direction < 0 and position < self._min)):
+            return float('inf')
+
+        count = 0
+        while self.read(position) == symbol:
+            count += 1
+            position += direction
+        return count
+
+    def write(self, position: int, symbol: str):
+        """Escribe un símbolo en la posición dada."""
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self.intern(symbol)
+
+        if position >= 0:
+            cells, index = self._right, position
+        else:
+            cells, index = self._left, ~position
+
+        if index >= len(cells):
+            if code == 0:
+                return
+            self._grow(cells, index + 1)
+        cells[index] = code
+
+        if code:
+            if self._min > self._max:
+                self._min = self._max = position
+            elif position < self._min:
+                self._min = position
+            elif position > self._max:
+                self._max = position
+        elif position == self._min or position == self._max:
+            self._shrink_bounds()
+
+    def _allocate(self):
+        """Crea el almacenamiento vacío de un lado de la cinta."""
+        return bytearray()
+
+    def _grow(self, cells, size: int):
+        """Extiende un lado de la cinta hasta al menos size celdas."""
+        # Crecimiento geométrico para amortizar las extensiones
+        cells.extend(bytes(max(size - len(cells), len(cells), 64)))
+
+    def close(self):
+        """Libera los recursos de la cinta (sin efecto en memoria)."""
+
+    def _code_at(self, position: int) -> int:
+        """Código almacenado en una posición dentro de los límites."""
+        if position >= 0:
+            return self._right[position]
+        return self._left[~position]
+
+    def _shrink_bounds(self):
+        """Reajusta los límites tras borrar una celda de un extremo."""
+        while self._min <= self._max and self._code_at(self._min) == 0:
+            self._min += 1
+        while self._min <= self._max and self._code_at(self._max) == 0:
+            self._max -= 1
+        if self._min > self._max:
+            self._min, self._max = 0, -1
+
+    def _codes_between(self, start: int, end: int) -> bytes:
+        """Códigos de las posiciones start..end (ambas dentro de los límites)."""
+        codes = b""
+        if start < 0:
+            codes = self._left[~min(end, -1):~start + 1][::-1]
+        if end >= 0:
+            codes += self._right[max(start, 0):end + 1]
+        return bytes(codes)
+
+    def export_codes(self) -> tuple:
+        """
+        Exporta la región usada como códigos de un byte.
+
+        Returns:
+            Tupla (códigos, offset, símbolos) donde offset es la posición
+            del primer código y símbolos[código] es el símbolo que representa
+        """
+        if self._min > self._max:
+            return (b"", 0, list(self._symbols))
+        return (self._codes_between(self._min, self._max), self._min,
+                list(self._symbols))
+
+    def load_codes(self, codes: bytes, offset: int, symbols: list):
+        """
+        Carga en una cinta vacía una región exportada con export_codes.
+
+        Args:
+            codes: Códigos de un byte de la región
+            offset: Posición del primer código
+            symbols: Tabla de símbolos (símbolos[0] debe ser el blanco)
+
+        Raises:
+            ValueError: Si la tabla no empieza por el blanco de la cinta
+        """
+        if not symbols or symbols[0] != self.blank:
+            raise ValueError("La tabla de símbolos debe empezar por el blanco")
+
+        self._symbols = list(symbols)
+        self._codes = {symbol: code for code, symbol in enumerate(symbols)}
+        self._decode = dict(enumerate(symbols))
+        if not codes:
+            return
+
+        end = offset + len(codes)
+        if offset < 0:
+            count = min(len(codes), -offset)
+            start = max(-end, 0)
+            if len(self._left) < start + count:
+                self._grow(self._left, start + count)
+            self._left[start:start + count] = bytes(codes[:count])[::-1]
+        if end > 0:
+            start = max(offset, 0)
+            if len(self._right) < end:
+                self._grow(self._right, end)
+            self._right[start:end] = bytes(codes[start - offset:])
+
+        self._min, self._max = offset, end - 1
+        self._shrink_bounds()
+
+    @property
+    def cells(self) -> dict:
+        """Celdas no blancas como diccionario {posición: símbolo}."""
+        if self._min > self._max:
+            return {}
+        start = self._min
+        return {start + i: self._symbols[code]
+                for i, code in enumerate(self._codes_between(start, self._max))
+                if code}
+
+    def get_bounds(self) -> tuple:
+        """Retorna los límites (mínimo, máximo) de las posiciones usadas."""
+        if self._min > self._max:
+            return (0, 0)
+        return (self._min, self._max)
+
+    def get_content(self, margin: int = 2) -> tuple:
+        """
+        Obtiene el contenido de la cinta como string.
+
+        Args:
+            margin: Celdas adicionales de blanco a mostrar en los extremos
+
+        Returns:
+            Tupla (contenido, offset) donde offset es la posición del primer carácter
+        """
+        if self._min > self._max:
+            return (self.blank * (2 * margin + 1), -margin)
+
+        min_pos, max_pos = self._min, self._max
+        codes = self._codes_between(min_pos, max_pos)
+        padding = self.blank * margin
+        content = padding + codes.decode('latin-1').translate(self._decode) + padding
+
+        return (content, min_pos - margin)
+
+    def get_window(self, start: int, end: int) -> str:
+        """
+        Obtiene el contenido de las posiciones start..end (ambas incluidas),
+        sin recorrer el resto de la cinta.
+        """
+        if start > end:
+            return ""
+        low, high = max(start, self._min), min(end, self._max)
+        if low > high:
+            return self.blank * (end - start + 1)
+        content = self._codes_between(low, high).decode('latin-1').translate(self._decode)
+        return self.blank * (low - start) + content + self.blank * (end - high)
+
+    def __str__(self) -> str:
+        """Representación string de la cinta."""
+        content, _ = self.get_content()
+        return content.strip(self.blank) or self.blank
+
+
+class MappedTape(Tape):
+    """
+    Cinta respaldada por archivos mapeados en memoria.
+
+    Cada lado de la cinta es un archivo temporal mapeado con mmap que
+    crece en páginas de tamaño fijo, de modo que las zonas alejadas de la
+    cabeza quedan a cargo de la caché de páginas del sistema operativo y
+    pueden descargarse a disco. Permite cintas mayores que la memoria RAM.
+    """
+
+    PAGE_SIZE = 1 << 20
+
+    def __init__(self, input_string: str = "", blank_symbol: str = "_",
+                 directory: str = None):
+        """
+        Inicializa la cinta mapeada con una cadena de entrada.
+
+        Args:
+            input_string: Cadena inicial en la cinta
+            blank_symbol: Símbolo que representa el blanco
+            directory: Directorio para los archivos temporales (por defecto
+                el del sistema)
+        """
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.page_size = -(-self.PAGE_SIZE // granularity) * granularity
+        self.directory = directory
+        self._files = []
+        super().__init__(input_string, blank_symbol)
+
+    def _allocate(self) -> mmap.mmap:
+        """Crea el archivo temporal de un lado y lo mapea en memoria."""
+        # tempfile se importa aquí: solo lo necesita esta cinta y su
+        # importación retrasa el arranque del simulador
+        import tempfile
+        backing = tempfile.TemporaryFile(dir=self.directory)
+        backing.truncate(self.page_size)
+        self._files.append(backing)
+        return mmap.mmap(backing.fileno(), self.page_size)
+
+    def _grow(self, cells: mmap.mmap, size: int):
+        """Extiende un lado de la cinta en páginas completas."""
+        pages = -(-size // self.page_size)
+        cells.resize(max(pages * self.page_size, len(cells) + self.page_size))
+
+    def close(self):
+        """Cierra los mapeos y elimina los archivos temporales."""
+        for cells in (self._right, self._left):
+            if not cells.closed:
+                cells.close()
+        for backing in self._files:
+            backing.close()
+        self._files = []
+
+    def write_to(self, stream) -> int:
+        """
+        Escribe el contenido usado de la cinta en un flujo binario.
+
+        El lado derecho se recorre página a página sobre un memoryview del
+        mapeo, sin copiar la cinta completa a memoria. Cada celda se
+        escribe como el símbolo que contiene, codificado en latin-1.
+
+        Args:
+            stream: Flujo binario abierto para escritura
+
+        Returns:
+            Número de celdas escritas
+
+        Raises:
+            ValueError: Si algún símbolo no cabe en un byte
+        """
+        if self._min > self._max:
+            return 0
+
+        table = bytearray(256)
+        for code, symbol in enumerate(self._symbols):
+            if len(symbol) != 1 or ord(symbol) > 255:
+                raise ValueError(f"El símbolo '{symbol}' no cabe en un byte")
+            table[code] = ord(symbol)
+        table = bytes(table)
+
+        if self._min < 0:
+            stream.write(self._codes_between(self._min, min(self._max, -1))
+                         .translate(table))
+        if self._max >= 0:
+            view = memoryview(self._right)
+            try:
+                start = max(self._min, 0)
+                while start <= self._max:
+                    end = min(start + self.page_size, self._max + 1)
+                    stream.write(view[start:end].tobytes().translate(table))
+                    start = end
+            finally:
+                view.release()
+
+        return self._max - self._min + 1
+
+
+class RunLengthTape:
+    """
+    Cinta codificada por rachas (run-length).
+
+    La región usada se guarda como una lista ordenada de rachas, cada una
+    con su posición inicial y su símbolo; la racha i termina donde empieza
+    la i+1. Las rachas adyacentes nunca repiten símbolo y los extremos
+    nunca son blancos. Es compacta para cintas con bloques unarios largos
+    y permite medir una racha completa en O(log r) con run_length.
+    """
+
+    def __init__(self, input_string: str = "", blank_symbol: str = "_"):
+        """
+        Inicializa la cinta con una cadena de entrada.
+
+        Args:
+            input_string: Cadena inicial en la cinta
+            blank_symbol: Símbolo que representa el blanco
+        """
+        self.blank = blank_symbol
+        self._starts = []
+        self._runs = []
+        self._end = 0
+
+        for i, symbol in enumerate(input_string):
+            self.write(i, symbol)
+
+    def _run_end(self, index: int) -> int:
+        """Posición siguiente al final de la racha dada."""
+        if index + 1 < len(self._starts):
+            return self._starts[index + 1]
+        return self._end
+
     def read(self, position: int) -> str:
         """Lee el símbolo en la posición dada."""
-        return self.cells.get(position, self.blank)
-    
+        starts = self._starts
+        if not starts or position < starts[0] or position >= self._end:
+            return self.blank
+        return self._runs[bisect_right(starts, position) - 1]
+
+    def run_length(self, position: int, direction: int) -> float:
+        """
+        Cuenta las celdas consecutivas iguales a la de la posición dada.
+
+        Args:
+            position: Posición inicial (incluida en la cuenta)
+            direction: 1 para avanzar a la derecha, -1 a la izquierda
+
+        Returns:
+            Longitud de la racha, o infinito si es de blancos sin fin
+        """
+        starts = self._starts
+        if not starts:
+            return float('inf')
+        if position < starts[0]:
+            return starts[0] - position if direction > 0 else float('inf')
+        if position >= self._end:
+            return position - self._end + 1 if direction < 0 else float('inf')
+
+        index = bisect_right(starts, position) - 1
+        if direction > 0:
+            return self._run_end(index) - position
+        return position - starts[index] + 1
+
+    def _merge(self, index: int):
+        """Une la racha dada con la siguiente si tienen el mismo símbolo."""
+        if 0 <= index < len(self._runs) - 1 and \
+                self._runs[index] == self._runs[index + 1]:
+            del self._starts[index + 1]
+            del self._runs[index + 1]
+
     def write(self, position: int, symbol: str):
         """Escribe un símbolo en la posición dada."""
-        if symbol == self.blank:
-            self.cells.pop(position, None)
+        starts, runs = self._starts, self._runs
+
+        if not starts:
+            if symbol != self.blank:
+                starts.append(position)
+                runs.append(symbol)
+                self._end = position + 1
+            return
+
+        if position < starts[0]:
+            if symbol == self.blank:
+                return
+            if position + 1 < starts[0]:
+                starts.insert(0, position + 1)
+                runs.insert(0, self.blank)
+            starts.insert(0, position)
+            runs.insert(0, symbol)
+            self._merge(0)
+            return
+
+        if position >= self._end:
+            if symbol == self.blank:
+                return
+            if position > self._end:
+                starts.append(self._end)
+                runs.append(self.blank)
+            starts.append(position)
+            runs.append(symbol)
+            self._end = position + 1
+            self._merge(len(runs) - 2)
+            return
+
+        index = bisect_right(starts, position) - 1
+        old = runs[index]
+        if old == symbol:
+            return
+
+        # Partir la racha en [inicio, pos-1], [pos] y [pos+1, fin]
+        if position + 1 < self._run_end(index):
+            starts.insert(index + 1, position + 1)
+            runs.insert(index + 1, old)
+        if position > starts[index]:
+            starts.insert(index + 1, position)
+            runs.insert(index + 1, symbol)
+            index += 1
         else:
-            self.cells[position] = symbol
-    
+            runs[index] = symbol
+
+        self._merge(index)
+        self._merge(index - 1)
+
+        # Los extremos de la región usada nunca son blancos
+        if runs[-1] == self.blank:
+            self._end = starts.pop()
+            runs.pop()
+        if runs and runs[0] == self.blank:
+            del starts[0]
+            del runs[0]
+        if not runs:
+            self._end = 0
+
+    def export_codes(self) -> tuple:
+        """
+        Exporta la región usada como códigos de un byte.
+
+        Returns:
+            Tupla (códigos, offset, símbolos) donde offset es la posición
+            del primer código y símbolos[código] es el símbolo que representa
+        """
+        symbols = [self.blank]
+        codes = {self.blank: 0}
+        parts = []
+        for index, symbol in enumerate(self._runs):
+            if symbol not in codes:
+                codes[symbol] = len(symbols)
+                symbols.append(symbol)
+            length = self._run_end(index) - self._starts[index]
+            parts.append(bytes([codes[symbol]]) * length)
+
+        offset = self._starts[0] if self._starts else 0
+        return (b"".join(parts), offset, symbols)
+
+    def load_codes(self, codes: bytes, offset: int, symbols: list):
+        """
+        Carga en una cinta vacía una región exportada con export_codes.
+
+        Args:
+            codes: Códigos de un byte de la región
+            offset: Posición del primer código
+            symbols: Tabla de símbolos (símbolos[0] debe ser el blanco)
+
+        Raises:
+            ValueError: Si la tabla no empieza por el blanco de la cinta
+        """
+        if not symbols or symbols[0] != self.blank:
+            raise ValueError("La tabla de símbolos debe empezar por el blanco")
+
+        position = offset
+        for code, group in groupby(codes):
+            self._starts.append(position)
+            self._runs.append(symbols[code])
+            position += sum(1 for _ in group)
+        self._end = position
+
+        # Los extremos de la región usada nunca son blancos
+        if self._runs and self._runs[-1] == self.blank:
+            self._end = self._starts.pop()
+            self._runs.pop()
+        if self._runs and self._runs[0] == self.blank:
+            del self._starts[0]
+            del self._runs[0]
+        if not self._runs:
+            self._end = 0
+
+    def close(self):
+        """Libera los recursos de la cinta (sin efecto en memoria)."""
+
+    @property
+    def cells(self) -> dict:
+        """Celdas no blancas como diccionario {posición: símbolo}."""
+        cells = {}
+        for index, symbol in enumerate(self._runs):
+            if symbol != self.blank:
+                for position in range(self._starts[index], self._run_end(index)):
+                    cells[position] = symbol
+        return cells
+
     def get_bounds(self) -> tuple:
         """Retorna los límites (mínimo, máximo) de las posiciones usadas."""
-        if not self.cells:
+        if not self._starts:
             return (0, 0)
-        return (min(self.cells.keys()), max(self.cells.keys()))
-    
+        return (self._starts[0], self._end - 1)
+
     def get_content(self, margin: int = 2) -> tuple:
         """
         Obtiene el contenido de la cinta como string.
-        
+
         Args:
             margin: Celdas adicionales de blanco a mostrar en los extremos
-        
+
         Returns:
             Tupla (contenido, offset) donde offset es la posición del primer carácter
         """
-        if not self.cells:
+        if not self._starts:
             return (self.blank * (2 * margin + 1), -margin)
-        
-        min_pos, max_pos = self.get_bounds()
-        start = min_pos - margin
-        end = max_pos + margin
-        
-        content = ""
-        for i in range(start, end + 1):
-            content += self.read(i)
-        
-        return (content, start)
-    
+
+        padding = self.blank * margin
+        content = padding + ''.join(
+            symbol * (self._run_end(index) - self._starts[index])
+            for index, symbol in enumerate(self._runs)
+        ) + padding
+
+        return (content, self._starts[0] - margin)
+
+    def get_window(self, start: int, end: int) -> str:
+        """Obtiene el contenido de las posiciones start..end (ambas incluidas)."""
+        return ''.join(self.read(position) for position in range(start, end + 1))
+
     def __str__(self) -> str:
         """Representación string de la cinta."""
         content, _ = self.get_content()
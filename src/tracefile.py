@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Módulo para grabar y reproducir trazas de ejecución en un archivo binario.
+
+La traza se escribe en streaming mientras la máquina avanza, por lo que la
+memoria usada no depende del número de pasos.
+
+Formato (little-endian):
+    cabecera   magic 'TMTR', versión, intervalo entre keyframes, paso
+               inicial y símbolo blanco
+    bloques    un keyframe (configuración completa) seguido de un registro
+               de ancho fijo por paso hasta el siguiente keyframe
+    pie        tablas de símbolos y estados, último paso e índice de
+               keyframes (paso, posición del keyframe, posición de sus
+               registros)
+    final      posición del pie y magic
+
+Para obtener la configuración de un paso se busca en el índice (búsqueda
+binaria) el keyframe anterior más cercano y se aplican los registros
+siguientes hasta llegar al paso.
+"""
+
+import os
+import sys
+import struct
+from bisect import bisect_right
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tape import Tape
+from history import RetainedHistory
+from binary_format import (COUNT, InternTable, write_text, write_table,
+                           read_exact, read_count, read_text, read_table)
+
+MAGIC = b'TMTR'
+VERSION = 1
+
+# Pasos entre keyframes por defecto
+KEYFRAME_EVERY = 10000
+
+_HEADER = struct.Struct('<4sHIq')
+_RECORD = struct.Struct('<qBBIb')
+_KEYFRAME = struct.Struct('<qqqII')
+_INDEX = struct.Struct('<qQQ')
+_TRAILER = struct.Struct('<Q4s')
+
+# Registros leídos por bloque al reproducir
+_READ_RECORDS = 4096
+
+
+class TraceWriter:
+    """
+    Escritor de trazas con la misma interfaz de registro que el historial
+    (append y append_sweep).
+
+    Los keyframes se copian de la cinta de la máquina, que ya contiene el
+    efecto del paso registrado.
+    """
+
+    def __init__(self, path: str, tape, initial_state: str, head: int = 0,
+                 first_step: int = 0, keyframe_every: int = KEYFRAME_EVERY):
+        """
+        Crea el archivo de traza y escribe la configuración actual.
+
+        Args:
+            path: Ruta del archivo de traza (se sobrescribe)
+            tape: Cinta de la máquina (se lee, nunca se modifica)
+            initial_state: Estado actual de la máquina
+            head: Posición actual de la cabeza
+            first_step: Número de paso actual
+            keyframe_every: Pasos entre keyframes
+
+        Raises:
+            ValueError: Si el intervalo entre keyframes no es positivo
+        """
+        if keyframe_every < 1:
+            raise ValueError("El intervalo entre keyframes debe ser positivo")
+
+        self.path = path
+        self.tape = tape
+        self.keyframe_every = keyframe_every
+        self.step = first_step
+        self.head = head
+        self.state = initial_state
+
+        self._symbols = InternTable()
+        self._states = InternTable()
+        self._index = []
+
+        self._file = open(path, 'wb', buffering=1 << 20)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, keyframe_every, first_step))
+        write_text(self._file, tape.blank)
+        self._keyframe()
+
+    def _keyframe(self):
+        """Escribe la configuración completa del paso actual."""
+        f = self._file
+        position = f.tell()
+        content, offset = self.tape.get_content(margin=0)
+        data = content.encode('utf-8')
+        f.write(_KEYFRAME.pack(self.step, self.head, offset,
+                               self._states.code(self.state), len(data)))
+        f.write(data)
+        self._index.append((self.step, position, f.tell()))
+
+    def append(self, position: int, old_symbol: str, new_symbol: str,
+               state: str, move: int):
+        """Registra un paso ya aplicado a la cinta."""
+        self._file.write(_RECORD.pack(position, self._symbols.code(old_symbol),
+                                      self._symbols.code(new_symbol),
+                                      self._states.code(state), move))
+        self.step += 1
+        self.state = state
+        self.head = position + move
+        if self.step % self.keyframe_every == 0:
+            self._keyframe()
+
+    def append_sweep(self, position: int, symbol: str, state: str,
+                     move: int, count: int):
+        """Registra un barrido ya aplicado, un registro por paso."""
+        code = self._symbols.code(symbol)
+        state_id = self._states.code(state)
+        pack = _RECORD.pack
+        write = self._file.write
+        self.state = state
+
+        while count > 0:
+            chunk = min(count, self.keyframe_every - self.step % self.keyframe_every)
+            write(b''.join([pack(p, code, code, state_id, move)
+                            for p in range(position, position + move * chunk, move)]))
+            position += move * chunk
+            count -= chunk
+            self.step += chunk
+            self.head = position
+            if self.step % self.keyframe_every == 0:
+                self._keyframe()
+
+    def close(self):
+        """Escribe el pie con las tablas y el índice y cierra el archivo."""
+        f = self._file
+        if f.closed:
+            return
+
+        footer = f.tell()
+        write_table(f, self._symbols)
+        write_table(f, self._states)
+        f.write(struct.pack('<q', self.step))
+        f.write(COUNT.pack(len(self._index)))
+        for entry in self._index:
+            f.write(_INDEX.pack(*entry))
+        f.write(_TRAILER.pack(footer, MAGIC))
+        f.close()
+
+
+class TraceReader(RetainedHistory):
+    """
+    Lector de trazas con acceso aleatorio a cualquier paso.
+
+    Se usa como un historial: cada elemento es un diccionario con step,
+    state, head, tape y offset, construido solo cuando se pide. El acceso
+    secuencial hacia adelante continúa desde la última configuración leída
+    sin volver al keyframe.
+    """
+
+    def __init__(self, path: str, margin: int = 3):
+        """
+        Abre una traza y lee su índice.
+
+        Args:
+            path: Ruta del archivo de traza
+            margin: Celdas blancas a mostrar en los extremos de la cinta
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+            ValueError: Si el archivo no es una traza completa
+        """
+        self.path = path
+        self.margin = margin
+        self._file = open(path, 'rb')
+
+        f = self._file
+        magic, version, self.keyframe_every, self.first_step = \
+            _HEADER.unpack(read_exact(f, _HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Formato de traza no reconocido: {path}")
+        self.blank = read_text(f)
+
+        f.seek(-_TRAILER.size, os.SEEK_END)
+        footer, magic = _TRAILER.unpack(read_exact(f, _TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Traza incompleta (sin índice): {path}")
+
+        f.seek(footer)
+        self._symbols = read_table(f)
+        self._states = read_table(f)
+        self.last_step = struct.unpack('<q', read_exact(f, 8))[0]
+        count = read_count(f)
+        self._index = [_INDEX.unpack(read_exact(f, _INDEX.size)) for _ in range(count)]
+        self._keyframe_steps = [entry[0] for entry in self._index]
+
+        # Cursor de reproducción: (paso, estado, cabeza, cinta)
+        self._cursor = None
+
+    def close(self):
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.last_step - self.first_step + 1
+
+    def _load_keyframe(self, entry: tuple):
+        """Carga un keyframe como cursor de reproducción."""
+        f = self._file
+        f.seek(entry[1])
+        step, head, offset, state_id, size = _KEYFRAME.unpack(read_exact(f, _KEYFRAME.size))
+        tape = Tape("", self.blank)
+        for i, symbol in enumerate(read_exact(f, size).decode('utf-8')):
+            tape.write(offset + i, symbol)
+        self._cursor = [step, self._states[state_id], head, tape]
+
+    def _replay(self, step: int):
+        """Avanza el cursor desde su paso hasta step aplicando registros."""
+        cursor = self._cursor
+        entry = self._index[bisect_right(self._keyframe_steps, cursor[0]) - 1]
+        f = self._file
+        f.seek(entry[2] + (cursor[0] - entry[0]) * _RECORD.size)
+
+        symbols = self._symbols
+        tape = cursor[3]
+        while cursor[0] < step:
+            # Los registros de un bloque terminan donde empieza el keyframe
+            # siguiente; el cursor salta ese keyframe
+            block_end = (entry[0] // self.keyframe_every + 1) * self.keyframe_every
+            count = min(step, block_end) - cursor[0]
+            for count_read in range(0, count, _READ_RECORDS):
+                chunk = min(_READ_RECORDS, count - count_read)
+                for position, _, new, state_id, move in \
+                        _RECORD.iter_unpack(read_exact(f, chunk * _RECORD.size)):
+                    tape.write(position, symbols[new])
+                    cursor[1] = self._states[state_id]
+                    cursor[2] = position + move
+            cursor[0] += count
+
+            if cursor[0] < step:
+                entry = self._index[bisect_right(self._keyframe_steps, cursor[0]) - 1]
+                f.seek(entry[2])
+
+    def configuration_at(self, step: int) -> dict:
+        """
+        Reconstruye la configuración de un paso.
+
+        Args:
+            step: Número de paso (entre first_step y last_step)
+
+        Returns:
+            Diccionario con step, state, head, tape y offset
+        """
+        cursor = self._cursor
+        keyframe = self._index[bisect_right(self._keyframe_steps, step) - 1]
+        if cursor is None or cursor[0] > step or cursor[0] < keyframe[0]:
+            self._load_keyframe(keyframe)
+        self._replay(step)
+
+        step, state, head, tape = self._cursor
+        tape_content, offset = tape.get_content(margin=self.margin)
+        return {
+            'step': step,
+            'state': state,
+            'head': head,
+            'tape': tape_content,
+            'offset': offset
+        }
+
+    def _get(self, index: int) -> dict:
+        return self.configuration_at(self.first_step + index)
+
+
+def main():
+    """Muestra configuraciones de una traza: tracefile.py TRAZA [PASO...]"""
+    from display import format_configuration
+
+    if len(sys.argv) < 2:
+        print("Uso: python tracefile.py archivo.trace [paso ...]")
+        sys.exit(1)
+
+    reader = TraceReader(sys.argv[1])
+    print(f"Traza: pasos {reader.first_step} a {reader.last_step}, "
+          f"{len(reader._index)} keyframes")
+
+    steps = [int(arg) for arg in sys.argv[2:]] or [reader.last_step]
+    for step in steps:
+        if not reader.first_step <= step <= reader.last_step:
+            print(f"Paso fuera de la traza: {step}")
+            continue
+        print(format_configuration(reader.configuration_at(step)))
+        print("-" * 50)
+
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,51 +2,573 @@
 Módulo que implementa la Máquina de Turing determinista de una cinta.
 """
 
-from tape import Tape
-from loader import get_transition
+import time
+
+from tape import Tape, MappedTape, RunLengthTape
+from history import (ConfigurationHistory, RecentHistory, HeadTailHistory,
+                     SampledHistory, parse_history_policy)
+from loader import get_transition, get_notation, MOVES
+from compiled import compile_machine
+from codegen import get_runner
+from macro import MacroMachine
+from checkpoint import save_checkpoint, load_checkpoint
+from tracefile import TraceWriter, KEYFRAME_EVERY
+from undo import UndoLog, SNAPSHOT_EVERY
+from cycles import CycleDetector
+from breakpoints import TrappedMachine
+
+# Implementaciones de cinta seleccionables con tape_backend
+TAPE_BACKENDS = {'memory': Tape, 'mmap': MappedTape, 'rle': RunLengthTape}
+
+# Motores de ejecución seleccionables con engine
+ENGINES = ['step', 'sweep', 'compiled', 'codegen', 'macro']
+
+# Resultados de una ejecución (ver TuringMachine.get_outcome)
+ACCEPTED = 'ACCEPTED'
+REJECTED = 'REJECTED'
+LOOPING = 'LOOPING'
+MAX_STEPS = 'MAX_STEPS'
+
+# Motores que registran cada paso (historial y traza)
+RECORDING_ENGINES = ['step', 'sweep']
+
+# Pasos por tramo cuando los checkpoints se guardan solo por tiempo
+CHECKPOINT_CHUNK = 100000
 
 
 class TuringMachine:
     """Máquina de Turing determinista de una cinta."""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, tape_backend: str = 'memory',
+                 engine: str = 'step', history_policy: str = 'all',
+                 compiled=None):
         """
         Inicializa la Máquina de Turing con una configuración.
         
         Args:
             config: Diccionario con la configuración de la máquina
+            tape_backend: 'memory' para la cinta en memoria, 'mmap' para
+                la cinta respaldada por archivos mapeados o 'rle' para la
+                cinta codificada por rachas
+            engine: Motor usado por run(): 'step' (paso a paso, con
+                historial), 'sweep', 'compiled', 'codegen' o 'macro'
+            history_policy: Configuraciones que conservan los motores
+                'step' y 'sweep' (ver history.parse_history_policy); con
+                'none' no se registra ningún paso
+            compiled: Forma compilada de config ya disponible (por ejemplo
+                de machine_cache.load_machine); si no se indica, se compila
+                cuando un motor la necesita
+        
+        Raises:
+            ValueError: Si el tipo de cinta, el motor o la política de
+                historial no existen
         """
+        if tape_backend not in TAPE_BACKENDS:
+            raise ValueError(f"Tipo de cinta desconocido: {tape_backend}")
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de ejecución desconocido: {engine}")
+        
+        self.history_policy = history_policy
+        self.history_kind, self.history_limit = parse_history_policy(history_policy)
+        self.trace = None
+        self.undo = None
+        self.detector = None
+        self.recording = self.history_kind != 'none'
         self.config = config
+        self.tape_backend = tape_backend
+        self.engine = engine
         self.tape = None
         self.head_position = 0
         self.current_state = config['estado_inicial']
         self.halted = False
         self.accepted = False
+        self.looping = False
+        self.cycle = None
         self.step_count = 0
         self.history = []
+        self.input_string = ""
+        self.elapsed = 0.0
+        self.checkpoint = None
+        self.sweeps = self._find_sweeps()
+        self.compiled = compiled
+        self.macro = None
+        self.breakpoints = None
+        self.traps = None
+        self.hit = None
+    
+    def _find_sweeps(self) -> dict:
+        """
+        Encuentra las transiciones de barrido: mismo estado, mismo símbolo
+        reescrito y movimiento L o R. Los estados de parada se excluyen
+        porque la máquina se detiene tras un único paso en ellos.
+        
+        Returns:
+            Diccionario {(estado, símbolo): desplazamiento}
+        """
+        halting = set(self.config['estados_aceptacion'])
+        halting.update(self.config.get('estados_rechazo', []))
+        
+        sweeps = {}
+        for state, trans_dict in self.config['transiciones'].items():
+            if state in halting:
+                continue
+            for symbol, (next_state, write_symbol, direction) in trans_dict.items():
+                move = MOVES.get(direction, 0)
+                if next_state == state and write_symbol == symbol and move:
+                    sweeps[(state, symbol)] = move
+        return sweeps
+    
+    def make_tape(self, input_string: str = ""):
+        """Crea una cinta del tipo elegido con la entrada dada."""
+        return TAPE_BACKENDS[self.tape_backend](
+            input_string, self.config['simbolo_blanco']
+        )
     
     def reset(self, input_string: str = ""):
         """Reinicia la máquina con una nueva entrada."""
-        blank = self.config['simbolo_blanco']
-        self.tape = Tape(input_string, blank)
+        self.stop_trace()
+        if self.tape is not None:
+            self.tape.close()
+        self.tape = self.make_tape(input_string)
+        self.input_string = input_string
         self.head_position = 0
         self.current_state = self.config['estado_inicial']
         self.halted = False
         self.accepted = False
         self.step_count = 0
-        self.history = []
-        self._save_configuration()
+        self.elapsed = 0.0
+        self.history = self._new_history(input_string, 0)
+        self.hit = None
+        if self.undo is not None:
+            self.enable_undo(self.undo.snapshot_every)
+        self._restart_detector()
+    
+    def restart_history(self):
+        """Reinicia el historial a partir de la configuración actual."""
+        content, offset = self.tape.get_content(margin=0)
+        self.history = self._new_history(content, offset)
+    
+    def _new_history(self, content: str, offset: int):
+        """
+        Crea el historial de la política elegida a partir de la
+        configuración actual, cuya cinta contiene content desde offset.
+        """
+        kind = self.history_kind
+        if kind == 'none':
+            return []
+        if kind == 'every':
+            return SampledHistory(self.history_limit, self.tape,
+                                  self.current_state, head=self.head_position,
+                                  first_step=self.step_count)
+        
+        blank = self.config['simbolo_blanco']
+        arguments = (content, blank, self.current_state)
+        options = {'offset': offset, 'head': self.head_position,
+                   'first_step': self.step_count}
+        if kind == 'last':
+            return RecentHistory(self.history_limit, *arguments, **options)
+        if kind == 'head-tail':
+            return HeadTailHistory(self.history_limit, *arguments, **options)
+        return ConfigurationHistory(*arguments, **options)
+    
+    def enable_checkpoints(self, path: str, every_steps: int = None,
+                           every_seconds: float = None, history_tail: int = 0):
+        """
+        Activa el guardado periódico de checkpoints durante run().
+        
+        Args:
+            path: Ruta del archivo de checkpoint (se sobrescribe)
+            every_steps: Guardar cada este número de pasos
+            every_seconds: Guardar cuando pase este tiempo desde el último
+                guardado (por defecto 60s si no se indica every_steps)
+            history_tail: Pasos finales del historial a incluir (requiere
+                la política all, last-N o head-tail-N)
+        
+        Raises:
+            ValueError: Si se pide history_tail y la política de historial
+                no guarda deltas ('none' o 'every-K')
+        """
+        if history_tail > 0 and self.history_kind in ('none', 'every'):
+            raise ValueError("El historial del checkpoint requiere la política "
+                             "all, last-N o head-tail-N")
+        if every_steps is None and every_seconds is None:
+            every_seconds = 60.0
+        self.checkpoint = {
+            'path': path,
+            'every_steps': every_steps,
+            'every_seconds': every_seconds,
+            'history_tail': history_tail
+        }
+    
+    def disable_checkpoints(self):
+        """Desactiva el guardado periódico de checkpoints."""
+        self.checkpoint = None
+    
+    def save_checkpoint(self, path: str = None):
+        """Guarda un checkpoint ahora (por defecto en la ruta activada)."""
+        settings = self.checkpoint or {}
+        save_checkpoint(self, path or settings['path'],
+                        history_tail=settings.get('history_tail', 0))
+    
+    def restore_checkpoint(self, path: str = None):
+        """
+        Restaura la máquina desde un checkpoint (ver checkpoint.py).
+        
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+            ValueError: Si el checkpoint no es válido para esta máquina
+        """
+        load_checkpoint(self, path or self.checkpoint['path'])
+        if self.undo is not None:
+            self.enable_undo(self.undo.snapshot_every)
+        self._restart_detector()
+    
+    def start_trace(self, path: str, keyframe_every: int = KEYFRAME_EVERY):
+        """
+        Empieza a grabar la traza binaria de la ejecución desde la
+        configuración actual (ver tracefile.py). La traza se cierra con
+        stop_trace() o al reiniciar la máquina.
+        
+        Args:
+            path: Ruta del archivo de traza (se sobrescribe)
+            keyframe_every: Pasos entre configuraciones completas
+        
+        Raises:
+            ValueError: Si el motor no registra cada paso
+        """
+        if self.engine not in RECORDING_ENGINES:
+            raise ValueError(f"El motor '{self.engine}' no registra pasos; "
+                             f"use {' o '.join(RECORDING_ENGINES)} para grabar trazas")
+        
+        self.stop_trace()
+        self.trace = TraceWriter(path, self.tape, self.current_state,
+                                 head=self.head_position,
+                                 first_step=self.step_count,
+                                 keyframe_every=keyframe_every)
+        self.recording = True
+    
+    def stop_trace(self):
+        """Cierra la traza activa, si la hay, escribiendo su índice."""
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+            self._update_recording()
+    
+    def _update_recording(self):
+        """Decide si los motores deben registrar cada paso."""
+        self.recording = (self.history_kind != 'none' or self.trace is not None
+                          or self.undo is not None or self.detector is not None)
+    
+    def enable_cycle_detection(self):
+        """
+        Activa la detección de ciclos (ver cycles.py) desde la
+        configuración actual y en cada reset().
+        
+        Si la máquina repite una configuración, o avanza indefinidamente
+        sobre blancos repitiendo el mismo tramo, se detiene antes de
+        max_steps con el resultado LOOPING; el ciclo queda en self.cycle.
+        
+        Raises:
+            ValueError: Si el motor no registra cada paso
+        """
+        if self.engine not in RECORDING_ENGINES:
+            raise ValueError(f"El motor '{self.engine}' no registra pasos; "
+                             f"use {' o '.join(RECORDING_ENGINES)} para detectar ciclos")
+        if self.tape is None:
+            self.reset()
+        
+        self.detector = CycleDetector(self.config, self.tape, self.current_state,
+                                      self.head_position, self.step_count)
+        self._update_recording()
+    
+    def disable_cycle_detection(self):
+        """Desactiva la detección de ciclos."""
+        self.detector = None
+        self._update_recording()
+    
+    def _restart_detector(self):
+        """Reinicia el detector tras un cambio no secuencial de configuración."""
+        self.looping = False
+        self.cycle = None
+        if self.detector is not None:
+            self.enable_cycle_detection()
+    
+    def _stop_looping(self, cycle: dict):
+        """Detiene la máquina al detectar un ciclo."""
+        self.halted = True
+        self.accepted = False
+        self.looping = True
+        self.cycle = cycle
+    
+    def get_outcome(self) -> str:
+        """
+        Resultado de la ejecución: ACCEPTED, REJECTED (detenida sin
+        aceptar), LOOPING (ciclo detectado) o MAX_STEPS (sin detenerse).
+        """
+        if self.looping:
+            return LOOPING
+        if self.accepted:
+            return ACCEPTED
+        if self.halted:
+            return REJECTED
+        return MAX_STEPS
+    
+    def set_breakpoints(self, breakpoints):
+        """
+        Activa puntos de parada y de vigilancia (ver breakpoints.py).
+        
+        run() se interrumpe en la primera configuración que cumple alguna
+        condición, antes de ejecutar su transición, y la deja en self.hit;
+        la siguiente llamada a run() continúa desde ahí. Los motores de
+        tablas ejecutan las condiciones compiladas como trampas; 'step' y
+        'sweep' las comprueban en cada paso para seguir registrándolos.
+        
+        Args:
+            breakpoints: Instancia de Breakpoints (se compila al activarla;
+                los cambios posteriores requieren volver a activarla)
+        
+        Raises:
+            ValueError: Si una condición no corresponde a la máquina
+        """
+        if self.compiled is None:
+            self.compiled = compile_machine(self.config)
+        self.traps = TrappedMachine(self.compiled, breakpoints)
+        self.breakpoints = breakpoints
+        self.hit = None
+    
+    def clear_breakpoints(self):
+        """Desactiva los puntos de parada y de vigilancia."""
+        self.breakpoints = None
+        self.traps = None
+        self.hit = None
+    
+    def _check_breakpoints(self):
+        """
+        Evalúa las condiciones en la configuración actual.
+        
+        Returns:
+            Diccionario con step, state, head, symbol y reasons si se
+            cumple alguna condición, o None
+        """
+        if self.halted:
+            return None
+        symbol = self.tape.read(self.head_position)
+        transition = get_transition(self.config, self.current_state, symbol)
+        reasons = self.breakpoints.reasons(self.step_count, self.current_state,
+                                           symbol, self.head_position, transition)
+        if not reasons:
+            return None
+        return {
+            'step': self.step_count,
+            'state': self.current_state,
+            'head': self.head_position,
+            'symbol': symbol,
+            'reasons': reasons
+        }
+    
+    def run_trapped(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina hasta una condición de parada, hasta detenerse
+        o hasta max_steps (ver set_breakpoints).
+        
+        Args:
+            max_steps: Número máximo de pasos permitidos
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        if self.step_count >= max_steps:
+            return self.accepted
+        
+        hit = self.hit
+        self.hit = None
+        if hit is not None and hit['step'] == self.step_count:
+            # Continuar: la transición interrumpida se ejecuta sin trampas
+            self.step()
+        
+        stop = self.breakpoints.next_step(self.step_count)
+        limit = max_steps if stop is None else min(stop, max_steps)
+        
+        if self.engine in RECORDING_ENGINES:
+            while (self.step_count < limit and not self.halted
+                   and self._check_breakpoints() is None):
+                self.step()
+        elif self.step_count < limit:
+            trapped = self.traps.machine
+            self._run_tables(trapped, trapped.run, limit, traps=self.traps)
+        
+        # Las condiciones se evalúan antes de una transición permitida
+        if self.step_count < max_steps:
+            self.hit = self._check_breakpoints()
+        return self.accepted
+    
+    def enable_undo(self, snapshot_every: int = SNAPSHOT_EVERY):
+        """
+        Activa el registro de deshacer desde la configuración actual, que
+        permite volver atrás con step_back() y saltar con seek() (ver
+        undo.py). El registro se reinicia con cada reset().
+        
+        Args:
+            snapshot_every: Pasos entre snapshots completos de la cinta
+        
+        Raises:
+            ValueError: Si el motor no registra cada paso
+        """
+        if self.engine not in RECORDING_ENGINES:
+            raise ValueError(f"El motor '{self.engine}' no registra pasos; "
+                             f"use {' o '.join(RECORDING_ENGINES)} para navegar")
+        if self.tape is None:
+            self.reset()
+        
+        self.undo = UndoLog(self.step_count, self.current_state, snapshot_every)
+        self.undo.add_snapshot(self.step_count, self.current_state,
+                               self.head_position, self.tape)
+        self._update_recording()
+    
+    def disable_undo(self):
+        """Desactiva y libera el registro de deshacer."""
+        self.undo = None
+        self._update_recording()
+    
+    def step_back(self) -> bool:
+        """
+        Deshace el último paso.
+        
+        Returns:
+            True si se retrocedió, False si ya se estaba en el primer paso
+            registrado
+        """
+        if self.undo is None or self.step_count <= self.undo.first_step:
+            return False
+        self.seek(self.step_count - 1)
+        return True
+    
+    def seek(self, step: int) -> int:
+        """
+        Lleva la máquina a la configuración de un paso.
+        
+        Dentro de lo ya ejecutado, se deshacen o rehacen pasos desde la
+        configuración actual o desde el snapshot más cercano, lo que esté
+        más cerca. Más allá, se ejecuta la máquina hasta el paso pedido o
+        hasta que se detenga. La traza activa se cierra y el historial se
+        reinicia en la configuración alcanzada.
+        
+        Args:
+            step: Paso de destino
+        
+        Returns:
+            Paso alcanzado
+        
+        Raises:
+            ValueError: Si el registro de deshacer no está activado
+        """
+        undo = self.undo
+        if undo is None:
+            raise ValueError("seek() requiere activar enable_undo()")
+        
+        self.stop_trace()
+        target = max(step, undo.first_step)
+        known = min(target, undo.last_step)
+        current = self.step_count
+        
+        snapshot = undo.snapshot_before(known)
+        if known - snapshot[0] < abs(known - current):
+            self._restore_snapshot(snapshot)
+            current = snapshot[0]
+        
+        tape = self.tape
+        head = self.head_position
+        while current > known:
+            head, symbol, _ = undo.undo(current)
+            tape.write(head, symbol)
+            current -= 1
+        while current < known:
+            current += 1
+            position, symbol, _, head = undo.redo(current)
+            tape.write(position, symbol)
+        
+        self.head_position = head
+        self.step_count = current
+        self.current_state = undo.state_at(current)
+        self.accepted = self.current_state in self.config['estados_aceptacion']
+        self.halted = (self.accepted or
+                       self.current_state in self.config.get('estados_rechazo', []))
+        self.restart_history()
+        self._restart_detector()
+        
+        if target > current:
+            self._run_engine(target)
+        
+        return self.step_count
     
-    def _save_configuration(self):
-        """Guarda la configuración actual en el historial."""
-        tape_content, offset = self.tape.get_content(margin=3)
-        self.history.append({
+    def _restore_snapshot(self, snapshot: tuple):
+        """Carga en la máquina la configuración de un snapshot."""
+        step, state, head, codes, offset, symbols = snapshot
+        tape = self.make_tape()
+        tape.load_codes(codes, offset, symbols)
+        self.tape.close()
+        self.tape = tape
+        self.head_position = head
+        self.current_state = state
+        self.step_count = step
+    
+    def get_configuration(self, margin: int = 3) -> dict:
+        """Configuración actual con el formato de las del historial."""
+        tape_content, offset = self.tape.get_content(margin=margin)
+        return {
             'step': self.step_count,
             'state': self.current_state,
             'head': self.head_position,
             'tape': tape_content,
             'offset': offset
-        })
+        }
+    
+    def _save_configuration(self, position: int, old_symbol: str,
+                            write_symbol: str, move: int):
+        """Registra el delta del último paso en el historial y la traza."""
+        if self.history_kind != 'none':
+            self.history.append(position, old_symbol, write_symbol,
+                                self.current_state, move)
+        if self.trace is not None:
+            self.trace.append(position, old_symbol, write_symbol,
+                              self.current_state, move)
+        if self.undo is not None:
+            self.undo.append(self.step_count, position, old_symbol,
+                             write_symbol, self.current_state, move)
+            if self.undo.snapshot_due(self.step_count):
+                self.undo.add_snapshot(self.step_count, self.current_state,
+                                       self.head_position, self.tape)
+        if self.detector is not None:
+            cycle = self.detector.observe(position, old_symbol, write_symbol,
+                                          self.current_state, move)
+            if cycle is not None:
+                self._stop_looping(cycle)
+    
+    def _save_sweep(self, position: int, symbol: str, move: int,
+                    count: int) -> int:
+        """
+        Registra un barrido de count pasos en el historial y la traza.
+        
+        Returns:
+            Pasos del barrido a ejecutar: count, o menos si el detector
+            encontró un ciclo dentro del barrido
+        """
+        detector = self.detector
+        if detector is not None:
+            count = detector.observe_sweep(position, symbol, self.current_state,
+                                           move, count)
+        if self.history_kind != 'none':
+            self.history.append_sweep(position, symbol, self.current_state,
+                                      move, count)
+        if self.trace is not None:
+            self.trace.append_sweep(position, symbol, self.current_state,
+                                    move, count)
+        if self.undo is not None:
+            self.undo.append_sweep(self.step_count + 1, position, symbol,
+                                   self.current_state, move, count)
+        if detector is not None and detector.cycle is not None:
+            self._stop_looping(detector.cycle)
+        return count
     
     def step(self) -> bool:
         """
@@ -70,22 +592,21 @@ class TuringMachine:
             return False
         
         new_state, write_symbol, direction = transition
+        position = self.head_position
+        move = MOVES.get(direction, 0)
         
         # Escribir símbolo
-        self.tape.write(self.head_position, write_symbol)
+        self.tape.write(position, write_symbol)
         
         # Cambiar estado
         self.current_state = new_state
         
         # Mover cabeza
-        if direction == 'R':
-            self.head_position += 1
-        elif direction == 'L':
-            self.head_position -= 1
-        # 'S' = sin movimiento
+        self.head_position = position + move
         
         self.step_count += 1
-        self._save_configuration()
+        if self.recording:
+            self._save_configuration(position, symbol, write_symbol, move)
         
         # Verificar si llegamos a estado de aceptación/rechazo
         if self.current_state in self.config['estados_aceptacion']:
@@ -101,37 +622,310 @@ class TuringMachine:
         """
         Ejecuta la máquina hasta que se detenga o alcance el límite.
         
+        Usa el motor elegido al construir la máquina; todos producen los
+        mismos pasos y la misma cinta final. El tiempo de ejecución se
+        acumula en elapsed. Con checkpoints activados, la ejecución avanza
+        por tramos y guarda el estado entre ellos y al terminar.
+        
         Args:
             max_steps: Número máximo de pasos permitidos
         
         Returns:
             True si la máquina aceptó, False en caso contrario
         """
+        settings = self.checkpoint
+        if settings is None:
+            start = time.perf_counter()
+            self._run_engine(max_steps)
+            self.elapsed += time.perf_counter() - start
+            return self.accepted
+        
+        chunk = settings['every_steps'] or CHECKPOINT_CHUNK
+        last_save = time.perf_counter()
+        
+        while not self.halted and self.step_count < max_steps:
+            start = time.perf_counter()
+            self._run_engine(min(self.step_count + chunk, max_steps))
+            now = time.perf_counter()
+            self.elapsed += now - start
+            
+            if settings['every_steps'] or now - last_save >= settings['every_seconds']:
+                self.save_checkpoint()
+                last_save = time.perf_counter()
+            if self.hit is not None:
+                break
+        
+        self.save_checkpoint()
+        return self.accepted
+    
+    def _run_engine(self, max_steps: int) -> bool:
+        """Ejecuta el motor elegido hasta max_steps."""
+        if self.breakpoints is not None:
+            return self.run_trapped(max_steps)
+        if self.engine == 'sweep':
+            return self.run_accelerated(max_steps)
+        if self.engine == 'compiled':
+            return self.run_compiled(max_steps)
+        if self.engine == 'codegen':
+            return self.run_generated(max_steps)
+        if self.engine == 'macro':
+            return self.run_macro(max_steps)
+        
         while self.step_count < max_steps and self.step():
             pass
         
         return self.accepted
     
+    def run_accelerated(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina saltando los barridos en una sola operación.
+        
+        Cuando el par (estado, símbolo) es una transición de barrido, la
+        máquina repetiría el mismo paso hasta salir de la racha de ese
+        símbolo, así que se avanza la cabeza sobre toda la racha y se suman
+        los pasos omitidos a step_count. El resultado (pasos, cinta e
+        historial) es idéntico al de run(); el beneficio es mayor con la
+        cinta 'rle', que mide cada racha sin recorrerla.
+        
+        Args:
+            max_steps: Número máximo de pasos permitidos
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        sweeps = self.sweeps
+        tape = self.tape
+        
+        while self.step_count < max_steps and not self.halted:
+            position = self.head_position
+            symbol = tape.read(position)
+            move = sweeps.get((self.current_state, symbol))
+            
+            if move is None:
+                self.step()
+                continue
+            
+            count = int(min(tape.run_length(position, move),
+                            max_steps - self.step_count))
+            if self.recording:
+                count = self._save_sweep(position, symbol, move, count)
+            self.head_position = position + move * count
+            self.step_count += count
+        
+        return self.accepted
+    
+    def run_compiled(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina con las tablas enteras precompiladas.
+        
+        La configuración se compila una sola vez (ver compiled.py) y la
+        ejecución continúa desde la configuración actual en un bucle sin
+        búsquedas en diccionarios. Este modo no registra el historial: al
+        terminar, history solo contiene la configuración final.
+        
+        Args:
+            max_steps: Número máximo de pasos permitidos
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        if self.compiled is None:
+            self.compiled = compile_machine(self.config)
+        return self._run_tables(self.compiled, self.compiled.run, max_steps)
+    
+    def run_generated(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina con una función Python generada para ella.
+        
+        La función se genera y compila una vez por configuración (ver
+        codegen.py). Igual que run_compiled, no registra el historial.
+        
+        Args:
+            max_steps: Número máximo de pasos permitidos
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        compiled, runner = get_runner(self.config)
+        self.compiled = compiled
+        return self._run_tables(compiled, runner, max_steps)
+    
+    def run_macro(self, max_steps: int = 100000) -> bool:
+        """
+        Ejecuta la máquina como macro-máquina de bloques con caché LRU.
+        
+        Las macro-transiciones memorizadas (ver macro.py) se conservan
+        entre ejecuciones de la misma máquina. Igual que run_compiled, no
+        registra el historial.
+        
+        Args:
+            max_steps: Número máximo de pasos permitidos
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        if self.macro is None:
+            if self.compiled is None:
+                self.compiled = compile_machine(self.config)
+            self.macro = MacroMachine(self.compiled)
+        return self._run_tables(self.macro.compiled, self.macro.run, max_steps)
+    
+    def _run_tables(self, compiled, runner, max_steps: int,
+                    traps: TrappedMachine = None) -> bool:
+        """
+        Ejecuta un motor sobre una cinta de códigos desde la configuración
+        actual y carga el resultado en la máquina.
+        
+        Args:
+            compiled: Máquina compilada que define los códigos
+            runner: Función con la firma de CompiledMachine.run
+            max_steps: Número máximo de pasos permitidos
+            traps: Trampas cuyas celdas hay que marcar en la cinta
+        
+        Returns:
+            True si la máquina aceptó, False en caso contrario
+        """
+        if self.halted:
+            return self.accepted
+        
+        # Región de la cinta que cubre el contenido, la cabeza y las celdas
+        # con trampas
+        content, offset = self.tape.get_content(margin=0)
+        start = min(offset, self.head_position)
+        end = max(offset + len(content), self.head_position + 1)
+        if traps is not None:
+            start, end = traps.cover(start, end)
+        cells = (bytearray(offset - start) + compiled.encode(content)
+                 + bytearray(end - offset - len(content)))
+        if traps is not None:
+            traps.mark(cells, start)
+        
+        result = runner(cells, self.head_position - start,
+                        compiled.state_ids[self.current_state],
+                        self.step_count, max_steps)
+        if traps is not None:
+            result['cells'] = traps.clear(result['cells'])
+        
+        origin = start - result['shift']
+        self._load_cells(result['cells'], origin)
+        self.head_position = origin + result['head']
+        self.current_state = compiled.states[result['state']]
+        self.step_count = result['steps']
+        self.halted = result['halted']
+        self.accepted = result['accepted']
+        self.restart_history()
+        
+        return self.accepted
+    
+    def _load_cells(self, cells: bytearray, origin: int):
+        """Reemplaza la cinta por el contenido de una cinta de códigos."""
+        tape = self.make_tape()
+        tape.load_codes(bytes(cells), origin, self.compiled.symbols)
+        self.tape.close()
+        self.tape = tape
+    
     def get_result(self) -> str:
         """Obtiene el resultado (contenido de la cinta)."""
         return str(self.tape)
     
     def get_clean_result(self) -> str:
         """
-        Obtiene el resultado limpio (solo los 1s del resultado Fibonacci).
+        Obtiene el resultado limpio (solo los dígitos del resultado Fibonacci).
         Para la máquina de cinta única, extrae el último término de la secuencia.
         Formato de cinta: #xxx.;1;1;11;111;... donde el último término es F(n)
+        En notación binaria, la cinta final contiene solo F(n) en binario.
         """
-        raw = str(self.tape).strip('_')
-        
-        # Si la cinta contiene ';' (separador de términos), extraer el último término
-        if ';' in raw:
-            # Dividir por ';' y obtener el penúltimo elemento (último término completo)
-            terminos = raw.split(';')
-            # Filtrar términos vacíos y obtener el último con 1s
-            terminos_validos = [t for t in terminos if t and all(c == '1' for c in t)]
-            if terminos_validos:
-                return terminos_validos[-1]
-        
-        # Fallback: solo los '1's en la cinta final
-        return ''.join(c for c in raw if c == '1')
+        return extract_result(str(self.tape), get_notation(self.config))
+    
+    def get_result_value(self) -> int:
+        """Obtiene el valor numérico del resultado según la notación."""
+        return decode_number(self.get_clean_result(), get_notation(self.config))
+
+
+def encode_input(n: int, notation: str = 'unaria') -> str:
+    """
+    Representa n como cadena de entrada.
+    
+    Args:
+        n: Entero no negativo
+        notation: 'unaria' (n 1s) o 'binaria' (n en base 2)
+    
+    Returns:
+        Cadena de entrada para la máquina
+    """
+    if notation == 'binaria':
+        return format(n, 'b')
+    return '1' * n
+
+
+def decode_number(digits: str, notation: str = 'unaria') -> int:
+    """
+    Valor de una cadena de entrada o de un resultado limpio.
+    
+    Args:
+        digits: Cadena en la notación indicada ('' representa 0)
+        notation: 'unaria' o 'binaria'
+    
+    Returns:
+        Entero representado por la cadena
+    """
+    if notation == 'binaria':
+        return int(digits or '0', 2)
+    return digits.count('1')
+
+
+def extract_result(tape_string: str, notation: str = 'unaria') -> str:
+    """
+    Extrae el resultado de la representación de una cinta.
+    
+    Args:
+        tape_string: Contenido de la cinta (como str(Tape))
+        notation: 'unaria' (ver extract_clean_result) o 'binaria'
+    
+    Returns:
+        Resultado limpio; en binario, los bits sin ceros a la izquierda
+        ('0' si el resultado es cero)
+    """
+    if notation == 'binaria':
+        return extract_binary_result(tape_string)
+    return extract_clean_result(tape_string)
+
+
+def extract_binary_result(tape_string: str) -> str:
+    """
+    Extrae el resultado binario de la representación de una cinta.
+    
+    Args:
+        tape_string: Contenido de la cinta (como str(Tape))
+    
+    Returns:
+        Bits de la cinta sin ceros a la izquierda ('0' si no hay ningún 1)
+    """
+    bits = ''.join(c for c in tape_string if c in '01')
+    return bits.lstrip('0') or '0'
+
+
+def extract_clean_result(tape_string: str) -> str:
+    """
+    Extrae el último término Fibonacci de la representación de una cinta.
+    
+    Args:
+        tape_string: Contenido de la cinta (como str(Tape))
+    
+    Returns:
+        Último término formado solo por 1s, o los 1s de la cinta si no hay
+        separadores de términos
+    """
+    raw = tape_string.strip('_')
+    
+    # Si la cinta contiene ';' (separador de términos), extraer el último término
+    if ';' in raw:
+        # Dividir por ';' y obtener el penúltimo elemento (último término completo)
+        terminos = raw.split(';')
+        # Filtrar términos vacíos y obtener el último con 1s
+        terminos_validos = [t for t in terminos if t and all(c == '1' for c in t)]
+        if terminos_validos:
+            return terminos_validos[-1]
+    
+    # Fallback: solo los '1's en la cinta final
+    return ''.join(c for c in raw if c == '1')
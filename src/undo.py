@@ -0,0 +1,167 @@
+"""
+Módulo que implementa el registro de deshacer para navegar una ejecución
+de la Máquina de Turing hacia atrás y hacia adelante.
+"""
+
+from array import array
+from bisect import bisect_right
+
+from binary_format import InternTable
+
+# Pasos entre snapshots de la cinta por defecto
+SNAPSHOT_EVERY = 10000
+
+
+class UndoLog:
+    """
+    Registro compacto de los pasos ejecutados y snapshots dispersos.
+
+    Por cada paso se guarda, en columnas de tipo array, la posición
+    escrita, el símbolo sobrescrito, el símbolo nuevo, el estado
+    resultante y el movimiento, de modo que cada paso puede deshacerse o
+    rehacerse en O(1). Cada snapshot_every pasos se guarda además la cinta
+    completa como códigos, para que ir a un paso lejano cueste lo que
+    separa al paso del snapshot más cercano y no lo que lo separa del
+    paso actual.
+    """
+
+    def __init__(self, first_step: int, first_state: str,
+                 snapshot_every: int = SNAPSHOT_EVERY):
+        """
+        Inicializa un registro vacío.
+
+        Args:
+            first_step: Paso de la configuración inicial del registro
+            first_state: Estado de la configuración inicial
+            snapshot_every: Pasos entre snapshots de la cinta
+
+        Raises:
+            ValueError: Si el intervalo entre snapshots no es positivo
+        """
+        if snapshot_every < 1:
+            raise ValueError("El intervalo entre snapshots debe ser positivo")
+
+        self.first_step = first_step
+        self.snapshot_every = snapshot_every
+
+        self._symbols = InternTable()
+        self._states = InternTable([first_state])
+
+        # Columnas del registro; la entrada i corresponde al paso first_step + i + 1
+        self.positions = array('q')
+        self.old_symbols = array('B')
+        self.new_symbols = array('B')
+        self.states = array('I')
+        self.moves = array('b')
+
+        # Snapshots ordenados por paso: (paso, estado, cabeza, códigos, offset, símbolos)
+        self.snapshots = []
+        self._snapshot_steps = []
+
+    @property
+    def last_step(self) -> int:
+        """Último paso registrado."""
+        return self.first_step + len(self.positions)
+
+    def truncate(self, step: int):
+        """Descarta los pasos y snapshots posteriores a step."""
+        keep = step - self.first_step
+        for column in (self.positions, self.old_symbols, self.new_symbols,
+                       self.states, self.moves):
+            del column[keep:]
+
+        count = bisect_right(self._snapshot_steps, step)
+        del self.snapshots[count:]
+        del self._snapshot_steps[count:]
+
+    def append(self, step: int, position: int, old_symbol: str,
+               new_symbol: str, state: str, move: int):
+        """
+        Registra un paso. Si el paso ya estaba registrado (la máquina
+        volvió atrás y avanza de nuevo), se descarta lo posterior.
+
+        Args:
+            step: Número del paso registrado
+            position: Posición de la cabeza al escribir
+            old_symbol: Símbolo sobrescrito
+            new_symbol: Símbolo escrito
+            state: Estado resultante tras el paso
+            move: Desplazamiento de la cabeza (-1, 0 o 1)
+        """
+        if step <= self.last_step:
+            self.truncate(step - 1)
+        self.positions.append(position)
+        self.old_symbols.append(self._symbols.code(old_symbol))
+        self.new_symbols.append(self._symbols.code(new_symbol))
+        self.states.append(self._states.code(state))
+        self.moves.append(move)
+
+    def append_sweep(self, step: int, position: int, symbol: str,
+                     state: str, move: int, count: int):
+        """
+        Registra count pasos de un barrido a partir del paso step.
+
+        Args:
+            step: Número del primer paso del barrido
+            position: Posición de la cabeza en el primer paso
+            symbol: Símbolo leído y reescrito en cada paso
+            state: Estado (sin cambios) durante el barrido
+            move: Desplazamiento de la cabeza (-1 o 1)
+            count: Número de pasos del barrido
+        """
+        if step <= self.last_step:
+            self.truncate(step - 1)
+        code = self._symbols.code(symbol)
+        self.positions.extend(range(position, position + move * count, move))
+        self.old_symbols.extend(array('B', [code]) * count)
+        self.new_symbols.extend(array('B', [code]) * count)
+        self.states.extend(array('I', [self._states.code(state)]) * count)
+        self.moves.extend(array('b', [move]) * count)
+
+    def state_at(self, step: int) -> str:
+        """Estado de la máquina tras el paso step."""
+        if step == self.first_step:
+            return self._states[0]
+        return self._states[self.states[step - self.first_step - 1]]
+
+    def undo(self, step: int) -> tuple:
+        """
+        Datos para deshacer el paso step.
+
+        Returns:
+            Tupla (posición, símbolo anterior, estado anterior); la
+            posición es también la cabeza antes del paso
+        """
+        index = step - self.first_step - 1
+        return (self.positions[index],
+                self._symbols[self.old_symbols[index]],
+                self.state_at(step - 1))
+
+    def redo(self, step: int) -> tuple:
+        """
+        Datos para rehacer el paso step.
+
+        Returns:
+            Tupla (posición, símbolo nuevo, estado, cabeza tras el paso)
+        """
+        index = step - self.first_step - 1
+        position = self.positions[index]
+        return (position,
+                self._symbols[self.new_symbols[index]],
+                self._states[self.states[index]],
+                position + self.moves[index])
+
+    def snapshot_due(self, step: int) -> bool:
+        """Indica si corresponde guardar un snapshot en el paso step."""
+        return step - self._snapshot_steps[-1] >= self.snapshot_every
+
+    def add_snapshot(self, step: int, state: str, head: int, tape):
+        """Guarda la configuración completa del paso step."""
+        codes, offset, symbols = tape.export_codes()
+        self.snapshots.append((step, state, head, codes, offset, symbols))
+        self._snapshot_steps.append(step)
+
+    def snapshot_before(self, step: int) -> tuple:
+        """Snapshot más cercano en o antes del paso step (o None)."""
+        index = bisect_right(self._snapshot_steps, step) - 1
+        return self.snapshots[index] if index >= 0 else None
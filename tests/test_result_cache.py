@@ -0,0 +1,49 @@
+"""
+Pruebas de la caché de resultados con la detección de ciclos.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'src'))
+
+from turing_machine import TuringMachine, LOOPING, MAX_STEPS
+from result_cache import ResultCache
+from simulator import run_simulation
+
+# Máquina que va y viene entre dos celdas sin detenerse nunca
+PING_PONG = {
+    'nombre': 'Ping-pong',
+    'alfabeto_entrada': [],
+    'alfabeto_cinta': ['_'],
+    'simbolo_blanco': '_',
+    'estados': ['q0', 'q1', 'qaccept'],
+    'estado_inicial': 'q0',
+    'estados_aceptacion': ['qaccept'],
+    'transiciones': {
+        'q0': {'_': ['q1', '_', 'R']},
+        'q1': {'_': ['q0', '_', 'L']}
+    }
+}
+
+
+def test_cycle_detected_run_is_not_cached(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path))
+    max_steps = 1000
+
+    machine = TuringMachine(PING_PONG)
+    machine.enable_cycle_detection()
+    run_simulation(machine, "", show_steps=False, max_steps=max_steps,
+                   result_cache=cache)
+    assert machine.get_outcome() == LOOPING
+    assert cache.get(PING_PONG, "", max_steps) is None
+
+    machine = TuringMachine(PING_PONG)
+    accepted, steps, _ = run_simulation(machine, "", show_steps=False,
+                                        max_steps=max_steps,
+                                        result_cache=cache)
+    assert not accepted
+    assert steps == max_steps
+    assert machine.get_outcome() == MAX_STEPS
+    cache.close()